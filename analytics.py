@@ -0,0 +1,74 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+
+import store
+
+# -------------------------
+# Dashboard Trends
+# -------------------------
+# Turns the store's hourly / daily rollup counters into chart-ready frames.
+# Each frame has one row per bucket over the whole window (quiet buckets are
+# zero) and one column per series, so a chart costs one index range scan plus a
+# vectorized scatter into a NumPy grid, however many raw events there are.
+
+GRAINS = {
+    "hour": ("%Y-%m-%d %H", "h"),
+    "day": ("%Y-%m-%d", "D"),
+}
+
+
+def window(grain, periods, end=None):
+    """The last `periods` buckets up to and including the current one, as a DatetimeIndex."""
+    fmt, freq = GRAINS[grain]
+    end = pd.Timestamp(end or datetime.datetime.now()).floor(freq)
+    return pd.date_range(end=end, periods=periods, freq=freq, name="bucket")
+
+
+def _since(index, grain):
+    return index[0].strftime(GRAINS[grain][0])
+
+
+def _grid(rows, index, grain, columns=None):
+    """Scatters (bucket, value, n) rows into a zero-filled buckets x values frame."""
+    if columns is None:
+        columns = sorted({row[1] for row in rows})
+    if not rows:
+        return pd.DataFrame(0, index=index, columns=columns, dtype=np.int64)
+    buckets, values, counts = zip(*rows)
+    positions = index.get_indexer(pd.to_datetime(buckets, format=GRAINS[grain][0]))
+    col_pos = pd.Index(columns).get_indexer(values)
+    keep = (positions >= 0) & (col_pos >= 0)
+    grid = np.zeros((len(index), len(columns)), dtype=np.int64)
+    np.add.at(grid, (positions[keep], col_pos[keep]), np.asarray(counts, dtype=np.int64)[keep])
+    return pd.DataFrame(grid, index=index, columns=columns)
+
+
+def timeline(events, grain="day", periods=30, end=None):
+    """One column per event (e.g. 'reported', 'verified'), counted per bucket."""
+    index = window(grain, periods, end)
+    since = _since(index, grain)
+    frame = pd.DataFrame(0, index=index, columns=list(events), dtype=np.int64)
+    for event in events:
+        rows = store.rollup_rows(event, "all", grain, since)
+        frame[event] = _grid(rows, index, grain, columns=["*"])["*"]
+    return frame
+
+
+def breakdown(event, dimension, grain="day", periods=30, end=None, top=None):
+    """One column per dimension value (e.g. per waste type), optionally only the `top` busiest."""
+    index = window(grain, periods, end)
+    since = _since(index, grain)
+    columns = None
+    if top is not None:
+        columns = [value for value, _ in store.rollup_totals([event], dimension, since[:10], limit=top)]
+    rows = store.rollup_rows(event, dimension, grain, since, values=columns)
+    return _grid(rows, index, grain, columns=columns)
+
+
+def leaders(events, dimension, days=30, limit=10, end=None):
+    """Totals per dimension value over the last `days` days, largest first, as a Series."""
+    index = window("day", days, end)
+    rows = store.rollup_totals(list(events), dimension, _since(index, "day"), limit=limit)
+    return pd.Series({value: n for value, n in rows}, name="events", dtype=np.int64)
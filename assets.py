@@ -0,0 +1,97 @@
+import os
+import json
+import functools
+import urllib.request
+
+import streamlit as st
+
+# -------------------------
+# Static Assets
+# -------------------------
+# Images and the global stylesheet are mirrored into static/ by build_assets.py
+# under content-hashed names and served by Streamlit at /app/static/. Until the
+# build has run (or if static serving is off) every helper falls back to the
+# original remote URL / an inline stylesheet, so the app works either way.
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(APP_DIR, "static")
+MANIFEST_PATH = os.path.join(STATIC_DIR, "manifest.json")
+STYLESHEET_SOURCE = os.path.join(APP_DIR, "styles", "ecomorphis.css")
+STATIC_URL = "/app/static/"
+
+REMOTE_ASSETS = {
+    "background": "https://i.ibb.co/mVrBQPdM/Whats-App-Image-2025-09-18-at-13-04-43-1.jpg",
+    "logo": "https://i.ibb.co/XfyN3cN3/ecomorphis.png",
+    "avatar": "https://www.svgrepo.com/show/384670/account-avatar-profile-user.svg",
+    "testimonial-rohan": "https://i.ibb.co/60snfSQ6/male-citizen.jpg",
+    "testimonial-anjali": "https://i.ibb.co/Pv3KDLPJ/female-citizen.jpg",
+    "shop-toothbrush": "https://i.ibb.co/5Z0TBsv/bamboo-toothbrush.jpg",
+    "shop-bag": "https://i.ibb.co/8LYhmFVb/shoping-bag.jpg",
+    "shop-compost-kit": "https://i.ibb.co/fdHjr5Vt/starter-kit.jpg",
+    "shop-notebooks": "https://i.ibb.co/PZCkQQft/paper-book.jpg",
+    "plant-seed": "https://i.ibb.co/ymHhwt9J/seed.png",
+    "plant-sprout": "https://i.ibb.co/2YWwHdn4/sapling.png",
+    "plant-sapling": "https://i.ibb.co/fYVxH58p/sapling-2.png",
+    "plant-small-tree": "https://i.ibb.co/sJJLgRVd/small-tree.png",
+    "plant-full-tree": "https://i.ibb.co/VYQWY4G8/full-tree.png",
+    "training-gloves": "https://i.ibb.co/chDp7M5J/gloves.jpg",
+    "training-n95": "https://i.ibb.co/fV8rLbnh/n95.jpg",
+    "training-boots": "https://i.ibb.co/DfRf9R4f/shoe.jpg",
+    "training-compost": "https://i.ibb.co/DgCsyjSJ/home-composting.jpg",
+}
+
+
+@functools.lru_cache(maxsize=1)
+def _built():
+    try:
+        with open(MANIFEST_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def manifest():
+    """The build manifest ({"assets": {...}, "stylesheet": ...}), or {} if static assets aren't usable."""
+    if not st.get_option("server.enableStaticServing"):
+        return {}
+    return _built()
+
+
+def _variant(entry, width):
+    filename = entry["file"]
+    if width:
+        wide_enough = [v for v in entry.get("variants", []) if v["width"] >= width]
+        if wide_enough:
+            filename = min(wide_enough, key=lambda v: v["width"])["file"]
+    return filename
+
+
+def url(name, width=None):
+    """URL for a named image; with width, the smallest pre-built variant at least that wide."""
+    entry = manifest().get("assets", {}).get(name)
+    if entry is None:
+        return REMOTE_ASSETS[name]
+    return STATIC_URL + _variant(entry, width)
+
+
+def read_bytes(name, width=None, timeout=5):
+    """Raw bytes of a named image for server-side use: the built copy if present, else the remote original."""
+    entry = _built().get("assets", {}).get(name)
+    if entry is not None:
+        try:
+            with open(os.path.join(STATIC_DIR, _variant(entry, width)), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            pass
+    with urllib.request.urlopen(REMOTE_ASSETS[name], timeout=timeout) as response:
+        return response.read()
+
+
+@functools.lru_cache(maxsize=1)
+def stylesheet_html():
+    """Markup that loads the global stylesheet: a cacheable <link> once built, else the source inlined."""
+    built = manifest().get("stylesheet")
+    if built:
+        return f'<link rel="stylesheet" href="{STATIC_URL}{built}">'
+    with open(STYLESHEET_SOURCE, encoding="utf-8") as f:
+        return f"<style>\n{f.read()}</style>"
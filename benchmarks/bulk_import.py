@@ -0,0 +1,105 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+import subprocess
+
+import numpy as np
+import pandas as pd
+
+# -------------------------
+# Bulk Import & Export Benchmark
+# -------------------------
+# Generates synthetic users, bins and complaints files (CSV and Parquet) with a
+# sprinkling of bad rows, imports them into a scratch database and exports the
+# complaints back out, reporting rows per second and peak memory. Half the
+# complaints carry no coordinates, so the gazetteer lookup is timed as well.
+# The files are written by a child process so the peak RSS column reflects the
+# import and export alone.
+
+parser = argparse.ArgumentParser(description="Bulk import / export throughput.")
+parser.add_argument("--rows", type=int, default=1_000_000, help="Complaints per file; users and bins get a tenth")
+parser.add_argument("--seed", type=int, default=7)
+parser.add_argument("--generate", metavar="DIR", help=argparse.SUPPRESS)
+args = parser.parse_args()
+
+tmp = args.generate or tempfile.mkdtemp(prefix="ecomorphis-bulk-")
+os.environ["ECOMORPHIS_DB"] = os.path.join(tmp, "eco.db")
+os.environ["ECOMORPHIS_DATA"] = tmp
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bulk
+import geocode
+
+try:
+    import resource
+except ImportError:  # not on Windows
+    resource = None
+
+
+def _peak_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 if resource else float("nan")
+
+
+def _files(rng, n):
+    n_users = max(n // 10, 1)
+    users = pd.DataFrame({
+        "username": [f"user{i}" for i in range(n_users)],
+        "password": "secret",
+        "role": rng.choice(["Citizen", "Citizen", "Green Champion", "Mayor"], n_users),
+        "points": rng.integers(0, 500, n_users),
+    })
+    bins = pd.DataFrame({
+        "bin_id": [f"BIN-{i:07d}" for i in range(n_users)],
+        "location": [f"Street {i}" for i in range(n_users)],
+        "zone": rng.choice(["North", "South", "East", "West"], n_users),
+        "latitude": 23.26 + rng.normal(0, 0.05, n_users),
+        "longitude": 77.41 + rng.normal(0, 0.05, n_users),
+    })
+    names = geocode.load_gazetteer()["name"].to_numpy()
+    lat = 23.26 + rng.normal(0, 0.05, n)
+    lon = 77.41 + rng.normal(0, 0.05, n)
+    unplaced = rng.random(n) < 0.5
+    stamps = pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 365 * 86400, n), unit="s")
+    complaints = pd.DataFrame({
+        "user": np.array(users["username"])[rng.integers(0, n_users, n)],
+        "location": rng.choice(names, n),
+        "waste_type": rng.choice(["Plastic", "Organic", "E-waste", "Glass"], n),
+        "timestamp": stamps.strftime("%Y-%m-%d %H:%M:%S"),
+        "status": rng.choice(["Pending", "Verified", "Resolved", "Invalid", "Lost"], n, p=[.5, .2, .2, .09, .01]),
+        "latitude": np.where(unplaced, np.nan, lat),
+        "longitude": np.where(unplaced, np.nan, lon),
+    })
+    for kind, frame in (("users", users), ("bins", bins), ("complaints", complaints)):
+        frame.to_csv(os.path.join(tmp, f"{kind}.csv"), index=False)
+        frame.to_parquet(os.path.join(tmp, f"{kind}.parquet"), index=False)
+
+
+def _row(label, rows, seconds, extra=""):
+    print(f"{label:<28} {rows:>10,} {seconds:8.2f} s {rows / seconds:>12,.0f}/s {_peak_mb():8.0f} MB  {extra}")
+
+
+def main():
+    if args.generate:
+        _files(np.random.default_rng(args.seed), args.rows)
+        return 0
+    subprocess.run([sys.executable, __file__, "--rows", str(args.rows), "--seed", str(args.seed), "--generate", tmp],
+                   check=True)
+    print(f"{'':<28} {'rows':>10} {'time':>10} {'rate':>14} {'peak RSS':>11}")
+    # The Parquet pass updates the same users and bins and appends a second batch of complaints
+    for fmt in ("csv", "parquet"):
+        for kind in ("users", "bins", "complaints"):
+            path = os.path.join(tmp, f"{kind}.{fmt}")
+            start = time.perf_counter()
+            imported, errors = bulk.import_file(kind, path)
+            _row(f"import {kind}.{fmt}", imported + len(errors), time.perf_counter() - start, f"{len(errors):,} rejected")
+    for fmt in ("csv", "parquet"):
+        start = time.perf_counter()
+        rows = bulk.export("complaints", os.path.join(tmp, f"export.{fmt}"), fmt)
+        _row(f"export complaints.{fmt}", rows, time.perf_counter() - start,
+             f"{os.path.getsize(os.path.join(tmp, f'export.{fmt}')) / 2**20:.0f} MB")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+import os
+import sys
+import time
+import argparse
+import statistics
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import geocode
+
+# -------------------------
+# Gazetteer Lookup Benchmark
+# -------------------------
+# Builds a geocode.Gazetteer over a synthetic city-sized gazetteer (made-up
+# multi-word place names with aliases, scattered around Bhopal) and times
+# autocomplete on short prefixes, free-text resolution and nearest-place
+# lookups. Short prefixes are the worst case: they match the most keys.
+
+WORDS = ["nagar", "colony", "market", "road", "chowk", "square", "park", "gate", "lake", "hills",
+         "vihar", "puram", "ganj", "bagh", "garden", "complex", "tower", "mandi", "camp", "sector"]
+SYLLABLES = ["ka", "ra", "shi", "vi", "ma", "no", "pu", "ta", "ba", "de", "ho", "ja", "li", "su", "ve", "ar", "om", "gi"]
+
+
+def _places(rng, n):
+    stems = ["".join(rng.choice(SYLLABLES, size=rng.integers(2, 4))).title() for _ in range(n)]
+    names = [f"{stem} {rng.choice(WORDS).title()}" + (f" {i}" if i % 3 == 0 else "") for i, stem in enumerate(stems)]
+    return pd.DataFrame({
+        "name": names,
+        "kind": np.where(rng.random(n) < 0.05, "ward", "landmark"),
+        "ward": [f"Ward {w}" for w in rng.integers(1, 86, size=n)],
+        "latitude": 23.25 + rng.normal(0, 0.05, size=n),
+        "longitude": 77.41 + rng.normal(0, 0.05, size=n),
+        "aliases": [f"{s} {rng.choice(WORDS)}".lower() if rng.random() < 0.3 else "" for s in stems],
+    })
+
+
+def _time(fn, args_list):
+    timings = []
+    for args in args_list:
+        start = time.perf_counter()
+        fn(*args)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.99) - 1]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gazetteer autocomplete / geocoding latency.")
+    parser.add_argument("--places", type=int, default=50_000, help="Gazetteer entries")
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    df = _places(rng, args.places)
+    start = time.perf_counter()
+    gazetteer = geocode.Gazetteer(df)
+    build = time.perf_counter() - start
+
+    names = df["name"].to_numpy()
+    picks = names[rng.integers(0, len(names), size=args.queries)]
+    prefixes = [(name[:int(rng.integers(1, 5))],) for name in picks]
+    word_prefixes = [(str(rng.choice(WORDS))[:3],) for _ in range(args.queries)]
+    free_text = [(f"{name}, near the {rng.choice(WORDS)}",) for name in picks]
+    points = [(23.25 + rng.normal(0, 0.05), 77.41 + rng.normal(0, 0.05)) for _ in range(args.queries)]
+
+    print(f"{args.places:,} places, {len(gazetteer._keys):,} prefix keys, {args.queries} queries per case")
+    print(f"index build               {build:8.2f} s")
+    for label, fn, cases in [
+        ("suggest (1-4 chars)", gazetteer.suggest, prefixes),
+        ("suggest (word prefix)", gazetteer.suggest, word_prefixes),
+        ("resolve (free text)", gazetteer.resolve, free_text),
+        ("nearest", gazetteer.nearest, points),
+    ]:
+        p50, p99 = _time(fn, cases)
+        print(f"{label:24s}  p50 {p50:7.3f} ms   p99 {p99:7.3f} ms")
+    misses = sum(gazetteer.resolve(text)["name"] != name for (text,), name in zip(free_text, picks))
+    print(f"free text resolved to the wrong place: {misses}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,304 @@
+import os
+import io
+import sys
+import json
+import time
+import argparse
+import tempfile
+import importlib
+import multiprocessing
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+
+# -------------------------
+# Headless Load Test
+# -------------------------
+# Drives eco1.py through AppTest the way real people use it: a citizen signs up,
+# logs in and reports waste with a photo, a Green Champion verifies and resolves
+# the report, and the citizen scans a bin QR code and redeems a product in the
+# shop. AppTest keeps process-global runtime state, so each concurrent user
+# runs in its own worker process (like one replica per user) and all of them
+# share one scratch data directory.
+#
+# Every action is one script rerun; its latency percentiles and the workers'
+# memory growth are reported and can be saved as a baseline to compare later
+# runs against:
+#
+#   python benchmarks/load_test.py --users 20 --save-baseline base.json
+#   python benchmarks/load_test.py --users 20 --baseline base.json
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = os.path.join(APP_DIR, "eco1.py")
+PASSWORD = "load-test"
+
+
+def rss_mb():
+    """Current resident set size of this process in MB (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def percentile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))]
+
+
+class Recorder:
+    """Collects per-action latencies (ms)."""
+
+    def __init__(self):
+        self.samples = {}
+
+    @contextmanager
+    def timed(self, action):
+        start = time.perf_counter()
+        yield
+        self.samples.setdefault(action, []).append((time.perf_counter() - start) * 1000)
+
+    def merge(self, samples):
+        for action, values in samples.items():
+            self.samples.setdefault(action, []).extend(values)
+
+    def summary(self):
+        out = {}
+        for action, values in self.samples.items():
+            values = sorted(values)
+            out[action] = {
+                "n": len(values),
+                "p50": percentile(values, 0.50),
+                "p95": percentile(values, 0.95),
+                "p99": percentile(values, 0.99),
+                "max": values[-1],
+            }
+        return out
+
+
+def _check(at, action):
+    if at.exception:
+        raise RuntimeError(f"{action}: {[e.message for e in at.exception]}")
+
+
+def _button(at, label=None, key=None):
+    if key is not None:
+        return at.button(key=key)
+    return next(b for b in at.button if b.label == label)
+
+
+def _run(rec, at, action, step):
+    """Performs one UI step (a click / input that ends in .run()) and times the rerun."""
+    with rec.timed(action):
+        step()
+    _check(at, action)
+
+
+def _open_page(rec, at, nav_key, page):
+    _run(rec, at, f"open {page}", lambda: at.selectbox(key=nav_key).set_value(page).run())
+
+
+def _log_in(rec, at, username):
+    at.text_input(key="login_username").input(username)
+    at.text_input(key="login_password").input(PASSWORD)
+    _run(rec, at, "log in", lambda: _button(at, "Login").click().run())
+    if at.session_state["page"] != "App":
+        raise RuntimeError(f"log in: {username} is still on {at.session_state['page']}")
+
+
+def _review(rec, at, queue, complaint_id, action, step):
+    """Pages through a review queue to the complaint, ticks it and runs one bulk action."""
+    select_key = f"{queue}_select_{complaint_id}"
+    while select_key not in {c.key for c in at.checkbox}:
+        if at.button(key=f"{queue}_next").disabled:
+            raise RuntimeError(f"{step}: complaint {complaint_id} is not in the {queue} queue")
+        _run(rec, at, f"{step} next page", lambda: at.button(key=f"{queue}_next").click().run())
+    _run(rec, at, f"{step} select", lambda: at.checkbox(key=select_key).check().run())
+    _run(rec, at, step, lambda: next(b for b in at.button if b.label.startswith(action)).click().run())
+
+
+def simulate_user(n, run_id, rec, qr_image):
+    import store
+    from streamlit.testing.v1 import AppTest
+
+    citizen_name, champion_name = f"lt-{run_id}-{n}", f"lt-{run_id}-{n}-champion"
+
+    citizen = AppTest.from_file(SCRIPT, default_timeout=120)
+    _run(rec, citizen, "open app", citizen.run)
+    _run(rec, citizen, "open login", lambda: _button(citizen, "Let's Get Started 🚀").click().run())
+    _run(rec, citizen, "open sign up", lambda: _button(citizen, "Sign Up").click().run())
+    next(w for w in citizen.text_input if w.label == "Choose a username").input(citizen_name)
+    next(w for w in citizen.text_input if w.label == "Choose a password").input(PASSWORD)
+    _run(rec, citizen, "sign up", lambda: _button(citizen, "Create Account").click().run())
+    _log_in(rec, citizen, citizen_name)
+
+    _open_page(rec, citizen, "others_nav", "Report Waste")
+    next(w for w in citizen.text_input if w.label == "Enter Location or Landmark").input(f"Load test street {n}")
+    # Every user needs a photo of their own; repeats would be merged as duplicate reports
+    citizen.file_uploader[0].set_value((f"report-{n}.jpg", _report_photo([n, int(run_id, 16)]), "image/jpeg"))
+    _run(rec, citizen, "submit report", lambda: _button(citizen, "Submit Report").click().run())
+    complaint_id = store.complaints_by_user(citizen_name, limit=1, newest_first=True)[0]["id"]
+
+    # The champion account is set up directly; signing up is already measured above
+    store.create_user(champion_name, PASSWORD, "Green Champion")
+    champion = AppTest.from_file(SCRIPT, default_timeout=120)
+    champion.session_state["page"] = "Login"
+    _run(rec, champion, "open login", champion.run)
+    _log_in(rec, champion, champion_name)
+    _open_page(rec, champion, "others_nav", "Verify Reports")
+    _review(rec, champion, "verify", complaint_id, "👍 Verify selected", "verify report")
+    _open_page(rec, champion, "others_nav", "Dashboard")
+    _review(rec, champion, "resolve", complaint_id, "✅ Mark selected as Resolved", "resolve report")
+    if store.get_complaint(complaint_id)["status"] != "Resolved":
+        raise RuntimeError(f"resolve report: complaint {complaint_id} was not resolved")
+
+    _open_page(rec, citizen, "others_nav", "Scan Bin")
+    _run(rec, citizen, "scan bin QR", lambda: citizen.file_uploader(key="qr_uploader").set_value([("bin.png", qr_image, "image/png")]).run())
+    if not citizen.success:
+        raise RuntimeError("scan bin QR: no bin was recognised")
+
+    # Top the citizen up to the cheapest product (a resolved report earns only 10)
+    store.add_points(citizen_name, 50, "Load test credit", key=f"load-test:{citizen_name}")
+    _open_page(rec, citizen, "others_nav", "Shop")
+    _run(rec, citizen, "redeem in shop", lambda: _button(citizen, key="prod1").click().run())
+
+
+def _init_worker(app_dir):
+    sys.path.insert(0, app_dir)
+    # Pay for the heavy imports up front rather than inside the first timed action
+    for module in ("store", "streamlit.testing.v1"):
+        importlib.import_module(module)
+
+
+def run_user(n, run_id, qr_image):
+    """Worker entry point: (latency samples, error or None, RSS before, RSS after, worker pid)."""
+    rec = Recorder()
+    before = rss_mb()
+    error = None
+    main_module = sys.modules["__main__"]
+    try:
+        simulate_user(n, run_id, rec, qr_image)
+    except Exception as e:
+        error = f"user {n}: {type(e).__name__}: {e}"
+    finally:
+        # AppTest leaves the app script installed as __main__, which breaks unpickling the next task
+        sys.modules["__main__"] = main_module
+    return rec.samples, error, before, rss_mb(), os.getpid()
+
+
+def _report_photo(seed):
+    """A random noise photo; different seeds never look alike."""
+    import numpy as np
+    from PIL import Image
+
+    pixels = np.random.default_rng(seed).integers(0, 256, size=(1200, 1600, 3), dtype=np.uint8)
+    buf = io.BytesIO()
+    Image.fromarray(pixels).save(buf, format="JPEG", quality=85)
+    return buf.getvalue()
+
+
+def _bin_qr():
+    import qr_assets
+    import store
+
+    return qr_assets.qr_png(store.list_bin_ids(limit=1)[0])
+
+
+def compare(summary, baseline, tolerance):
+    """Prints p95 changes against a saved baseline; returns the actions that regressed beyond tolerance."""
+    regressed = []
+    print(f"\n{'action':<28}{'base p95':>10}{'now p95':>10}{'change':>9}")
+    for action, now in summary["actions"].items():
+        base = baseline["actions"].get(action)
+        if base is None:
+            print(f"{action:<28}{'-':>10}{now['p95']:>10.1f}{'new':>9}")
+            continue
+        change = now["p95"] / base["p95"] - 1 if base["p95"] else 0.0
+        flag = "  <-- slower" if change > tolerance else ""
+        if flag:
+            regressed.append(action)
+        print(f"{action:<28}{base['p95']:>10.1f}{now['p95']:>10.1f}{change:>+9.0%}{flag}")
+    growth, base_growth = summary["memory"]["growth_mb"], baseline["memory"]["growth_mb"]
+    if growth is not None and base_growth is not None:
+        print(f"{'memory growth / user (MB)':<28}{base_growth:>10.2f}{growth:>10.2f}")
+    return regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless multi-user load test of eco1.py.")
+    parser.add_argument("--users", type=int, default=10, help="Simulated users (each runs the full flow once)")
+    parser.add_argument("--concurrency", type=int, default=None, help="Users running at once (default: all)")
+    parser.add_argument("--data-dir", default=None, help="Data directory to run against (default: a fresh temp dir)")
+    parser.add_argument("--save-baseline", metavar="PATH", help="Write this run's results as a baseline")
+    parser.add_argument("--baseline", metavar="PATH", help="Compare against a saved baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed p95 slowdown vs the baseline (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    # The store reads its location at import time, so this must happen first
+    os.environ["ECOMORPHIS_DATA"] = args.data_dir or tempfile.mkdtemp(prefix="ecomorphis-load-")
+    sys.path.insert(0, APP_DIR)
+    qr_image = _bin_qr()
+
+    rec = Recorder()
+    run_id = f"{int(time.time()):x}"
+    concurrency = args.concurrency or args.users
+    failures, workers = [], {}  # pid -> {"start", "after_first", "end", "users"} RSS in MB
+
+    # spawn, not fork: the parent already holds SQLite connections
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(concurrency, mp_context=context, initializer=_init_worker, initargs=(APP_DIR,)) as pool:
+        started = time.perf_counter()
+        futures = [pool.submit(run_user, n, run_id, qr_image) for n in range(args.users)]
+        for future in futures:
+            samples, error, before, after, pid = future.result()
+            rec.merge(samples)
+            if error:
+                failures.append(error)
+            worker = workers.setdefault(pid, {"start": before, "after_first": after, "users": 0})
+            worker["end"] = after
+            worker["users"] += 1
+        wall = time.perf_counter() - started
+
+    # A worker's first user also pays for warming up imports and caches; later users show steady growth
+    steady = [(w["end"] - w["after_first"]) / (w["users"] - 1) for w in workers.values() if w["users"] > 1]
+    summary = {
+        "users": args.users,
+        "concurrency": concurrency,
+        "wall_s": wall,
+        "failures": len(failures),
+        "actions": rec.summary(),
+        "memory": {
+            "workers": len(workers),
+            "start_mb": sum(w["start"] for w in workers.values()) / len(workers),
+            "end_mb": sum(w["end"] for w in workers.values()) / len(workers),
+            "peak_mb": max(w["end"] for w in workers.values()),
+            "first_user_mb": sum(w["after_first"] - w["start"] for w in workers.values()) / len(workers),
+            "growth_mb": sum(steady) / len(steady) if steady else None,
+        },
+    }
+
+    print(f"{args.users} user(s), {concurrency} at a time, {wall:.1f}s wall, data in {os.environ['ECOMORPHIS_DATA']}")
+    print(f"\n{'action':<28}{'n':>5}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for action, s in summary["actions"].items():
+        print(f"{action:<28}{s['n']:>5}{s['p50']:>10.1f}{s['p95']:>10.1f}{s['p99']:>10.1f}{s['max']:>10.1f}")
+    m = summary["memory"]
+    steady_text = "n/a (run more users than --concurrency)" if m["growth_mb"] is None else f"{m['growth_mb']:.2f} MB"
+    print(f"\nWorker RSS (mean of {m['workers']}) {m['start_mb']:.0f} MB -> {m['end_mb']:.0f} MB, peak {m['peak_mb']:.0f} MB; "
+          f"first user +{m['first_user_mb']:.1f} MB, then {steady_text} per user")
+    for failure in failures:
+        print(f"FAILED {failure}", file=sys.stderr)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        print(f"Baseline written to {args.save_baseline}")
+
+    regressed = []
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressed = compare(summary, json.load(f), args.tolerance)
+    return 1 if failures or regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# -------------------------
+# Overflow Forecast Benchmark
+# -------------------------
+# Writes a synthetic fleet history into a scratch database (every bin cycles
+# Clean -> Overflowing at its own rate, faster in the evenings and at
+# weekends), then times the forecast batch end to end: reading the events,
+# the vectorized forecast and storing the results. Accuracy is measured
+# against each bin's simulated next overflow, which falls after "now" and so
+# is never part of the history the forecast sees.
+
+parser = argparse.ArgumentParser(description="Fleet-wide overflow forecast time and accuracy.")
+parser.add_argument("--bins", type=int, default=100_000)
+parser.add_argument("--days", type=int, default=60, help="Days of history per bin")
+parser.add_argument("--seed", type=int, default=7)
+args = parser.parse_args()
+
+tmp = tempfile.mkdtemp(prefix="ecomorphis-forecast-")
+os.environ["ECOMORPHIS_DB"] = os.path.join(tmp, "eco.db")
+os.environ["ECOMORPHIS_DATA"] = tmp
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import store
+import forecast
+
+
+def _history(rng, n_bins, days, now):
+    """bin_series rows for a synthetic fleet, plus each bin's actual next overflow after now."""
+    rates = rng.lognormal(np.log(48), 0.5, size=n_bins)  # typical hours from emptied to overflowing
+    hour = 3600 * 10**9
+    t = (now - pd.Timedelta(days=days)).value + rng.integers(0, 24, n_bins) * hour
+    actual = np.full(n_bins, np.datetime64("NaT"), dtype="datetime64[ns]")
+    bins, over, at = [], [], []
+    idx = np.arange(n_bins)
+    while len(idx):
+        clean_at = t[idx]
+        # Busy evenings and weekends fill bins up to twice as fast
+        stamp = pd.DatetimeIndex(clean_at)
+        speed = 1 + 0.5 * (stamp.hour >= 17) + 0.5 * (stamp.dayofweek >= 5)
+        over_at = clean_at + (rates[idx] / speed * rng.gamma(8, 1 / 8, len(idx)) * hour).astype(np.int64)
+        late = over_at >= now.value
+        actual[idx[late]] = over_at[late].astype("datetime64[ns]")
+        keep = ~late
+        bins += [idx, idx[keep]]
+        over += [np.zeros(len(idx), dtype=np.int64), np.ones(keep.sum(), dtype=np.int64)]
+        at += [clean_at, over_at[keep]]
+        # Collected a few hours after overflowing
+        t[idx[keep]] = over_at[keep] + rng.integers(1, 6, keep.sum()) * hour
+        idx = idx[keep]
+    bins, over, at = np.concatenate(bins), np.concatenate(over), np.concatenate(at)
+    order = np.lexsort((at, bins))
+    packed = ((at[order] // 10**9) * 2 + over[order]).astype("<i8").tobytes()
+    ends = np.cumsum(np.bincount(bins, minlength=n_bins)) * 8
+    starts = ends - np.bincount(bins, minlength=n_bins) * 8
+    names = [f"BIN-{i:06d}" for i in range(n_bins)]
+    series = [(names[i], packed[starts[i]:ends[i]]) for i in range(n_bins)]
+    return names, series, actual, len(bins)
+
+
+def main():
+    rng = np.random.default_rng(args.seed)
+    now = pd.Timestamp("2026-10-18 08:00:00")
+    names, series, actual, n_events = _history(rng, args.bins, args.days, now)
+    # Written straight into bin_series, the table the job reads; going through
+    # set_bins_status() for millions of changes would only time the setup
+    with store.transaction() as conn:
+        conn.executemany("INSERT INTO bins (bin_id, location, status) VALUES (?, ?, 'Clean')",
+                         [(b, f"Street {i}") for i, b in enumerate(names)])
+        conn.executemany("INSERT INTO bin_series (bin_id, events) VALUES (?, ?)", series)
+
+    start = time.perf_counter()
+    rows = store.bin_series()
+    read = time.perf_counter() - start
+    start = time.perf_counter()
+    result = forecast.forecast(rows, now)
+    compute = time.perf_counter() - start
+    start = time.perf_counter()
+    forecast.run(now)
+    total = time.perf_counter() - start
+
+    predicted = result["next_overflow"].reindex(names).to_numpy(dtype="datetime64[ns]")
+    ok = ~np.isnat(predicted) & ~np.isnat(actual)
+    error_h = np.abs((predicted[ok] - actual[ok]).astype(np.int64)) / 3600e9
+    print(f"{args.bins:,} bins, {n_events:,} status changes over {args.days} days")
+    print(f"read bin_series       {read:7.2f} s")
+    print(f"forecast (vectorized) {compute:7.2f} s")
+    print(f"run() end to end      {total:7.2f} s")
+    print(f"bins forecast         {ok.sum():,}")
+    print(f"abs error p50 / p90   {np.median(error_h):.1f} h / {np.percentile(error_h, 90):.1f} h")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
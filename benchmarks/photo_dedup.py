@@ -0,0 +1,86 @@
+import os
+import sys
+import time
+import argparse
+import statistics
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import photohash
+
+# -------------------------
+# Near-Duplicate Search Benchmark
+# -------------------------
+# Fills a photohash.HashIndex with random (pHash, dHash) pairs, plants a
+# near-duplicate for every query a few bits away, and times lookups against a
+# brute-force scan of the same arrays. Reports build time, lookup percentiles
+# and whether the index found exactly what the brute-force scan found.
+
+
+def _flip(rng, h, bits):
+    for b in rng.choice(64, size=bits, replace=False):
+        h ^= 1 << int(b)
+    return h
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Near-duplicate photo lookup latency.")
+    parser.add_argument("--photos", type=int, default=1_000_000, help="Stored hashes")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--distance", type=int, default=photohash.MAX_DISTANCE)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    stored = rng.integers(0, 1 << 63, size=(args.photos, 2), dtype=np.int64).astype(np.uint64) << np.uint64(1)
+    stored |= rng.integers(0, 2, size=(args.photos, 2), dtype=np.uint64)
+    queries = []
+    for n in range(args.queries):
+        ph, dh = (int(v) for v in stored[rng.integers(args.photos)])
+        # Half the queries are re-encodes of a stored photo, half are new photos
+        if n % 2 == 0:
+            queries.append((_flip(rng, ph, int(rng.integers(0, args.distance + 1))), _flip(rng, dh, int(rng.integers(0, 4)))))
+        else:
+            queries.append((int(rng.integers(0, 1 << 63)) << 1, int(rng.integers(0, 1 << 63)) << 1))
+
+    # The same (id, signed phash, signed dhash, subject) rows the store hands the index
+    rows = np.column_stack((np.arange(1, args.photos + 1), stored.view(np.int64), np.arange(args.photos)))
+    index = photohash.HashIndex()
+    start = time.perf_counter()
+    index.add(rows)
+    build = time.perf_counter() - start
+
+    timings, mismatches, hits = [], 0, 0
+    for ph, dh in queries:
+        start = time.perf_counter()
+        found = index.search(ph, dh, args.distance)
+        timings.append((time.perf_counter() - start) * 1000)
+        p = photohash._popcount(stored[:, 0] ^ np.uint64(ph))
+        d = photohash._popcount(stored[:, 1] ^ np.uint64(dh))
+        expected = set(np.flatnonzero((p <= args.distance) & (d <= photohash.DHASH_MAX_DISTANCE)).tolist())
+        mismatches += {s for s, _ in found} != expected
+        hits += bool(found)
+
+    brute = []
+    for ph, dh in queries[:20]:
+        start = time.perf_counter()
+        p = photohash._popcount(stored[:, 0] ^ np.uint64(ph))
+        np.flatnonzero((p <= args.distance) & (photohash._popcount(stored[:, 1] ^ np.uint64(dh)) <= photohash.DHASH_MAX_DISTANCE))
+        brute.append((time.perf_counter() - start) * 1000)
+
+    timings.sort()
+    print(f"{args.photos:,} stored hashes, {args.queries} queries, max distance {args.distance} bits")
+    print(f"index build        {build:8.2f} s")
+    print(f"lookup p50         {statistics.median(timings):8.3f} ms")
+    print(f"lookup p95         {timings[int(len(timings) * 0.95) - 1]:8.3f} ms")
+    print(f"lookup max         {timings[-1]:8.3f} ms")
+    print(f"brute-force p50    {statistics.median(brute):8.3f} ms")
+    print(f"queries with a hit {hits} (planted: {(args.queries + 1) // 2})")
+    print(f"result mismatches  {mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import routing
+
+# -------------------------
+# Route Planner Benchmark
+# -------------------------
+# Plans collection routes over random stops scattered around the depot and
+# reports solve time, the nearest-neighbour route length and how much 2-opt /
+# Or-opt took off it. Each size is solved once with a generous time budget so
+# the numbers show the full improvement run.
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Collection route planning time and quality.")
+    parser.add_argument("--stops", type=int, nargs="+", default=[50, 200, 1000])
+    parser.add_argument("--spread-km", type=float, default=6.0, help="Std. deviation of stop distance from the depot")
+    parser.add_argument("--budget", type=float, default=60.0, help="Seconds allowed per instance")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    spread = args.spread_km / 111.0
+    print(f"{'stops':>6} {'solve s':>8} {'nearest-first km':>17} {'optimized km':>13} {'saved':>6}")
+    for n in args.stops:
+        lats = routing.DEPOT[0] + rng.normal(0, spread, n)
+        lons = routing.DEPOT[1] + rng.normal(0, spread, n)
+        start = time.perf_counter()
+        order, legs, stats = routing.plan_route(lats, lons, time_budget=args.budget)
+        elapsed = time.perf_counter() - start
+        assert sorted(order.tolist()) == list(range(n)) and abs(legs.sum() - stats["optimized_km"]) < 0.01
+        saved = 1 - stats["optimized_km"] / stats["greedy_km"]
+        print(f"{n:6d} {elapsed:8.2f} {stats['greedy_km']:17.1f} {stats['optimized_km']:13.1f} {saved:6.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+import os
+import sys
+import json
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+# -------------------------
+# Startup Benchmark
+# -------------------------
+# Times a cold start (interpreter + script imports + first render of the
+# landing page) and the first render of every in-app page, each in a fresh
+# process with an empty data directory, and lists which heavy libraries each
+# one pulled in. Point --script at an older checkout of eco1.py (e.g. from
+# `git worktree add /tmp/before <rev>`) to compare before and after.
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ["cv2", "qrcode", "pandas", "numpy", "PIL"]
+PAGES = [
+    "User Details", "Achievements", "Eco Garden", "About Us", "Impact", "Contact Us",
+    "Citizen Learning", "Waste Worker Training", "Report Waste", "Verify Reports",
+    "Dashboard", "Shop", "Facilities", "Penalization", "Scan Bin",
+]
+
+# Runs inside the child process; prints one JSON line
+CHILD = r"""
+import os, sys, json, time
+start = time.perf_counter()
+script, page, reruns = sys.argv[1], sys.argv[2], int(sys.argv[3])
+sys.path.insert(0, os.path.dirname(script))
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(script, default_timeout=120)
+if page:
+    at.session_state["page"] = "App"
+    at.session_state["active_page"] = page
+    at.session_state["current_user"] = {"username": "champion", "role": "Green Champion", "points": 250}
+t = time.perf_counter()
+at.run()
+first = time.perf_counter() - t
+assert not at.exception, [e.message for e in at.exception]
+warm = []
+for _ in range(reruns):
+    t = time.perf_counter()
+    at.run()
+    warm.append(time.perf_counter() - t)
+print(json.dumps({
+    "total": time.perf_counter() - start,
+    "first": first,
+    "rerun": sorted(warm)[len(warm) // 2] if warm else None,
+    "heavy": sorted(m for m in %r if m in sys.modules),
+}))
+""" % HEAVY_MODULES
+
+
+def measure(script, page, reruns):
+    with tempfile.TemporaryDirectory() as data_dir:
+        env = dict(os.environ, ECOMORPHIS_DATA=data_dir)
+        out = subprocess.run(
+            [sys.executable, "-c", CHILD, script, page, str(reruns)],
+            env=env, capture_output=True, text=True, check=True,
+        ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cold start and first-render latency per page.")
+    parser.add_argument("--script", default=os.path.join(APP_DIR, "eco1.py"))
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh processes per measurement (median is reported)")
+    parser.add_argument("--reruns", type=int, default=5, help="Warm reruns timed after the first render")
+    parser.add_argument("--pages", nargs="*", default=None, help="Only these in-app pages")
+    args = parser.parse_args(argv)
+
+    print(f"{'page':<24}{'process ms':>12}{'first ms':>10}{'rerun ms':>10}  heavy modules loaded")
+    for page in [""] + (args.pages if args.pages is not None else PAGES):
+        runs = [measure(args.script, page, args.reruns) for _ in range(args.repeat)]
+        total = statistics.median(r["total"] for r in runs) * 1000
+        first = statistics.median(r["first"] for r in runs) * 1000
+        rerun = statistics.median(r["rerun"] for r in runs) * 1000 if runs[0]["rerun"] is not None else float("nan")
+        print(f"{page or '(landing)':<24}{total:>12.0f}{first:>10.0f}{rerun:>10.1f}  {', '.join(runs[0]['heavy']) or '-'}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+
+# -------------------------
+# Upload Ingestion Benchmark
+# -------------------------
+# Writes synthetic phone photos (JPEGs from 2 to 50 MP carrying EXIF GPS,
+# plus large PNGs), then runs each through the upload paths, each case in a
+# fresh child process. Reported per upload: median time, peak RSS growth
+# over the process before the upload (the upload bytes are already in memory,
+# as they are in Streamlit) and the size of what gets stored. "qr full-res"
+# is the old scan-page decode, for comparison with the reduced decode.
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CASES = [
+    ("jpeg 2 MP", "jpg", (1600, 1200)),
+    ("jpeg 12 MP", "jpg", (4000, 3000)),
+    ("jpeg 50 MP", "jpg", (8160, 6120)),
+    ("png 12 MP", "png", (4000, 3000)),
+    ("png 30 MP", "png", (6000, 5000)),
+]
+MODES = ["report photo", "green snap", "qr", "qr full-res"]
+
+
+def _photo(path, fmt, size):
+    """A photo-like test image: smooth shapes plus sensor noise, with a GPS tag on JPEGs."""
+    import numpy as np
+    from PIL import Image, ImageFilter
+
+    rng = np.random.default_rng(7)
+    small = Image.fromarray(rng.integers(0, 255, (size[1] // 16, size[0] // 16, 3), dtype=np.uint8))
+    image = small.filter(ImageFilter.GaussianBlur(1)).resize(size, Image.Resampling.BICUBIC)
+    noise = Image.effect_noise(size, 40).convert("RGB")
+    image = Image.blend(image, noise, 0.2)
+    if fmt == "jpg":
+        exif = Image.Exif()
+        exif[0x8825] = {1: "N", 2: (23.0, 15.0, 36.0), 3: "E", 4: (77.0, 24.0, 45.0)}
+        image.save(path, "JPEG", quality=90, exif=exif.tobytes())
+    else:
+        image.save(path, "PNG", compress_level=1)
+
+
+def _reset_peak():
+    """Restarts the peak-RSS count (Linux); elsewhere the peak since process start is used."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def _rss_kb(field):
+    """VmRSS or VmHWM (peak) from /proc, falling back to ru_maxrss for both."""
+    try:
+        with open("/proc/self/status") as f:
+            return next(int(line.split()[1]) for line in f if line.startswith(field + ":"))
+    except (OSError, StopIteration):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _child(path, mode, repeat):
+    """Runs one case and prints a JSON result line."""
+    import numpy as np
+    import uploads
+    import qr_scan
+    import photohash
+
+    with open(path, "rb") as f:
+        upload = io.BytesIO(f.read())
+
+    def run():
+        if mode == "report photo":
+            result = uploads.ingest(upload)
+            photohash.image_hashes(result.image)
+            return len(result.data)
+        if mode == "green snap":
+            photohash.image_hashes(uploads.ingest(upload, encode_photo=False).image)
+            return 0
+        reduction = uploads.reduction(upload) if mode == "qr" else 1
+        qr_scan.decode_image(upload.getbuffer(), reduction)
+        return 0
+
+    _reset_peak()
+    before = _rss_kb("VmRSS")
+    times = []
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            stored = run()
+            times.append(time.perf_counter() - start)
+    except uploads.UploadRejected:
+        stored = None
+    print(json.dumps({
+        "ms": float(np.median(times)) * 1000 if times else None,
+        "peak_mb": (_rss_kb("VmHWM") - before) / 1024,
+        "stored_kb": None if stored is None else stored / 1024,
+    }))
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time and memory per uploaded photo.")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--child", nargs=2, metavar=("FILE", "MODE"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.child:
+        return _child(args.child[0], args.child[1], args.repeat)
+
+    tmp = tempfile.mkdtemp(prefix="ecomorphis-uploads-")
+    print(f"{'photo':<12} {'upload KB':>10} {'path':<14} {'ms':>8} {'peak MB':>8} {'stored KB':>10}")
+    for label, fmt, size in CASES:
+        path = os.path.join(tmp, f"{label.replace(' ', '_')}.{fmt}")
+        _photo(path, fmt, size)
+        for mode in MODES:
+            out = subprocess.run([sys.executable, __file__, "--repeat", str(args.repeat), "--child", path, mode],
+                                 check=True, capture_output=True, text=True).stdout
+            r = json.loads(out.strip().splitlines()[-1])
+            ms = "rejected" if r["ms"] is None else f"{r['ms']:.0f}"
+            stored = "" if not r["stored_kb"] else f"{r['stored_kb']:.0f}"
+            print(f"{label:<12} {os.path.getsize(path) / 1024:10.0f} {mode:<14} {ms:>8} {r['peak_mb']:8.0f} {stored:>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
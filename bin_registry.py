@@ -0,0 +1,46 @@
+import sys
+import argparse
+
+import pandas as pd
+
+import bulk
+
+# -------------------------
+# Bin Registry Bulk Import
+# -------------------------
+# Loads a bin fleet from CSV or Parquet. Kept as the bins-only entry point;
+# the chunked reading, validation and batched upserts live in bulk.py (a bin
+# listed twice keeps its last row).
+#
+# Columns: bin_id, location, zone, latitude, longitude[, status]
+
+REQUIRED_COLUMNS = bulk.IMPORTERS["bins"].required
+STATUSES = bulk.BIN_STATUSES
+CHUNK_ROWS = bulk.CHUNK_ROWS
+
+
+def import_csv(source, chunk_rows=CHUNK_ROWS):
+    """Imports bins from a CSV / Parquet path or file object.
+
+    Returns (number of bins imported, list of (line, bin_id, reason) for rejected rows).
+    Line numbers count the header as line 1.
+    """
+    return bulk.import_file("bins", source, chunk_rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk import bins from CSV.")
+    parser.add_argument("csv", help="CSV with columns: " + ", ".join(REQUIRED_COLUMNS) + "[, status]")
+    parser.add_argument("--errors", help="Write rejected rows to this CSV")
+    args = parser.parse_args(argv)
+
+    imported, errors = import_csv(args.csv)
+    print(f"Imported {imported} bin(s); rejected {len(errors)} row(s).")
+    if errors and args.errors:
+        pd.DataFrame(errors, columns=["line", "bin_id", "reason"]).to_csv(args.errors, index=False)
+        print(f"Rejected rows written to {args.errors}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+import os
+import hashlib
+import tempfile
+
+import store
+
+# -------------------------
+# Content-Addressed Photo Store
+# -------------------------
+# Uploaded photos live on disk under their SHA-256, sharded two levels deep
+# (blobs/ab/cd/abcd...) so no directory grows past a few thousand entries.
+# Records only keep the hex digest; identical uploads are stored once.
+
+BLOB_DIR = os.environ.get("ECOMORPHIS_BLOBS", os.path.join(store.DATA_DIR, "blobs"))
+CHUNK_SIZE = 1 << 20
+
+
+def path(ref):
+    return os.path.join(BLOB_DIR, ref[:2], ref[2:4], ref)
+
+
+def exists(ref):
+    return bool(ref) and os.path.exists(path(ref))
+
+
+def _write(ref, chunks):
+    target = path(ref)
+    if os.path.exists(target):
+        return
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(target), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+        # Atomic, so readers never see a half-written photo
+        os.replace(tmp, target)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def put(data):
+    """Stores bytes and returns their blob reference."""
+    ref = hashlib.sha256(data).hexdigest()
+    _write(ref, [data])
+    return ref
+
+
+def put_file(fileobj):
+    """Streams a file-like object (e.g. a Streamlit UploadedFile) into the store."""
+    fileobj.seek(0)
+    digest = hashlib.sha256()
+    # Hash first so duplicates never touch the disk
+    while True:
+        chunk = fileobj.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        digest.update(chunk)
+    ref = digest.hexdigest()
+
+    def chunks():
+        fileobj.seek(0)
+        while True:
+            chunk = fileobj.read(CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+    _write(ref, chunks())
+    return ref
+
+
+def get(ref):
+    with open(path(ref), "rb") as f:
+        return f.read()
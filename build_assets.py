@@ -0,0 +1,158 @@
+import os
+import io
+import re
+import sys
+import json
+import hashlib
+import argparse
+import urllib.request
+
+from PIL import Image
+
+import assets
+
+# -------------------------
+# Static Asset Build
+# -------------------------
+# Mirrors every remote image (and the Roboto web font) into static/ under
+# content-hashed names, pre-renders narrower WebP variants, and bundles the
+# global stylesheet with its URLs rewritten to the local copies. Run it once per
+# deploy; the app picks the result up from static/manifest.json.
+#
+# Because names change whenever content does, /app/static/ can be served with
+# "Cache-Control: public, max-age=31536000, immutable". Streamlit does not set
+# that header itself, so add it at the reverse proxy in front of the app.
+
+VARIANT_WIDTHS = (480, 960)
+FONT_IMPORT = re.compile(r'@import url\("(https://fonts\.googleapis\.com/[^"]+)"\);\s*')
+FONT_URL = re.compile(r"url\((https://[^)]+)\)")
+# Google Fonts serves woff2 only to browsers that say they support it
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+
+
+def fetch(url, timeout=30):
+    request = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return response.read()
+
+
+def _write_hashed(stem, ext, data):
+    """Writes data to static/<stem>.<hash>.<ext> (atomically, once) and returns the file name."""
+    filename = f"{stem}.{hashlib.sha256(data).hexdigest()[:12]}.{ext}"
+    path = os.path.join(assets.STATIC_DIR, filename)
+    if not os.path.exists(path):
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    return filename
+
+
+def _extension(url):
+    ext = os.path.splitext(url.split("?")[0])[1].lower().lstrip(".")
+    return "jpg" if ext == "jpeg" else (ext or "bin")
+
+
+def build_image(name, url):
+    """Mirrors one image and renders its width variants; returns its manifest entry."""
+    data = fetch(url)
+    entry = {"source": url, "file": _write_hashed(name, _extension(url), data), "variants": []}
+    if entry["file"].endswith(".svg"):
+        return entry
+    img = Image.open(io.BytesIO(data))
+    img.load()
+    entry["width"], entry["height"] = img.size
+    if img.mode not in ("RGB", "RGBA"):
+        img = img.convert("RGBA" if "transparency" in img.info or img.mode in ("LA", "PA") else "RGB")
+    for width in VARIANT_WIDTHS:
+        if width >= img.width:
+            break
+        resized = img.resize((width, round(img.height * width / img.width)), Image.LANCZOS)
+        buf = io.BytesIO()
+        resized.save(buf, format="WEBP", quality=82, method=6)
+        entry["variants"].append({"width": width, "file": _write_hashed(f"{name}-{width}w", "webp", buf.getvalue())})
+    return entry
+
+
+def build_stylesheet(image_entries):
+    """Bundles the stylesheet with local fonts and images; returns (file name, fully local?)."""
+    with open(assets.STYLESHEET_SOURCE, encoding="utf-8") as f:
+        css = f.read()
+
+    local = True
+    match = FONT_IMPORT.search(css)
+    if match:
+        try:
+            font_css = fetch(match.group(1)).decode("utf-8")
+            for font_url in sorted(set(FONT_URL.findall(font_css))):
+                font_file = _write_hashed("font", _extension(font_url), fetch(font_url))
+                font_css = font_css.replace(font_url, font_file)
+            css = css[:match.start()] + font_css + "\n" + css[match.end():]
+        except OSError as e:
+            print(f"  ! web font not mirrored, keeping the remote @import: {e}", file=sys.stderr)
+            local = False
+
+    # Files sit next to the stylesheet, so a bare file name is a valid relative URL
+    for entry in image_entries.values():
+        css = css.replace(entry["source"], entry["file"])
+    if any(url in css for url in assets.REMOTE_ASSETS.values()):
+        local = False
+    return _write_hashed("ecomorphis", "css", css.encode("utf-8")), local
+
+
+def _previous_manifest():
+    try:
+        with open(assets.MANIFEST_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def build(names=None):
+    """Builds static/ and its manifest; returns the names of assets that could not be mirrored."""
+    os.makedirs(assets.STATIC_DIR, exist_ok=True)
+    previous = _previous_manifest().get("assets", {})
+    entries, failed = {}, []
+    for name, url in assets.REMOTE_ASSETS.items():
+        old = previous.get(name)
+        if names and name not in names and old and old["source"] == url:
+            entries[name] = old
+            continue
+        try:
+            entries[name] = build_image(name, url)
+            print(f"  {name}: {entries[name]['file']} (+{len(entries[name]['variants'])} variant(s))")
+        except (OSError, ValueError) as e:
+            failed.append(name)
+            # Keep serving the last good copy rather than dropping back to the remote URL
+            if old and old["source"] == url and os.path.exists(os.path.join(assets.STATIC_DIR, old["file"])):
+                entries[name] = old
+            print(f"  ! {name}: {e}", file=sys.stderr)
+
+    stylesheet, css_local = build_stylesheet(entries)
+    if not css_local:
+        failed.append("stylesheet")
+    manifest = {"assets": entries, "stylesheet": stylesheet}
+    tmp = f"{assets.MANIFEST_PATH}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp, assets.MANIFEST_PATH)
+    return failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mirror remote images and the stylesheet into static/.")
+    parser.add_argument("names", nargs="*", help="Only refetch these assets (default: all)")
+    args = parser.parse_args(argv)
+
+    unknown = set(args.names) - set(assets.REMOTE_ASSETS)
+    if unknown:
+        parser.error(f"unknown asset(s): {', '.join(sorted(unknown))}")
+    failed = build(set(args.names))
+    print(f"Wrote {assets.MANIFEST_PATH}")
+    if failed:
+        print(f"Could not fetch (last good copy or remote URL is used): {', '.join(failed)}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,386 @@
+import os
+import sys
+import argparse
+import tempfile
+from collections import namedtuple
+from contextlib import ExitStack, contextmanager, nullcontext
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pyarrow.csv as pa_csv
+
+import store
+import geocode
+import facilities
+
+# -------------------------
+# Bulk Import & Export
+# -------------------------
+# Onboarding a city means loading its users, bins, facilities and complaint
+# history from CSV or Parquet. Files are read in chunks; each chunk is
+# validated column-wise with pandas, bad rows are reported by line (CSV,
+# counting the header as line 1) or row number (Parquet), and good rows are
+# written in transactions of up to BATCH_ROWS, so memory stays flat however
+# big the file is. A failed import keeps the batches committed before it.
+# Exports page through a table by id and append each page to a CSV or
+# Parquet file, so they never hold the whole table either.
+
+CHUNK_ROWS = 50000
+# Rows per write transaction. Fewer, larger commits rewrite the rollup pages less
+# often; smaller ones hold the write lock for less time
+BATCH_ROWS = 250000
+EXPORT_DIR = os.environ.get("ECOMORPHIS_EXPORT_DIR", os.path.join(store.DATA_DIR, "exports"))
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+ROLES = ["Citizen", "Green Champion"]
+BIN_STATUSES = ["Clean", "Overflowing"]
+# 'Duplicate' is left out: it only makes sense with the original complaint attached
+COMPLAINT_STATUSES = ["Pending", "Verified", "Resolved", "Invalid"]
+
+# required / optional columns, the column that names a row in error reports,
+# fn(chunk) -> (reasons, rows) and a context manager yielding fn(rows) that stores a chunk
+Importer = namedtuple("Importer", "required optional key validate sink")
+
+
+def is_parquet(source):
+    return str(getattr(source, "name", source)).lower().endswith(".parquet")
+
+
+def read_chunks(source, chunk_rows=CHUNK_ROWS):
+    """Yields DataFrame chunks of a CSV or Parquet path / file object, CSV values as strings."""
+    if is_parquet(source):
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(source, chunksize=chunk_rows, dtype=str, keep_default_na=False, na_values=[""])
+
+
+# --- Validation helpers ---
+def _text(chunk, column):
+    if column not in chunk:
+        return pd.Series(pd.NA, index=chunk.index, dtype="string")
+    return chunk[column].astype("string").str.strip().replace("", pd.NA)
+
+
+def _number(chunk, column):
+    if column not in chunk:
+        return pd.Series(np.nan, index=chunk.index)
+    return pd.to_numeric(chunk[column], errors="coerce")
+
+
+def _first_failure(index, checks):
+    """The first failing check's reason per row (NA where every check passed)."""
+    reasons = pd.Series(pd.NA, index=index, dtype="string")
+    for failed, reason in reversed(checks):
+        reasons = reasons.mask(failed.fillna(True).to_numpy(dtype=bool), reason)
+    return reasons
+
+
+def _values(series):
+    """Python values for the store, None for missing."""
+    return series.astype(object).where(series.notna(), None).tolist()
+
+
+# --- Users ---
+def _validate_users(chunk):
+    username, password, role = _text(chunk, "username"), _text(chunk, "password"), _text(chunk, "role")
+    points = _number(chunk, "points").where(_text(chunk, "points").notna(), 0)
+    # Existing accounts are reported, not updated: an import must not reset passwords or roles
+    taken = username.isin(store.existing_usernames(username.dropna().tolist()))
+    reasons = _first_failure(chunk.index, [
+        (username.isna(), "missing username"),
+        (taken | username.duplicated(), "username already exists"),
+        (password.isna(), "missing password"),
+        (~role.isin(ROLES), f"role must be one of {', '.join(ROLES)}"),
+        (points.isna() | (points < 0) | (points % 1 != 0), "points must be a whole number of at least 0"),
+    ])
+    good = reasons.isna().to_numpy()
+    return reasons, list(zip(
+        username[good].tolist(), password[good].tolist(), role[good].tolist(), points[good].astype(int).tolist(),
+    ))
+
+
+# --- Bins ---
+def _validate_bins(chunk):
+    bin_id, location, zone = _text(chunk, "bin_id"), _text(chunk, "location"), _text(chunk, "zone")
+    lat, lon = _number(chunk, "latitude"), _number(chunk, "longitude")
+    status = _text(chunk, "status").fillna("Clean")
+    reasons = _first_failure(chunk.index, [
+        (bin_id.isna(), "missing bin_id"),
+        (location.isna(), "missing location"),
+        (~lat.between(-90, 90), "latitude must be a number between -90 and 90"),
+        (~lon.between(-180, 180), "longitude must be a number between -180 and 180"),
+        (~status.isin(BIN_STATUSES), f"status must be one of {', '.join(BIN_STATUSES)}"),
+    ])
+    good = reasons.isna().to_numpy()
+    return reasons, list(zip(
+        bin_id[good].tolist(), location[good].tolist(), _values(zone[good]),
+        lat[good].astype(float).tolist(), lon[good].astype(float).tolist(), status[good].tolist(),
+    ))
+
+
+# --- Complaints ---
+def _timestamps(chunk, column):
+    """Timestamps in the store's text format; NA where a value doesn't parse."""
+    if column not in chunk:
+        return pd.Series(pd.NA, index=chunk.index, dtype="string")
+    values = chunk[column]
+    if not pd.api.types.is_datetime64_any_dtype(values):
+        values = pd.to_datetime(values.astype("string").str.strip(), errors="coerce", format="ISO8601")
+    return values.dt.strftime(TIMESTAMP_FORMAT).astype("string")
+
+
+def _validate_complaints(chunk, gazetteer):
+    user, location, waste_type = _text(chunk, "user"), _text(chunk, "location"), _text(chunk, "waste_type")
+    timestamp = _timestamps(chunk, "timestamp")
+    status = _text(chunk, "status").fillna("Pending")
+    complaint_id = _number(chunk, "id")
+    lat, lon = _number(chunk, "latitude"), _number(chunk, "longitude")
+    has_id = _text(chunk, "id").notna()
+    has_point = _text(chunk, "latitude").notna() | _text(chunk, "longitude").notna()
+    # A row whose id is already stored must be that complaint, re-imported: same reporter, time
+    # and status (status changes go through the app, where they move points and counters)
+    ids = complaint_id.where(has_id & (complaint_id >= 1) & (complaint_id % 1 == 0))
+    stored = store.complaints_by_ids([int(i) for i in ids.dropna().unique()])
+    known = ids.map(lambda i: stored.get(int(i)) if pd.notna(i) else None)
+    exists = known.notna()
+    same = pd.Series(True, index=chunk.index)
+    if exists.any():
+        same[exists] = [k == row for k, row in zip(
+            known[exists], zip(_values(user[exists]), _values(timestamp[exists]), _values(status[exists])))]
+    reasons = _first_failure(chunk.index, [
+        (has_id & ~((complaint_id >= 1) & (complaint_id % 1 == 0)), "id must be a positive whole number"),
+        (user.isna(), "missing user"),
+        (location.isna(), "missing location"),
+        (waste_type.isna(), "missing waste_type"),
+        (timestamp.isna(), "timestamp must be a date and time, e.g. 2025-09-19 09:30:00"),
+        (~status.isin(COMPLAINT_STATUSES), f"status must be one of {', '.join(COMPLAINT_STATUSES)}"),
+        (has_point & ~(lat.between(-90, 90) & lon.between(-180, 180)), "latitude / longitude out of range"),
+        (ids.notna() & ids.duplicated(), "id listed twice"),
+        (~same, "id belongs to a different complaint, or its status differs from the stored one"),
+    ])
+    good = reasons.isna().to_numpy()
+    lat, lon, ward = lat[good], lon[good], _text(chunk, "ward")[good]
+
+    # New rows without coordinates are geocoded by location name, once per distinct name;
+    # stored complaints keep their place unless the row gives one
+    missing = (lat.isna() | lon.isna()) & ~exists[good]
+    if missing.any():
+        places = {name: gazetteer.resolve(name) for name in location[good][missing].unique()}
+        found = location[good][missing].map(places)
+        found = found[found.notna()]
+        lat[found.index] = [p["latitude"] for p in found]
+        lon[found.index] = [p["longitude"] for p in found]
+        ward[found.index] = ward[found.index].fillna(pd.Series([p["ward"] or pd.NA for p in found], index=found.index))
+    located = lat.notna() & lon.notna()
+    cells = pd.Series(None, index=lat.index, dtype=object)
+    if located.any():
+        cells[located] = geocode.geohash_many(lat[located].to_numpy(), lon[located].to_numpy())
+
+    return reasons, list(zip(
+        _values(complaint_id[good].astype("Int64")), user[good].tolist(), location[good].tolist(),
+        waste_type[good].tolist(), timestamp[good].tolist(), status[good].tolist(),
+        _values(_text(chunk, "verified_by")[good]), _values(_text(chunk, "resolved_by")[good]),
+        _values(lat), _values(lon), _values(ward), cells.tolist(),
+    ))
+
+
+# --- Facilities ---
+def _validate_facilities(chunk):
+    name, kind, waste_type = _text(chunk, "Name"), _text(chunk, "Type"), _text(chunk, "Waste_Type")
+    lat, lon = _number(chunk, "Latitude"), _number(chunk, "Longitude")
+    reasons = _first_failure(chunk.index, [
+        (name.isna(), "missing Name"),
+        (kind.isna(), "missing Type"),
+        (waste_type.isna(), "missing Waste_Type"),
+        (~lat.between(-90, 90), "Latitude must be a number between -90 and 90"),
+        (~lon.between(-180, 180), "Longitude must be a number between -180 and 180"),
+    ])
+    good = reasons.isna().to_numpy()
+    return reasons, list(zip(
+        name[good].tolist(), kind[good].tolist(), waste_type[good].tolist(),
+        lat[good].astype(float).tolist(), lon[good].astype(float).tolist(),
+    ))
+
+
+FACILITY_SCHEMA = pa.schema([
+    ("Name", pa.string()), ("Type", pa.string()), ("Waste_Type", pa.string()),
+    ("Latitude", pa.float64()), ("Longitude", pa.float64()),
+])
+
+
+@contextmanager
+def _facility_file():
+    """Streams facilities into a temp file next to facilities.FACILITIES_PATH and swaps it in on success.
+
+    The inventory is replaced, not merged: a facility file is the whole list.
+    The reference loader notices the new file and rebuilds the facility index.
+    """
+    path = facilities.FACILITIES_PATH
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    os.close(fd)
+    writer = pq.ParquetWriter(tmp, FACILITY_SCHEMA) if is_parquet(path) else None
+    header = [True]
+
+    def write(rows):
+        table = pa.Table.from_pylist([dict(zip(FACILITY_SCHEMA.names, row)) for row in rows], schema=FACILITY_SCHEMA)
+        if writer is not None:
+            writer.write_table(table)
+        else:
+            table.to_pandas().to_csv(tmp, mode="a", header=header[0], index=False)
+            header[0] = False
+
+    try:
+        yield write
+        if writer is not None:
+            writer.close()
+            writer = None
+        elif header[0]:
+            pd.DataFrame(columns=FACILITY_SCHEMA.names).to_csv(tmp, index=False)
+        os.replace(tmp, path)
+    finally:
+        if writer is not None:
+            writer.close()
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+IMPORTERS = {
+    "users": Importer(["username", "password", "role"], ["points"], "username",
+                      _validate_users, lambda: nullcontext(store.import_users)),
+    "bins": Importer(["bin_id", "location", "zone", "latitude", "longitude"], ["status"], "bin_id",
+                     _validate_bins, lambda: nullcontext(store.upsert_bins)),
+    "complaints": Importer(["user", "location", "waste_type", "timestamp"],
+                           ["id", "status", "verified_by", "resolved_by", "latitude", "longitude", "ward"], "user",
+                           None, lambda: nullcontext(store.import_complaints)),
+    "facilities": Importer(facilities.COLUMNS, [], "Name", _validate_facilities, _facility_file),
+}
+
+
+def import_file(kind, source, chunk_rows=CHUNK_ROWS):
+    """Imports one kind of record from a CSV / Parquet path or file object.
+
+    Returns (rows imported, list of (line, key, reason) for rejected rows).
+    Raises ValueError when a required column is missing.
+    """
+    importer = IMPORTERS[kind]
+    validate = importer.validate
+    if kind == "complaints":
+        gazetteer = geocode.Gazetteer(geocode.load_gazetteer())
+        validate = lambda chunk: _validate_complaints(chunk, gazetteer)  # noqa: E731
+    imported, errors = 0, []
+    line = 1 if is_parquet(source) else 2
+    pending = 0
+    with importer.sink() as write, ExitStack() as batch:
+        for chunk in read_chunks(source, chunk_rows):
+            missing = [c for c in importer.required if c not in chunk.columns]
+            if missing:
+                raise ValueError(f"File is missing column(s): {', '.join(missing)}")
+            chunk = chunk.reset_index(drop=True)
+            reasons, rows = validate(chunk)
+            bad = reasons.notna().to_numpy()
+            keys = _text(chunk, importer.key)[bad].fillna("")
+            errors.extend(zip((line + np.flatnonzero(bad)).tolist(), keys.tolist(), reasons[bad].tolist()))
+            if rows:
+                # Chunks join one transaction until BATCH_ROWS are written (store transactions nest)
+                if not pending:
+                    batch.enter_context(store.bulk_transaction())
+                write(rows)
+                pending += len(rows)
+                if pending >= BATCH_ROWS:
+                    batch.close()
+                    pending = 0
+            imported += len(rows)
+            line += len(chunk)
+    return imported, errors
+
+
+# --- Exports ---
+EXPORTS = {
+    "complaints": ("complaints", [
+        ("id", pa.int64()), ("user", pa.string()), ("location", pa.string()), ("waste_type", pa.string()),
+        ("timestamp", pa.string()), ("status", pa.string()), ("verified_by", pa.string()),
+        ("resolved_by", pa.string()), ("duplicate_of", pa.int64()), ("latitude", pa.float64()),
+        ("longitude", pa.float64()), ("ward", pa.string()), ("geohash", pa.string()), ("photo_ref", pa.string()),
+    ]),
+    "ledger": ("points_ledger", [
+        ("id", pa.int64()), ("username", pa.string()), ("delta", pa.int64()), ("reason", pa.string()),
+        ("key", pa.string()), ("at", pa.string()),
+    ]),
+    "bin_history": ("bin_events", [
+        ("id", pa.int64()), ("bin_id", pa.string()), ("status", pa.string()), ("actor", pa.string()),
+        ("at", pa.string()),
+    ]),
+}
+
+
+def export(kind, dest, fmt="csv", chunk_rows=CHUNK_ROWS):
+    """Writes a whole table to a path or binary file object, one id-ordered page at a time; returns the row count."""
+    table, fields = EXPORTS[kind]
+    schema = pa.schema(fields)
+    columns = [name for name, _ in fields]
+    if fmt == "parquet":
+        writer = pq.ParquetWriter(dest, schema)
+    else:
+        writer = pa_csv.CSVWriter(dest, schema, write_options=pa_csv.WriteOptions(quoting_style="needed"))
+    total, after_id = 0, 0
+    with writer:
+        while True:
+            rows = store.rows_after(table, columns, after_id, chunk_rows)
+            if not rows:
+                break
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(col, type=t) for col, (_, t) in zip(zip(*rows), fields)], schema=schema))
+            total += len(rows)
+            after_id = rows[-1][0]
+    return total
+
+
+def export_file(kind, fmt="csv"):
+    """Exports to EXPORT_DIR/<kind>.<fmt> (replacing the previous export) and returns the path."""
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    path = os.path.join(EXPORT_DIR, f"{kind}.{fmt}")
+    fd, tmp = tempfile.mkstemp(dir=EXPORT_DIR, suffix=".tmp")
+    os.close(fd)
+    try:
+        export(kind, tmp, fmt)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk import and export.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    load = commands.add_parser("import", help="Import users, bins, complaints or facilities from CSV / Parquet")
+    load.add_argument("kind", choices=sorted(IMPORTERS))
+    load.add_argument("file")
+    load.add_argument("--errors", help="Write rejected rows to this CSV")
+    dump = commands.add_parser("export", help="Export complaints, the points ledger or bin history")
+    dump.add_argument("kind", choices=sorted(EXPORTS))
+    dump.add_argument("file", help="Output path; .parquet for Parquet, anything else for CSV")
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        n = export(args.kind, args.file, "parquet" if is_parquet(args.file) else "csv")
+        print(f"Exported {n} {args.kind} row(s) to {args.file}")
+        return 0
+    try:
+        imported, errors = import_file(args.kind, args.file)
+    except ValueError as e:
+        print(e)
+        return 2
+    print(f"Imported {imported} {args.kind} row(s); rejected {len(errors)} row(s).")
+    if errors and args.errors:
+        pd.DataFrame(errors, columns=["line", IMPORTERS[args.kind].key, "reason"]).to_csv(args.errors, index=False)
+        print(f"Rejected rows written to {args.errors}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,237 @@
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import urllib.request
+from collections import namedtuple
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import store
+import metrics
+
+# -------------------------
+# Event Bus & Notification Outbox
+# -------------------------
+# Pages publish typed domain events inside the same transaction as the change
+# they describe; publish() only inserts outbox rows, so a rerun never waits on
+# a network call. A daemon worker thread per process claims due events in
+# batches and hands them to every configured sink (file, webhook, SMS stand-in).
+# Failed batches are retried with exponential backoff. Delivery is
+# at-least-once, so sinks should de-duplicate on the event id.
+
+SINK_NAMES = [s.strip() for s in os.environ.get("ECOMORPHIS_EVENT_SINKS", "file").split(",") if s.strip()]
+OUTBOX_DIR = os.environ.get("ECOMORPHIS_OUTBOX_DIR", os.path.join(store.DATA_DIR, "outbox"))
+WEBHOOK_URL = os.environ.get("ECOMORPHIS_WEBHOOK_URL", "http://127.0.0.1:8765/events")
+# Who gets the SMS for an overflowing bin, e.g. the ULB ward crew's number
+CREW_SMS = os.environ.get("ECOMORPHIS_CREW_SMS", "ULB-CREW")
+
+BATCH_SIZE = 100
+POLL_SECONDS = 2.0  # also picks up events written by other processes
+LEASE_SECONDS = 60
+RETRY_SECONDS = 5
+MAX_RETRY_SECONDS = 600
+MAX_ATTEMPTS = 8
+KEEP_DELIVERED_DAYS = 7
+WEBHOOK_TIMEOUT = 5
+
+ComplaintSubmitted = namedtuple("ComplaintSubmitted", "complaint_id user location waste_type")
+ComplaintVerified = namedtuple("ComplaintVerified", "complaint_id user location verified_by")
+ComplaintResolved = namedtuple("ComplaintResolved", "complaint_id user location resolved_by")
+BinOverflowing = namedtuple("BinOverflowing", "bin_id location zone reported_by")
+PointsAwarded = namedtuple("PointsAwarded", "username delta reason")
+
+EVENT_TYPES = {cls.__name__: cls for cls in (
+    ComplaintSubmitted, ComplaintVerified, ComplaintResolved, BinOverflowing, PointsAwarded,
+)}
+
+_lock = threading.Lock()
+_wakeup = threading.Event()
+_worker = None
+
+
+def publish(*events):
+    """Queues events in the outbox, joining the caller's transaction if there is one."""
+    with store.transaction():
+        for event in events:
+            store.add_outbox_event(type(event).__name__, json.dumps(event._asdict(), separators=(",", ":")))
+        if events:
+            store.after_commit(_wake)
+
+
+def _on_ledger_entry(username, delta, reason, key):
+    if delta > 0:
+        publish(PointsAwarded(username, delta, reason))
+
+
+store.on_ledger_entry(_on_ledger_entry)
+
+
+# --- Sinks ---
+# A sink is fn(events) taking a list of {"id", "type", "payload", "created_at"}
+# dicts; raising makes the whole batch be retried.
+def file_sink(events):
+    """Appends every event as a JSON line to outbox/events.jsonl."""
+    os.makedirs(OUTBOX_DIR, exist_ok=True)
+    with open(os.path.join(OUTBOX_DIR, "events.jsonl"), "a", encoding="utf-8") as f:
+        for event in events:
+            f.write(json.dumps(event, separators=(",", ":")) + "\n")
+
+
+def webhook_sink(events):
+    """POSTs the batch as {"events": [...]} to ECOMORPHIS_WEBHOOK_URL (see `python events.py webhook-stub`)."""
+    body = json.dumps({"events": events}).encode("utf-8")
+    request = urllib.request.Request(WEBHOOK_URL, data=body, headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(request, timeout=WEBHOOK_TIMEOUT) as response:
+        response.read()
+
+
+def sms_text(event):
+    """(recipient, message) for events someone should be texted about, else None."""
+    p = event["payload"]
+    if event["type"] == "BinOverflowing":
+        where = p["location"] + (f" ({p['zone']})" if p["zone"] else "")
+        return CREW_SMS, f"Ecomorphis: bin {p['bin_id']} at {where} is overflowing. Reported by {p['reported_by']}."
+    if event["type"] == "ComplaintVerified":
+        return p["user"], f"Ecomorphis: your report #{p['complaint_id']} at {p['location']} was verified and sent for cleanup."
+    if event["type"] == "ComplaintResolved":
+        return p["user"], f"Ecomorphis: your report #{p['complaint_id']} at {p['location']} has been resolved. Thank you!"
+    if event["type"] == "PointsAwarded":
+        return p["username"], f"Ecomorphis: +{p['delta']} Eco-Points ({p['reason']})."
+    return None
+
+
+def sms_sink(events):
+    """SMS gateway stand-in: writes one tab-separated "recipient, message" line per text to outbox/sms.log."""
+    texts = [t for t in map(sms_text, events) if t]
+    if not texts:
+        return
+    os.makedirs(OUTBOX_DIR, exist_ok=True)
+    with open(os.path.join(OUTBOX_DIR, "sms.log"), "a", encoding="utf-8") as f:
+        for recipient, message in texts:
+            f.write(f"{store.now()}\t{recipient}\t{message}\n")
+
+
+SINKS = {"file": file_sink, "webhook": webhook_sink, "sms": sms_sink}
+
+
+def register_sink(name, sink):
+    """Adds (or replaces) a sink; it receives events once its name is in ECOMORPHIS_EVENT_SINKS."""
+    SINKS[name] = sink
+
+
+# --- Worker ---
+def drain_once():
+    """Delivers one batch of due events to every active sink; returns how many were handled."""
+    rows = store.claim_outbox(BATCH_SIZE, LEASE_SECONDS)
+    if not rows:
+        return 0
+    batch = [
+        {"id": row["id"], "type": row["type"], "payload": json.loads(row["payload"]), "created_at": row["created_at"]}
+        for row in rows
+    ]
+    ids = [row["id"] for row in rows]
+    try:
+        with metrics.timed("outbox.deliver", events=len(batch)):
+            for name in SINK_NAMES:
+                SINKS[name](batch)
+    except Exception as e:
+        attempts = max(row["attempts"] for row in rows) + 1
+        delay = min(RETRY_SECONDS * 2 ** (attempts - 1), MAX_RETRY_SECONDS)
+        store.retry_outbox(ids, f"{name}: {e!r}"[:500], delay, MAX_ATTEMPTS)
+        metrics.record("span", "outbox.failed", sink=name, events=len(batch), error=repr(e)[:200])
+    else:
+        store.mark_outbox_delivered(ids)
+    return len(batch)
+
+
+def _run():
+    last_prune = 0.0
+    while True:
+        _wakeup.wait(POLL_SECONDS)
+        _wakeup.clear()
+        try:
+            while drain_once() == BATCH_SIZE:
+                pass
+            if time.monotonic() - last_prune > 3600:
+                store.prune_outbox(store.now(-KEEP_DELIVERED_DAYS * 86400))
+                last_prune = time.monotonic()
+        except Exception as e:
+            # Keep the worker alive through e.g. a locked database; the next poll tries again
+            metrics.record("span", "outbox.worker_error", error=repr(e)[:200])
+
+
+def check_sinks():
+    """Raises ValueError if ECOMORPHIS_EVENT_SINKS names a sink that isn't registered.
+
+    Checked up front: an unknown name would otherwise fail every batch until
+    the whole outbox was marked dead.
+    """
+    unknown = [name for name in SINK_NAMES if name not in SINKS]
+    if unknown:
+        raise ValueError(f"Unknown event sink(s) in ECOMORPHIS_EVENT_SINKS: {', '.join(unknown)} "
+                         f"(available: {', '.join(sorted(SINKS))})")
+
+
+def start():
+    """Starts this process's delivery worker (once); events already in the outbox are picked up straight away.
+
+    Raises ValueError for an unknown sink name (see check_sinks), without starting the worker.
+    """
+    global _worker
+    if _worker is None:
+        with _lock:
+            if _worker is None:
+                check_sinks()
+                _worker = threading.Thread(target=_run, name="outbox-worker", daemon=True)
+                _worker.start()
+                _wakeup.set()
+
+
+def _wake():
+    start()
+    _wakeup.set()
+
+
+# --- Local webhook stub ---
+class _StubHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        for event in json.loads(body or b"{}").get("events", []):
+            print(f"#{event['id']} {event['type']} {json.dumps(event['payload'])}", flush=True)
+        self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Outbox tools.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    stub = commands.add_parser("webhook-stub", help="Run a local webhook receiver that prints delivered events")
+    stub.add_argument("--port", type=int, default=8765)
+    commands.add_parser("drain", help="Deliver everything currently due, then exit")
+    args = parser.parse_args(argv)
+
+    if args.command == "webhook-stub":
+        print(f"Listening on http://127.0.0.1:{args.port}/events", flush=True)
+        HTTPServer(("127.0.0.1", args.port), _StubHandler).serve_forever()
+    else:
+        try:
+            check_sinks()
+        except ValueError as e:
+            print(e)
+            return 2
+        delivered = 0
+        while True:
+            n = drain_once()
+            delivered += n
+            if n < BATCH_SIZE:
+                break
+        print(f"Handled {delivered} events; outbox now {store.outbox_status_counts()}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
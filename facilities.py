@@ -0,0 +1,122 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+import store
+
+# -------------------------
+# Facility Inventory & Spatial Index
+# -------------------------
+# Facilities are loaded from CSV / Parquet (ECOMORPHIS_FACILITIES, by default
+# the file `python bulk.py import facilities` writes) and bucketed into a
+# lat/lon grid so "nearest N" only measures the points in a few cells around
+# the user instead of the whole city.
+
+FACILITIES_PATH = os.environ.get("ECOMORPHIS_FACILITIES", os.path.join(store.DATA_DIR, "facilities.parquet"))
+COLUMNS = ["Name", "Type", "Waste_Type", "Latitude", "Longitude"]
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = np.pi * EARTH_RADIUS_KM / 180
+
+DEFAULT_FACILITIES = pd.DataFrame([
+    {"Name": "City Compost Plant", "Type": "Compost", "Waste_Type": "Wet", "Latitude": 28.6139, "Longitude": 77.2090},
+    {"Name": "Green Recycling Center", "Type": "Recycling", "Waste_Type": "Dry", "Latitude": 28.6200, "Longitude": 77.2100},
+    {"Name": "Waste-to-Energy Plant", "Type": "W-to-E", "Waste_Type": "Mixed", "Latitude": 28.6250, "Longitude": 77.2150},
+    {"Name": "Hazardous Waste Collection", "Type": "Scrap Shop", "Waste_Type": "Hazardous", "Latitude": 28.6300, "Longitude": 77.2200},
+])
+
+
+def load_facilities(path=FACILITIES_PATH):
+    """Reads the facility inventory; falls back to the built-in demo rows until a file exists."""
+    if not path or not os.path.exists(path):
+        return DEFAULT_FACILITIES.copy()
+    if path.endswith(".parquet"):
+        df = pd.read_parquet(path, columns=COLUMNS)
+    else:
+        df = pd.read_csv(path, usecols=COLUMNS, dtype={"Name": str, "Type": str, "Waste_Type": str})
+    df = df.dropna(subset=["Latitude", "Longitude"])
+    df = df[df["Latitude"].between(-90, 90) & df["Longitude"].between(-180, 180)]
+    # Categoricals keep the type filters cheap on large inventories
+    df["Type"] = df["Type"].astype("category")
+    df["Waste_Type"] = df["Waste_Type"].astype("category")
+    return df.reset_index(drop=True)
+
+
+def haversine_km(lat, lon, lats, lons):
+    """Great-circle distance from one point to arrays of points (degrees in, km out)."""
+    lat, lon = np.radians(lat), np.radians(lon)
+    lats, lons = np.radians(lats), np.radians(lons)
+    a = np.sin((lats - lat) / 2) ** 2 + np.cos(lat) * np.cos(lats) * np.sin((lons - lon) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+class FacilityIndex:
+    """Uniform grid over lat/lon; each cell's facilities are one contiguous run of a sorted array."""
+
+    def __init__(self, df, cell_deg=0.05):
+        self.df = df.reset_index(drop=True)
+        self.cell_deg = cell_deg
+        self.lats = self.df["Latitude"].to_numpy(dtype=np.float64)
+        self.lons = self.df["Longitude"].to_numpy(dtype=np.float64)
+        self.n_cols = int(np.ceil(360 / cell_deg)) + 2
+        keys = self._cell(self.lats, self.lons)
+        self.order = np.argsort(keys, kind="stable")
+        self.sorted_keys = keys[self.order]
+
+    def _rows_cols(self, lats, lons):
+        rows = np.floor((np.asarray(lats) + 90) / self.cell_deg).astype(np.int64)
+        cols = np.floor((np.asarray(lons) + 180) / self.cell_deg).astype(np.int64)
+        return rows, cols
+
+    def _cell(self, lats, lons):
+        rows, cols = self._rows_cols(lats, lons)
+        return rows * self.n_cols + cols
+
+    def _candidates(self, row, col, ring):
+        """Indices of all facilities in the (2 * ring + 1)^2 block of cells around (row, col)."""
+        rows = np.arange(row - ring, row + ring + 1, dtype=np.int64)
+        lo_col, hi_col = max(col - ring, 0), min(col + ring, self.n_cols - 1)
+        starts = np.searchsorted(self.sorted_keys, rows * self.n_cols + lo_col, side="left")
+        ends = np.searchsorted(self.sorted_keys, rows * self.n_cols + hi_col, side="right")
+        if not (ends > starts).any():
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([self.order[s:e] for s, e in zip(starts, ends) if e > s])
+
+    def nearest(self, lat, lon, n=5, waste_type=None, facility_type=None):
+        """The n closest facilities (optionally only those taking waste_type / of facility_type), with Distance_km."""
+        allowed = np.ones(len(self.df), dtype=bool)
+        if waste_type:
+            allowed &= (self.df["Waste_Type"] == waste_type).to_numpy()
+        if facility_type:
+            allowed &= (self.df["Type"] == facility_type).to_numpy()
+        return self._result(*self.nearest_positions(lat, lon, n, allowed))
+
+    def nearest_positions(self, lat, lon, n=5, allowed=None):
+        """(row positions, distances in km) of the n closest points, closest first, without building a frame."""
+        if allowed is None:
+            allowed = np.ones(len(self.df), dtype=bool)
+        if n <= 0 or not allowed.any():
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        row, col = (int(v) for v in self._rows_cols(lat, lon))
+        max_ring = int(np.ceil(180 / self.cell_deg))
+        ring = 1
+        while True:
+            idx = self._candidates(row, col, ring)
+            idx = idx[allowed[idx]]
+            dist = haversine_km(lat, lon, self.lats[idx], self.lons[idx])
+            # Everything within this radius is guaranteed to be inside the searched block
+            edge_lat = min(abs(lat) + (ring + 1) * self.cell_deg, 90)
+            covered_km = ring * self.cell_deg * KM_PER_DEGREE * np.cos(np.radians(edge_lat))
+            if len(idx) >= n and np.partition(dist, n - 1)[n - 1] <= covered_km:
+                break
+            if ring >= max_ring or len(idx) == allowed.sum():
+                break
+            ring *= 2
+        take = np.argsort(dist, kind="stable")[:n]
+        return idx[take], dist[take]
+
+    def _result(self, idx, dist):
+        out = self.df.iloc[idx].copy()
+        out["Distance_km"] = np.round(dist, 2)
+        return out.reset_index(drop=True)
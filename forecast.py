@@ -0,0 +1,180 @@
+import sys
+import time
+import argparse
+import datetime
+import threading
+
+import numpy as np
+import pandas as pd
+
+import store
+import metrics
+
+# -------------------------
+# Bin Overflow Forecasting
+# -------------------------
+# A batch job over the whole fleet's status history, read from the compact
+# per-bin bin_series blobs (one row per bin, not per event). A bin's fill cycle
+# runs from a 'Clean' event to the next 'Overflowing' one. Bins fill faster
+# at busy times (market days, evenings), so cycle lengths are measured in
+# "busy hours": wall-clock hours weighted by the fleet's weekday x hour
+# overflow profile. Each bin's typical cycle is the median of its own cycles,
+# shrunk toward the fleet median when it has only a few. The next overflow
+# is the wall-clock time at which that many busy hours will have passed since
+# the bin was last emptied. All of this is a handful of pandas / NumPy
+# operations over the full event table, however many bins there are.
+
+LOOKBACK_DAYS = 90
+HORIZON_DAYS = 30  # forecasts further out than this are stored as unknown
+DUE_HOURS = 12
+MAX_AGE_SECONDS = 3600  # the background thread recomputes an older batch
+CHECK_SECONDS = 300  # how often it looks
+PRIOR_CYCLES = 2  # weight of the fleet median in each bin's estimate
+_HOUR_NS = 3600 * 10**9
+_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_lock = threading.Lock()
+_worker = None
+
+
+def weekly_profile(times_ns):
+    """Relative overflow rate for each of the 168 hours of the week (Monday 00h first), averaging 1."""
+    hours = pd.DatetimeIndex(times_ns)
+    counts = np.bincount(hours.dayofweek * 24 + hours.hour, minlength=168).astype(np.float64)
+    # Add-one smoothing keeps quiet hours from counting as zero time
+    counts += 1
+    return counts / counts.mean()
+
+
+def _busy_clock(origin_ns, hours, profile):
+    """Cumulative busy hours at each whole hour from origin, for converting both ways with np.interp."""
+    grid = origin_ns + np.arange(hours + 1, dtype=np.int64) * _HOUR_NS
+    index = pd.DatetimeIndex(grid[:-1])
+    weights = profile[index.dayofweek * 24 + index.hour]
+    return grid, np.concatenate(([0.0], np.cumsum(weights)))
+
+
+def unpack(series, since_ns=None):
+    """(bin_ids, codes, overflow, t) arrays from bin_series rows; t is local time in ns, one entry per event."""
+    bin_ids = np.array([row[0] for row in series], dtype=object)
+    blobs = [row[1] for row in series]
+    lengths = np.fromiter((len(b) // 8 for b in blobs), dtype=np.int64, count=len(blobs))
+    packed = np.frombuffer(b"".join(blobs), dtype="<i8")
+    codes = np.repeat(np.arange(len(blobs)), lengths)
+    overflow = (packed & 1).astype(bool)
+    t = (packed >> 1) * 10**9
+    if since_ns is not None:
+        keep = t >= since_ns
+        codes, overflow, t = codes[keep], overflow[keep], t[keep]
+    return bin_ids, codes, overflow, t
+
+
+def forecast(series, now=None, lookback_days=LOOKBACK_DAYS):
+    """Per-bin forecasts from store.bin_series() rows.
+
+    Returns a frame indexed by bin_id with next_overflow (NaT when unknown or
+    already overflowing), cycles (complete fill cycles seen) and cycle_hours
+    (the busy-hour cycle length used).
+    """
+    now = pd.Timestamp(now or datetime.datetime.now())
+    bin_ids, codes, overflow, t = unpack(series, (now - pd.Timedelta(days=lookback_days)).value)
+    n_bins = len(bin_ids)
+    if not len(t):
+        return pd.DataFrame(
+            {"next_overflow": pd.NaT, "cycles": 0, "cycle_hours": np.nan},
+            index=pd.Index(bin_ids, name="bin_id"),
+        ).astype({"next_overflow": "datetime64[ns]"})
+
+    origin = (t.min() // _HOUR_NS) * _HOUR_NS
+    hours = int((now.value - origin) // _HOUR_NS) + HORIZON_DAYS * 24 + 1
+    grid, clock = _busy_clock(origin, hours, weekly_profile(t[overflow]))
+    busy = np.interp(t, grid, clock)
+
+    # Cycles: an overflow right after a cleaning of the same bin
+    same_bin = np.r_[False, codes[1:] == codes[:-1]]
+    cycle = same_bin & overflow & np.r_[False, ~overflow[:-1]]
+    lengths = busy[cycle] - np.r_[0.0, busy[:-1]][cycle]
+    per_bin = pd.Series(lengths).groupby(codes[cycle]).agg(["median", "size"])
+    medians = np.zeros(n_bins)
+    counts = np.zeros(n_bins, dtype=np.int64)
+    medians[per_bin.index] = per_bin["median"].to_numpy()
+    counts[per_bin.index] = per_bin["size"].to_numpy()
+    fleet = np.median(lengths) if len(lengths) else np.nan
+    estimate = (medians * counts + fleet * PRIOR_CYCLES) / (counts + PRIOR_CYCLES)
+
+    # Each bin's latest event: a cleaning starts the cycle being forecast
+    last = np.r_[codes[1:] != codes[:-1], True]
+    last_codes = codes[last]
+    start = np.full(n_bins, np.nan)
+    emptied = ~overflow[last]
+    start[last_codes[emptied]] = busy[last][emptied]
+    target = start + estimate
+    when = np.interp(target, clock, grid.astype(np.float64))
+    known = np.isfinite(target) & (target <= clock[-1])
+    next_overflow = pd.to_datetime(np.where(known, when, 0).astype(np.int64)).where(known)
+    return pd.DataFrame(
+        {"next_overflow": next_overflow, "cycles": counts, "cycle_hours": estimate},
+        index=pd.Index(bin_ids, name="bin_id"),
+    )
+
+
+def run(now=None):
+    """Forecasts every bin from the last LOOKBACK_DAYS of history and stores the batch; returns the frame."""
+    now = pd.Timestamp(now or datetime.datetime.now())
+    with metrics.timed("forecast.run"):
+        result = forecast(store.bin_series(), now)
+        stamps = result["next_overflow"].dt.strftime(_FORMAT)
+        store.replace_bin_forecasts(
+            zip(result.index.tolist(), stamps.where(stamps.notna(), None).tolist(), result["cycles"].tolist()),
+            now.strftime(_FORMAT),
+        )
+    return result
+
+
+def refresh(max_age=MAX_AGE_SECONDS):
+    """Runs the batch unless a run (in any process) started within max_age seconds; True if it ran."""
+    if not store.claim_job("forecast", max_age):
+        return False
+    run()
+    return True
+
+
+def _run():
+    while True:
+        try:
+            refresh()
+        except Exception as e:
+            # e.g. a locked database; the claim has been taken, so the next try is after MAX_AGE_SECONDS
+            metrics.record("span", "forecast.worker_error", error=repr(e)[:200])
+        time.sleep(CHECK_SECONDS)
+
+
+def start():
+    """Starts this process's refresh thread (once), so the batch never runs inside a page render."""
+    global _worker
+    if _worker is None:
+        with _lock:
+            if _worker is None:
+                _worker = threading.Thread(target=_run, name="forecast-worker", daemon=True)
+                _worker.start()
+
+
+def due(hours=DUE_HOURS, zone=None, limit=50):
+    """Clean bins expected to overflow within the next `hours` (or already overdue), soonest first."""
+    return store.bins_due(store.now(hours * 3600), zone=zone, limit=limit)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Forecast when each bin will next overflow.")
+    parser.add_argument("--hours", type=int, default=DUE_HOURS, help="List bins due within this many hours")
+    args = parser.parse_args(argv)
+    start = time.perf_counter()
+    result = run()
+    print(f"Forecast {len(result)} bins in {time.perf_counter() - start:.2f} s; "
+          f"{int(result['next_overflow'].notna().sum())} with a predicted overflow")
+    for b in due(args.hours):
+        print(f"{b['next_overflow']}  {b['bin_id']}  {b['location']}" + (f" ({b['zone']})" if b["zone"] else ""))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
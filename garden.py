@@ -0,0 +1,110 @@
+import io
+import math
+import hashlib
+import functools
+
+import numpy as np
+from PIL import Image, ImageDraw, features
+
+import assets
+
+# -------------------------
+# Eco Garden Renderer
+# -------------------------
+# Composites a user's whole forest into one image on the server, so the page
+# sends a single small picture instead of one <img> per tree. Placement is
+# seeded from the username (existing trees never move as new ones grow), big
+# forests are drawn as groves that each stand for several trees, and finished
+# images are memoized per (username, points).
+
+CANVAS_SIZE = (1200, 480)
+GROUND = 20  # px between the canvas bottom and the base of every plant
+TREE_HEIGHTS = (90, 130)
+GROWING_HEIGHT = 450
+DETAIL_LIMIT = 60  # most sprites drawn; beyond that, one sprite per grove
+CACHE_SIZE = 512
+
+# (points into the current tree, sprite) for the plant that is still growing
+STAGES = [((0, 1), "plant-seed"), ((2, 4), "plant-sprout"), ((5, 7), "plant-sapling"), ((8, 9), "plant-small-tree")]
+
+if features.check("webp"):
+    FORMAT, SAVE_ARGS = "WEBP", {"quality": 80, "method": 2}
+else:
+    FORMAT, SAVE_ARGS = "PNG", {"optimize": True}
+
+
+def _drawn_sprite(name):
+    """Simple vector stand-in used when the artwork can't be loaded (offline, before build_assets.py)."""
+    img = Image.new("RGBA", (300, 400), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    canopy = {"plant-seed": 0, "plant-sprout": 50, "plant-sapling": 90, "plant-small-tree": 120}.get(name, 150)
+    if canopy == 0:
+        draw.ellipse((90, 340, 210, 400), fill=(101, 67, 33, 255))
+        draw.ellipse((135, 320, 165, 350), fill=(205, 170, 110, 255))
+        return img
+    trunk = max(8, canopy // 6)
+    crown_y = 400 - int(1.4 * canopy)
+    draw.rectangle((150 - trunk, crown_y, 150 + trunk, 400), fill=(110, 72, 38, 255))
+    draw.ellipse((150 - canopy, crown_y - canopy, 150 + canopy, crown_y + canopy), fill=(56, 142, 60, 255))
+    return img.crop(img.getbbox())
+
+
+@functools.lru_cache(maxsize=None)
+def _sprite(name):
+    try:
+        img = Image.open(io.BytesIO(assets.read_bytes(name, width=480)))
+        img.load()
+        return img.convert("RGBA")
+    except (OSError, ValueError):
+        return _drawn_sprite(name)
+
+
+@functools.lru_cache(maxsize=256)
+def _scaled(name, height):
+    sprite = _sprite(name)
+    width = max(1, round(sprite.width * height / sprite.height))
+    return sprite.resize((width, height), Image.LANCZOS)
+
+
+def _rng(username, salt):
+    digest = hashlib.sha256(f"{salt}:{username}".encode("utf-8")).digest()
+    return np.random.default_rng(int.from_bytes(digest[:8], "little"))
+
+
+def _paste(canvas, sprite, center_x):
+    x = int(round(center_x)) - sprite.width // 2
+    y = canvas.height - GROUND - sprite.height
+    canvas.alpha_composite(sprite, (max(0, min(x, canvas.width - sprite.width)), max(0, y)))
+
+
+def trees_per_sprite(points):
+    """How many grown trees each drawn tree stands for at this score."""
+    return max(1, math.ceil((points // 10) / DETAIL_LIMIT))
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def render(username, points):
+    """Encoded image of the user's garden at this score."""
+    width, height = CANVAS_SIZE
+    canvas = Image.new("RGBA", CANVAS_SIZE, (0, 0, 0, 0))
+
+    grown = points // 10
+    group = trees_per_sprite(points)
+    sprites = math.ceil(grown / group)
+    # One (position, size) pair per tree drawn in row order, so tree k lands in the
+    # same spot whatever the total. Groves are drawn a little larger.
+    layout = _rng(username, "trees").random((sprites, 2))
+    scale = 1 + 0.15 * math.log10(group)
+    lo, hi = TREE_HEIGHTS
+    for left, size in layout:
+        tree_height = int((lo + size * (hi - lo)) * scale)
+        _paste(canvas, _scaled("plant-full-tree", tree_height), (0.05 + 0.9 * left) * width)
+
+    growing = points % 10
+    stage = next(name for (first, last), name in STAGES if first <= growing <= last)
+    left = _rng(username, "growing").random()
+    _paste(canvas, _scaled(stage, min(GROWING_HEIGHT, height - GROUND)), (0.1 + 0.8 * left) * width)
+
+    buf = io.BytesIO()
+    canvas.save(buf, format=FORMAT, **SAVE_ARGS)
+    return buf.getvalue()
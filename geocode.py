@@ -0,0 +1,217 @@
+import os
+import re
+import bisect
+
+import numpy as np
+import pandas as pd
+
+import facilities
+
+# -------------------------
+# Offline Geocoding, Autocomplete & Hotspots
+# -------------------------
+# Place names come from a local gazetteer CSV of wards and landmarks
+# (ECOMORPHIS_GAZETTEER; the bundled one covers Bhopal with approximate
+# coordinates), so nothing here needs a network. Every name, alias and
+# word-start suffix ("market" for "Bittan Market") is a key in one sorted
+# array. That array is a flattened prefix trie: the keys under a trie node are
+# one contiguous run, found with two binary searches, and ranked with a
+# vectorized partial sort. Report coordinates are bucketed into geohash cells;
+# the dashboard aggregates the cells into hotspots.
+
+GAZETTEER_PATH = os.environ.get(
+    "ECOMORPHIS_GAZETTEER",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "reference", "gazetteer.csv"),
+)
+COLUMNS = ["name", "kind", "ward", "latitude", "longitude", "aliases"]
+# Wards outrank landmarks of the same name length
+KIND_RANK = {"ward": 0, "landmark": 1}
+GRID_DEGREES = 0.01  # ~1 km cells for nearest-place lookups
+# ~150 m cells; coarser hotspot views group cells by a shorter prefix
+GEOHASH_PRECISION = 7
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def normalize(text):
+    """Lowercase alphanumerics separated by single spaces: "MP-Nagar, Zone 1" -> "mp nagar zone 1"."""
+    return " ".join(re.findall(r"[a-z0-9]+", str(text).lower()))
+
+
+def load_gazetteer(path=GAZETTEER_PATH):
+    df = pd.read_csv(path, dtype={"name": str, "kind": str, "ward": str, "aliases": str}, keep_default_na=False)
+    df = df[COLUMNS]
+    df["latitude"] = pd.to_numeric(df["latitude"], errors="coerce")
+    df["longitude"] = pd.to_numeric(df["longitude"], errors="coerce")
+    df = df.dropna(subset=["latitude", "longitude"])
+    df = df[df["latitude"].between(-90, 90) & df["longitude"].between(-180, 180) & (df["name"].str.strip() != "")]
+    return df.reset_index(drop=True)
+
+
+class Gazetteer:
+    """Autocomplete, name resolution and nearest-place lookups over one gazetteer."""
+
+    def __init__(self, df):
+        self.df = df.reset_index(drop=True)
+        self.lats = self.df["latitude"].to_numpy(dtype=np.float64)
+        self.lons = self.df["longitude"].to_numpy(dtype=np.float64)
+        self._entries = [
+            {"name": name, "kind": kind, "ward": ward, "latitude": float(lat), "longitude": float(lon)}
+            for name, kind, ward, lat, lon in zip(
+                self.df["name"], self.df["kind"], self.df["ward"], self.lats, self.lons)
+        ]
+        # Same grid index the facility finder uses; its row positions are gazetteer rows
+        self._grid = facilities.FacilityIndex(
+            pd.DataFrame({"Latitude": self.lats, "Longitude": self.lons}),
+            cell_deg=GRID_DEGREES,
+        )
+        names, aliases_exact, keys = {}, {}, []
+        for row, name, kind, aliases in zip(self.df.index, self.df["name"], self.df["kind"], self.df["aliases"]):
+            base = KIND_RANK.get(kind, len(KIND_RANK)) * 1000 + min(len(name), 999)
+            for label in [name] + [a for a in aliases.split("|") if a.strip()]:
+                words = normalize(label).split()
+                if not words:
+                    continue
+                (names if label is name else aliases_exact).setdefault(" ".join(words), row)
+                # Matches at the start of the name rank above matches on a later word
+                for start in range(len(words)):
+                    keys.append((" ".join(words[start:]), (1 if start else 0) * 10000 + base, row))
+        # A place's own name wins over another place's alias
+        self._exact = {**aliases_exact, **names}
+        keys.sort()
+        self._keys = [k for k, _, _ in keys]
+        self._ranks = np.array([r for _, r, _ in keys], dtype=np.int64)
+        self._rows = np.array([r for _, _, r in keys], dtype=np.int64)
+
+    def __len__(self):
+        return len(self.df)
+
+    def _entry(self, row):
+        return dict(self._entries[row])
+
+    def suggest(self, text, limit=8):
+        """Up to limit places whose name (or a word in it) starts with text, best first."""
+        prefix = normalize(text)
+        if not prefix:
+            return []
+        lo = bisect.bisect_left(self._keys, prefix)
+        hi = bisect.bisect_left(self._keys, prefix + "\uffff")
+        if lo == hi:
+            return []
+        ranks, rows = self._ranks[lo:hi], self._rows[lo:hi]
+        # The same place can match under several keys, so take a few extra before de-duplicating
+        take = min(len(ranks), limit * 3)
+        best = np.argpartition(ranks, take - 1)[:take] if take < len(ranks) else np.arange(len(ranks))
+        best = best[np.lexsort((rows[best], ranks[best]))]
+        seen = []
+        for row in rows[best]:
+            if row not in seen:
+                seen.append(row)
+                if len(seen) == limit:
+                    break
+        return [self._entry(row) for row in seen]
+
+    def resolve(self, text):
+        """The place a free-text location refers to, or None.
+
+        Tries the whole text, then each comma-separated part ("Kolar Road, Near SBI"),
+        as an exact name or alias. Partial names are not guessed at: a prefix
+        match is only a suggestion, and becomes the place once the user picks it.
+        """
+        for part in [text] + str(text).split(","):
+            row = self._exact.get(normalize(part))
+            if row is not None:
+                return self._entry(row)
+        return None
+
+    def nearest(self, lat, lon):
+        """The closest gazetteer place to a point, with its distance in km."""
+        if not len(self.df):
+            return None
+        rows, dist = self._grid.nearest_positions(lat, lon, n=1)
+        return dict(self._entry(int(rows[0])), distance_km=round(float(dist[0]), 2))
+
+
+def place(entry):
+    """The {latitude, longitude, ward, geohash} a complaint stores for a resolved gazetteer entry."""
+    if entry is None:
+        return None
+    return {
+        "latitude": entry["latitude"], "longitude": entry["longitude"], "ward": entry["ward"] or None,
+        "geohash": geohash(entry["latitude"], entry["longitude"]),
+    }
+
+
+def geohash(lat, lon, precision=GEOHASH_PRECISION):
+    """Standard base-32 geohash of a point."""
+    lat_lo, lat_hi, lon_lo, lon_hi = -90.0, 90.0, -180.0, 180.0
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        if even:
+            mid = (lon_lo + lon_hi) / 2
+            value = value * 2 + (lon >= mid)
+            lon_lo, lon_hi = (mid, lon_hi) if lon >= mid else (lon_lo, mid)
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            value = value * 2 + (lat >= mid)
+            lat_lo, lat_hi = (mid, lat_hi) if lat >= mid else (lat_lo, mid)
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_BASE32[value])
+            bits, value = 0, 0
+    return "".join(chars)
+
+
+def geohash_many(lats, lons, precision=GEOHASH_PRECISION):
+    """Vectorized geohash() for arrays of points, as an object array of strings."""
+    bits = 5 * precision
+    lon_bits, lat_bits = (bits + 1) // 2, bits // 2
+    lats, lons = np.asarray(lats, dtype=np.float64), np.asarray(lons, dtype=np.float64)
+    # Integer cell coordinates; interleaving their bits (longitude first) gives the geohash bits
+    y = np.clip(np.floor((lats + 90) / 180 * (1 << lat_bits)), 0, (1 << lat_bits) - 1).astype(np.int64)
+    x = np.clip(np.floor((lons + 180) / 360 * (1 << lon_bits)), 0, (1 << lon_bits) - 1).astype(np.int64)
+    code = np.zeros(len(lats), dtype=np.int64)
+    for i in range(bits):
+        source, shift = (x, lon_bits - 1 - i // 2) if i % 2 == 0 else (y, lat_bits - 1 - i // 2)
+        code = (code << 1) | ((source >> shift) & 1)
+    chars = np.frombuffer(_BASE32.encode(), dtype="S1")
+    out = chars[(code >> (5 * (precision - 1))) & 31]
+    for k in range(1, precision):
+        out = np.char.add(out, chars[(code >> (5 * (precision - 1 - k))) & 31])
+    return np.char.decode(out, "ascii").astype(object)
+
+
+def geohash_center(cell):
+    """(lat, lon) at the centre of a geohash cell."""
+    lat_lo, lat_hi, lon_lo, lon_hi = -90.0, 90.0, -180.0, 180.0
+    even = True
+    for char in cell:
+        value = _BASE32.index(char)
+        for shift in range(4, -1, -1):
+            bit = (value >> shift) & 1
+            if even:
+                mid = (lon_lo + lon_hi) / 2
+                lon_lo, lon_hi = (mid, lon_hi) if bit else (lon_lo, mid)
+            else:
+                mid = (lat_lo + lat_hi) / 2
+                lat_lo, lat_hi = (mid, lat_hi) if bit else (lat_lo, mid)
+            even = not even
+    return (lat_lo + lat_hi) / 2, (lon_lo + lon_hi) / 2
+
+
+def hotspots(cell_counts, precision=6, limit=None):
+    """Groups (geohash, count) pairs into cells of the given precision, busiest first.
+
+    Returns a frame of cell, reports, latitude and longitude (the cell centre).
+    """
+    df = pd.DataFrame(cell_counts, columns=["cell", "reports"])
+    if df.empty:
+        return pd.DataFrame(columns=["cell", "reports", "latitude", "longitude"])
+    df = df.groupby(df["cell"].str[:precision], sort=False)["reports"].sum().reset_index()
+    df = df.sort_values(["reports", "cell"], ascending=[False, True], kind="stable")
+    if limit is not None:
+        df = df.head(limit)
+    centers = [geohash_center(c) for c in df["cell"]]
+    df["latitude"] = [c[0] for c in centers]
+    df["longitude"] = [c[1] for c in centers]
+    return df.reset_index(drop=True)
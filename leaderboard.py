@@ -0,0 +1,96 @@
+import os
+import time
+import threading
+
+from sortedcontainers import SortedList
+
+import store
+
+# -------------------------
+# Incremental Leaderboard
+# -------------------------
+# One sorted list per role of (-points, username), loaded from the store and
+# then patched on every points change this process commits, so top-N pages
+# and "what is my rank" are O(log n) instead of a full sort per render.
+# Changes committed by other processes aren't seen by the hooks, so the boards
+# are reloaded from the store every RELOAD_SECONDS; with several app processes
+# a page can lag the ledger by up to that long.
+# Ties are broken by username, matching the old alphabetical-within-score order.
+
+RELOAD_SECONDS = int(os.environ.get("ECOMORPHIS_LEADERBOARD_RELOAD", "60"))
+
+_lock = threading.Lock()
+_reload_lock = threading.Lock()
+_boards = None  # role -> SortedList of (-points, username)
+_entries = None  # username -> (role, points)
+_loaded_at = 0.0
+
+
+def _load():
+    """Rebuilds the boards from the store outside _lock, so readers keep the old ones meanwhile."""
+    global _boards, _entries, _loaded_at
+    started = time.monotonic()
+    boards, entries = {}, {}
+    for username, role, points in store.iter_user_points():
+        entries[username] = (role, points)
+    for username, (role, points) in entries.items():
+        boards.setdefault(role, []).append((-points, username))
+    boards = {role: SortedList(items) for role, items in boards.items()}
+    with _lock:
+        _boards, _entries, _loaded_at = boards, entries, started
+
+
+def _ensure_loaded():
+    if _boards is None or time.monotonic() - _loaded_at > RELOAD_SECONDS:
+        # One thread reloads; a stale board is served to the others until it is done,
+        # and only the very first load makes them wait
+        if _reload_lock.acquire(blocking=_boards is None):
+            try:
+                if _boards is None or time.monotonic() - _loaded_at > RELOAD_SECONDS:
+                    _load()
+            finally:
+                _reload_lock.release()
+
+
+def _on_points_change(username, role, points):
+    with _lock:
+        if _boards is None:
+            return  # not loaded yet; the first read picks the new value up from the store
+        old = _entries.get(username)
+        if old is not None:
+            _boards[old[0]].discard((-old[1], username))
+        _boards.setdefault(role, SortedList()).add((-points, username))
+        _entries[username] = (role, points)
+
+
+store.on_points_change(_on_points_change)
+
+
+def size(role):
+    _ensure_loaded()
+    with _lock:
+        return len(_boards.get(role, ()))
+
+
+def top(role, limit=10, offset=0):
+    """[(rank, username, points), ...] for one page of a role's leaderboard."""
+    _ensure_loaded()
+    with _lock:
+        board = _boards.get(role)
+        if not board:
+            return []
+        return [
+            (offset + i + 1, username, -neg_points)
+            for i, (neg_points, username) in enumerate(board.islice(offset, offset + limit))
+        ]
+
+
+def rank(username):
+    """(role, rank, points) for a user, or None if they aren't on any board."""
+    _ensure_loaded()
+    with _lock:
+        entry = _entries.get(username)
+        if entry is None:
+            return None
+        role, points = entry
+        return role, _boards[role].index((-points, username)) + 1, points
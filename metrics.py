@@ -0,0 +1,145 @@
+import io
+import os
+import sys
+import json
+import time
+import uuid
+import pickle
+import logging
+import threading
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+
+import store
+
+# -------------------------
+# Render Metrics
+# -------------------------
+# Page render times, timings of the expensive helpers and per-session
+# session_state sizes are appended as JSON lines to a size-rotated local file.
+# The admin-only Metrics page aggregates them into p50 / p95 / p99 tables.
+# Sessions over the memory budget are logged, and their app-owned caches dropped.
+# Only the standard library is imported here, so instrumenting a page never
+# drags in a heavy dependency.
+
+METRICS_PATH = os.environ.get("ECOMORPHIS_METRICS", os.path.join(store.DATA_DIR, "metrics", "metrics.jsonl"))
+MAX_BYTES = int(os.environ.get("ECOMORPHIS_METRICS_MB", "5")) * 1024 * 1024
+BACKUPS = 5
+# Usernames allowed to open the Metrics page, e.g. ECOMORPHIS_ADMINS=champion,ops
+ADMINS = {u.strip() for u in os.environ.get("ECOMORPHIS_ADMINS", "").split(",") if u.strip()}
+# session_state is pickled on the first rerun and then every Nth one
+STATE_SAMPLE_EVERY = 10
+# A sampled session_state over budget has its largest app-owned cache entries removed
+SESSION_BUDGET_BYTES = int(os.environ.get("ECOMORPHIS_SESSION_BUDGET_KB", "1024")) * 1024
+# session_state keys with this prefix hold caches the app can rebuild; nothing else
+# (widget values, forms, review cursors, navigation) is ever dropped
+EVICTABLE_PREFIX = "cache_"
+
+_lock = threading.Lock()
+_logger = None
+
+
+def _get_logger():
+    global _logger
+    if _logger is None:
+        with _lock:
+            if _logger is None:
+                os.makedirs(os.path.dirname(METRICS_PATH), exist_ok=True)
+                handler = RotatingFileHandler(METRICS_PATH, maxBytes=MAX_BYTES, backupCount=BACKUPS, encoding="utf-8")
+                handler.setFormatter(logging.Formatter("%(message)s"))
+                logger = logging.getLogger("ecomorphis.metrics")
+                logger.setLevel(logging.INFO)
+                logger.propagate = False
+                logger.addHandler(handler)
+                _logger = logger
+    return _logger
+
+
+def is_admin(username):
+    return username in ADMINS
+
+
+def record(kind, name, **fields):
+    """Appends one metrics event ("page", "span" or "session")."""
+    entry = {"ts": round(time.time(), 3), "kind": kind, "name": name, **fields}
+    _get_logger().info(json.dumps(entry, separators=(",", ":")))
+
+
+@contextmanager
+def timed(name, kind="span", **fields):
+    """Records how long the block took in ms, even when it exits via st.rerun() or an error."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(kind, name, ms=round((time.perf_counter() - start) * 1000, 3), **fields)
+
+
+def _is_upload(value):
+    """Uploaded files (Streamlit's UploadedFile is a BytesIO), alone or as a multi-file list."""
+    if isinstance(value, (list, tuple)):
+        return bool(value) and all(isinstance(v, io.IOBase) for v in value)
+    return isinstance(value, io.IOBase)
+
+
+def state_sizes(state):
+    """Approximate bytes per session_state key: pickled size, or sys.getsizeof for unpicklable values.
+
+    Uploaded files are skipped: pickling one copies the whole upload on the
+    render thread, and the uploader owns it anyway.
+    """
+    sizes = {}
+    for key in list(state.keys()):
+        value = state[key]
+        if _is_upload(value):
+            continue
+        try:
+            sizes[key] = len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception:
+            sizes[key] = sys.getsizeof(value)
+    return sizes
+
+
+def state_bytes(state):
+    return sum(state_sizes(state).values())
+
+
+def _enforce_budget(state, sizes):
+    """Drops the largest EVICTABLE_PREFIX keys until the state fits the budget; returns the dropped keys."""
+    total = sum(sizes.values())
+    dropped = []
+    for key, size in sorted(sizes.items(), key=lambda kv: kv[1], reverse=True):
+        if total <= SESSION_BUDGET_BYTES:
+            break
+        if not key.startswith(EVICTABLE_PREFIX):
+            continue
+        del state[key]
+        total -= size
+        dropped.append(key)
+    return dropped
+
+
+def track_session(state):
+    """Counts this session's reruns, samples its session_state size and keeps it within budget.
+
+    Only app-owned caches (EVICTABLE_PREFIX keys) are dropped to get back
+    under budget; a session that is over it without them is just logged.
+    Returns the session's metrics id.
+    """
+    session_id = state.setdefault("_metrics_session", uuid.uuid4().hex[:12])
+    reruns = state["_metrics_reruns"] = state.get("_metrics_reruns", 0) + 1
+    if reruns == 1 or reruns % STATE_SAMPLE_EVERY == 0:
+        sizes = state_sizes(state)
+        total = sum(sizes.values())
+        largest = dict(sorted(sizes.items(), key=lambda kv: kv[1], reverse=True)[:3])
+        record("session", "session_state", session=session_id, reruns=reruns, bytes=total, largest=largest)
+        if total > SESSION_BUDGET_BYTES:
+            dropped = _enforce_budget(state, sizes)
+            record("session", "over_budget", session=session_id, reruns=reruns, bytes=total, dropped=dropped)
+    return session_id
+
+
+def log_files():
+    """The current metrics file and its rotated backups that exist, oldest first."""
+    paths = [f"{METRICS_PATH}.{n}" for n in range(BACKUPS, 0, -1)] + [METRICS_PATH]
+    return [p for p in paths if os.path.exists(p)]
@@ -0,0 +1,238 @@
+import os
+import threading
+
+import numpy as np
+from PIL import Image, ImageOps
+
+import store
+
+# -------------------------
+# Perceptual Photo Hashes & Near-Duplicate Index
+# -------------------------
+# Every uploaded photo gets a 64-bit pHash (low frequencies of a 32x32 DCT)
+# and a 64-bit dHash (brightness gradients of a 9x8 thumbnail). Re-encoded,
+# resized or lightly edited copies of a photo land within a few bits of the
+# original. Lookups go through a multi-index hash table per photo source: each
+# pHash is split into four 16-bit chunks, and two hashes within r bits must
+# agree to within r // 4 bits on at least one chunk, so a query probes a few
+# hundred chunk values in sorted arrays instead of comparing against every
+# stored photo. Both hashes must be close for a photo to count as a duplicate.
+
+MAX_DISTANCE = int(os.environ.get("ECOMORPHIS_DUP_DISTANCE", "8"))  # pHash bits
+DHASH_MAX_DISTANCE = 12
+CHUNKS = 4
+CHUNK_BITS = 64 // CHUNKS
+# Appended hashes are scanned linearly until this many pile up, then merged into the sorted tables
+TAIL_LIMIT = 4096
+
+
+def _dct_matrix(n):
+    k = np.arange(n)[:, None]
+    m = np.cos(np.pi * (2 * np.arange(n)[None, :] + 1) * k / (2 * n)) * np.sqrt(2 / n)
+    m[0] /= np.sqrt(2)
+    return m
+
+
+_DCT = _dct_matrix(32)
+_BIT_WEIGHTS = np.uint64(1) << np.arange(63, -1, -1, dtype=np.uint64)
+_BYTE_BITS = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _popcount(values):
+    values = np.ascontiguousarray(values, dtype=np.uint64)
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(values)
+    return _BYTE_BITS[values.view(np.uint8)].reshape(-1, 8).sum(axis=1)
+
+
+def _pack(bits):
+    return int((bits.ravel().astype(np.uint64) * _BIT_WEIGHTS).sum())
+
+
+def _gray(image, size):
+    return np.asarray(image.resize(size, Image.Resampling.BILINEAR), dtype=np.float64)
+
+
+def phash(image):
+    """64-bit DCT hash of a grayscale PIL image."""
+    low = (_DCT @ _gray(image, (32, 32)) @ _DCT.T)[:8, :8]
+    return _pack(low > np.median(low.ravel()[1:]))
+
+
+def dhash(image):
+    """64-bit difference hash of a grayscale PIL image."""
+    pixels = _gray(image, (9, 8))
+    return _pack(pixels[:, 1:] > pixels[:, :-1])
+
+
+def hashes(fileobj):
+    """(phash, dhash) of an image file; raises PIL.UnidentifiedImageError for anything else."""
+    fileobj.seek(0)
+    with Image.open(fileobj) as image:
+        # Let JPEG decode at a fraction of full size; 32x32 is all the hashes look at
+        image.draft("L", (128, 128))
+        return image_hashes(ImageOps.exif_transpose(image))
+
+
+def image_hashes(image):
+    """(phash, dhash) of an already decoded, upright PIL image (e.g. uploads.ingest(...).image)."""
+    image = image.convert("L")
+    return phash(image), dhash(image)
+
+
+def distance(a, b):
+    return bin(a ^ b).count("1")
+
+
+def _signed(h):
+    """SQLite integers are signed 64-bit."""
+    return h - (1 << 64) if h >= 1 << 63 else h
+
+
+def _chunk_masks(max_bits):
+    """All 16-bit masks with at most max_bits bits set."""
+    masks = np.arange(1 << CHUNK_BITS, dtype=np.uint32)
+    return masks[_popcount(masks) <= max_bits].astype(np.uint16)
+
+
+def _ranges(lo, hi):
+    """Concatenation of arange(lo[i], hi[i]) for all i, without a Python loop."""
+    lengths = hi - lo
+    keep = lengths > 0
+    lo, lengths = lo[keep], lengths[keep]
+    if not len(lo):
+        return np.empty(0, dtype=np.int64)
+    starts = np.repeat(lo - np.concatenate(([0], np.cumsum(lengths)[:-1])), lengths)
+    return starts + np.arange(lengths.sum())
+
+
+class HashIndex:
+    """Multi-index hash table over (pHash, dHash) pairs, each tagged with an integer subject."""
+
+    def __init__(self):
+        self.last_id = 0
+        self.phashes = np.empty(0, dtype=np.uint64)
+        self.dhashes = np.empty(0, dtype=np.uint64)
+        self.subjects = np.empty(0, dtype=np.int64)
+        self._tables = [(np.empty(0, dtype=np.uint16), np.empty(0, dtype=np.int64))] * CHUNKS
+        self._tail = []  # (n, 4) int64 blocks of rows not merged into the tables yet
+        self._tail_rows = 0
+        self._masks = {}
+
+    def __len__(self):
+        return len(self.phashes) + self._tail_rows
+
+    def add(self, rows):
+        """rows are (id, phash, dhash, subject) as signed 64-bit ints, ids increasing; subject -1 for none."""
+        block = np.array(rows, dtype=np.int64).reshape(-1, 4)
+        if not len(block):
+            return
+        self._tail.append(block)
+        self._tail_rows += len(block)
+        self.last_id = int(block[-1, 0])
+        if self._tail_rows >= TAIL_LIMIT:
+            self._merge()
+
+    def _tail_block(self):
+        if len(self._tail) > 1:
+            self._tail = [np.concatenate(self._tail)]
+        return self._tail[0]
+
+    def _merge(self):
+        tail = self._tail_block()
+        self.phashes = np.concatenate((self.phashes, tail[:, 1].view(np.uint64)))
+        self.dhashes = np.concatenate((self.dhashes, tail[:, 2].view(np.uint64)))
+        self.subjects = np.concatenate((self.subjects, tail[:, 3]))
+        self._tail, self._tail_rows = [], 0
+        tables = []
+        for j in range(CHUNKS):
+            chunk = ((self.phashes >> np.uint64(j * CHUNK_BITS)) & np.uint64(0xFFFF)).astype(np.uint16)
+            order = np.argsort(chunk, kind="stable")
+            tables.append((chunk[order], order))
+        self._tables = tables
+
+    def search(self, ph, dh, max_distance=MAX_DISTANCE, dhash_max_distance=DHASH_MAX_DISTANCE):
+        """[(subject, phash distance)] for every stored pair close on both hashes, closest first."""
+        if max_distance not in self._masks:
+            self._masks[max_distance] = _chunk_masks(max_distance // CHUNKS)
+        masks = self._masks[max_distance]
+        q, dq = np.uint64(ph), np.uint64(dh)
+
+        found = [np.empty(0, dtype=np.int64)]
+        for j, (sorted_chunk, order) in enumerate(self._tables):
+            keys = np.unique(np.uint16((ph >> (j * CHUNK_BITS)) & 0xFFFF) ^ masks)
+            lo = np.searchsorted(sorted_chunk, keys, side="left")
+            hi = np.searchsorted(sorted_chunk, keys, side="right")
+            found.append(order[_ranges(lo, hi)])
+        candidates = np.concatenate(found)
+        p_dist = _popcount(self.phashes[candidates] ^ q)
+        d_dist = _popcount(self.dhashes[candidates] ^ dq)
+        # A match can come up under more than one chunk; only the (few) matches need de-duplicating
+        matches = np.unique(candidates[(p_dist <= max_distance) & (d_dist <= dhash_max_distance)])
+        subjects, dists = self.subjects[matches], _popcount(self.phashes[matches] ^ q)
+
+        if self._tail:
+            tail = self._tail_block()
+            tp = _popcount(tail[:, 1].view(np.uint64) ^ q)
+            td = _popcount(tail[:, 2].view(np.uint64) ^ dq)
+            close = (tp <= max_distance) & (td <= dhash_max_distance)
+            subjects = np.concatenate((subjects, tail[close, 3]))
+            dists = np.concatenate((dists, tp[close]))
+        by_distance = np.argsort(dists, kind="stable")
+        return [(None if s < 0 else int(s), int(d)) for s, d in zip(subjects[by_distance], dists[by_distance])]
+
+
+_lock = threading.Lock()
+_indexes = {}  # source -> HashIndex
+
+
+def _index(source):
+    """This process's index for a source, caught up with rows any process has stored since the last call."""
+    index = _indexes.get(source)
+    if index is None:
+        index = _indexes[source] = HashIndex()
+    index.add(store.photo_hashes_after(source, index.last_id))
+    return index
+
+
+def lookup(ph, dh, source, max_distance=MAX_DISTANCE):
+    """find_duplicates() plus the last photo_hashes id it covered, for a later find_duplicates(after_id=...)."""
+    with _lock:
+        index = _index(source)
+        return index.search(ph, dh, max_distance), index.last_id
+
+
+def find_duplicates(ph, dh, source, max_distance=MAX_DISTANCE, after_id=None):
+    """[(subject_id, distance)] of stored photos from source that look like this one, closest first.
+
+    With after_id (from lookup()), only photos stored since are compared, read
+    straight from the database without the shared index: cheap enough to
+    re-check inside a write transaction, where catching up a cold index would
+    hold the database lock.
+    """
+    if after_id is None:
+        return lookup(ph, dh, source, max_distance)[0]
+    recent = HashIndex()
+    recent.add(store.photo_hashes_after(source, after_id))
+    return recent.search(ph, dh, max_distance)
+
+
+def register(photo_ref, ph, dh, source, owner, subject_id=None):
+    """Records an accepted upload so later lookups can find it."""
+    store.add_photo_hash(photo_ref, _signed(ph), _signed(dh), source, owner, subject_id)
+
+
+def first_open(duplicates):
+    """The open (Pending or Verified) complaint among find_duplicates() results for "complaint", if any."""
+    for complaint_id, _ in duplicates:
+        complaint = store.get_complaint(complaint_id)
+        if complaint and complaint["duplicate_of"] is not None:
+            complaint = store.get_complaint(complaint["duplicate_of"])
+        if complaint and complaint["status"] in ("Pending", "Verified"):
+            return complaint
+    return None
+
+
+def open_original(ph, dh, after_id=None):
+    """The open (Pending or Verified) complaint this photo duplicates, if any."""
+    return first_open(find_duplicates(ph, dh, "complaint", after_id=after_id))
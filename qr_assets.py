@@ -0,0 +1,223 @@
+import os
+import io
+import re
+import sys
+import hashlib
+import argparse
+import functools
+import zlib
+import threading
+import collections
+from concurrent.futures import ProcessPoolExecutor
+
+import qrcode
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+import store
+
+# -------------------------
+# QR Assets for the Bin Fleet
+# -------------------------
+# Single QR codes are cached in memory and on disk so pages never re-encode
+# them. Printable label sheets (A4 at 300 DPI) are rendered page by page on a
+# process pool and streamed to PNG files or one multi-page PDF.
+
+QR_DIR = os.environ.get("ECOMORPHIS_QR", os.path.join(store.DATA_DIR, "qr"))
+MEMORY_CACHE_SIZE = 2048
+
+PAGE_SIZE = (2480, 3508)  # A4 portrait @ 300 DPI
+PAGE_DPI = 300
+PAGE_MARGIN = 120
+SHEET_COLS, SHEET_ROWS = 4, 6
+
+
+def _qr_image(bin_id, box_size=10):
+    # A fixed mask skips qrcode's 8-way mask scoring, the bulk of the encode time;
+    # any mask is valid for decoders.
+    qr = qrcode.QRCode(error_correction=qrcode.constants.ERROR_CORRECT_M, border=2, mask_pattern=0)
+    qr.add_data(bin_id)
+    qr.make(fit=True)
+    modules = np.asarray(qr.get_matrix(), dtype=bool)
+    pixels = np.kron(~modules, np.ones((box_size, box_size), dtype=bool))
+    return Image.fromarray(pixels)
+
+
+def _disk_path(bin_id):
+    safe = re.sub(r"[^A-Za-z0-9_.-]", "_", bin_id)[:64]
+    digest = hashlib.sha1(bin_id.encode("utf-8")).hexdigest()[:10]
+    return os.path.join(QR_DIR, f"{safe}-{digest}.png")
+
+
+@functools.lru_cache(maxsize=MEMORY_CACHE_SIZE)
+def qr_png(bin_id):
+    """PNG bytes for one bin's QR code, from memory, then disk, then freshly encoded."""
+    path = _disk_path(bin_id)
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        pass
+    buf = io.BytesIO()
+    _qr_image(bin_id).save(buf, format="PNG", optimize=True)
+    data = buf.getvalue()
+    os.makedirs(QR_DIR, exist_ok=True)
+    # Per thread as well as per process: two threads can miss on the same bin at once
+    tmp = f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return data
+
+
+def _font(size):
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:  # Pillow < 10.1 has no scalable default font
+        return ImageFont.load_default()
+
+
+def render_page(bin_ids, cols=SHEET_COLS, rows=SHEET_ROWS):
+    """Tiles up to cols * rows labelled QR codes onto one printable page."""
+    page = Image.new("1", PAGE_SIZE, 1)
+    draw = ImageDraw.Draw(page)
+    font = _font(40)
+    cell_w = (PAGE_SIZE[0] - 2 * PAGE_MARGIN) // cols
+    cell_h = (PAGE_SIZE[1] - 2 * PAGE_MARGIN) // rows
+    qr_side = min(cell_w, cell_h - 70) - 20
+    for n, bin_id in enumerate(bin_ids[: cols * rows]):
+        x = PAGE_MARGIN + (n % cols) * cell_w
+        y = PAGE_MARGIN + (n // cols) * cell_h
+        qr = _qr_image(bin_id, box_size=1)
+        qr = qr.resize((qr_side // qr.width * qr.width,) * 2, Image.NEAREST)
+        page.paste(qr, (x + (cell_w - qr.width) // 2, y + 10))
+        draw.text((x + cell_w // 2, y + qr_side + 30), bin_id, fill=0, font=font, anchor="mt")
+        # Cut guide
+        draw.rectangle((x, y, x + cell_w - 1, y + cell_h - 1), outline=0, width=1)
+    return page
+
+
+def _render_page_data(bin_ids, fmt):
+    """Worker entry point: PNG bytes, or (width, height, flate data) for the PDF writer."""
+    page = render_page(bin_ids)
+    if fmt == "png":
+        buf = io.BytesIO()
+        page.save(buf, format="PNG", dpi=(PAGE_DPI, PAGE_DPI))
+        return buf.getvalue()
+    # Mode "1" rows are packed 8 px/byte with 1 = white, exactly PDF's 1-bit DeviceGray
+    return page.width, page.height, zlib.compress(page.tobytes(), 6)
+
+
+class _PdfWriter:
+    """Streams one full-page bitmap per PDF page, so cost per page stays flat however long the file gets."""
+
+    def __init__(self, f):
+        self.f = f
+        self.offsets = [None, None]  # 1 = catalog, 2 = page tree, written by close()
+        self.pages = []
+        f.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def _obj(self, body, num=None):
+        if num is None:
+            self.offsets.append(None)
+            num = len(self.offsets)
+        self.offsets[num - 1] = self.f.tell()
+        self.f.write(b"%d 0 obj\n" % num + body + b"\nendobj\n")
+        return num
+
+    def _stream(self, header, data):
+        return self._obj(b"<< %s /Length %d >>\nstream\n" % (header, len(data)) + data + b"\nendstream")
+
+    def add_page(self, width, height, data):
+        w, h = width * 72 / PAGE_DPI, height * 72 / PAGE_DPI
+        image = self._stream(
+            b"/Type /XObject /Subtype /Image /Width %d /Height %d /ColorSpace /DeviceGray "
+            b"/BitsPerComponent 1 /Filter /FlateDecode" % (width, height),
+            data,
+        )
+        content = self._stream(b"", b"q %.2f 0 0 %.2f 0 0 cm /Im0 Do Q" % (w, h))
+        self.pages.append(self._obj(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %.2f %.2f] /Resources << /XObject << /Im0 %d 0 R >> >> "
+            b"/Contents %d 0 R >>" % (w, h, image, content)
+        ))
+
+    def close(self):
+        kids = b" ".join(b"%d 0 R" % n for n in self.pages)
+        self._obj(b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(self.pages)), num=2)
+        self._obj(b"<< /Type /Catalog /Pages 2 0 R >>", num=1)
+        xref = self.f.tell()
+        self.f.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(self.offsets) + 1))
+        self.f.write(b"".join(b"%010d 00000 n \n" % off for off in self.offsets))
+        self.f.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(self.offsets) + 1, xref))
+
+
+def sheet_pdf(bin_ids):
+    """One in-process PDF for a handful of bins (e.g. the page currently on screen)."""
+    if not bin_ids:
+        return b""
+    per_page = SHEET_COLS * SHEET_ROWS
+    buf = io.BytesIO()
+    writer = _PdfWriter(buf)
+    for i in range(0, len(bin_ids), per_page):
+        writer.add_page(*_render_page_data(bin_ids[i:i + per_page], "pdf"))
+    writer.close()
+    return buf.getvalue()
+
+
+def render_sheets(bin_ids, out_path, fmt="pdf", workers=None):
+    """Renders label sheets for any number of bins on a process pool.
+
+    For fmt="pdf" out_path is a single PDF that pages are streamed into in order;
+    for fmt="png" it is a directory that receives sheet-00001.png, ... Only a few
+    pages are held in memory at any time. Returns the number of pages written.
+    """
+    per_page = SHEET_COLS * SHEET_ROWS
+    chunks = [bin_ids[i:i + per_page] for i in range(0, len(bin_ids), per_page)]
+    if not chunks:
+        return 0
+    if fmt == "png":
+        os.makedirs(out_path, exist_ok=True)
+        pdf_file = writer = None
+    else:
+        pdf_file = open(out_path, "wb")
+        writer = _PdfWriter(pdf_file)
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Bounded window of in-flight pages so finished pages never pile up in memory
+            window = 2 * (workers or os.cpu_count() or 1)
+            pending = collections.deque()
+            next_chunk = 0
+            for n in range(1, len(chunks) + 1):
+                while next_chunk < len(chunks) and len(pending) < window:
+                    pending.append(pool.submit(_render_page_data, chunks[next_chunk], fmt))
+                    next_chunk += 1
+                data = pending.popleft().result()
+                if writer is None:
+                    with open(os.path.join(out_path, f"sheet-{n:05d}.png"), "wb") as f:
+                        f.write(data)
+                else:
+                    writer.add_page(*data)
+        if writer is not None:
+            writer.close()
+    finally:
+        if pdf_file is not None:
+            pdf_file.close()
+    return len(chunks)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render printable QR label sheets for the bin fleet.")
+    parser.add_argument("out", help="PDF file (--format pdf) or output directory (--format png)")
+    parser.add_argument("--format", choices=["pdf", "png"], default="pdf")
+    parser.add_argument("--prefix", default="", help="Only bins whose ID starts with this, e.g. BIN-BH-")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    bin_ids = [b for b in store.list_bin_ids() if b.startswith(args.prefix)]
+    pages = render_sheets(bin_ids, args.out, fmt=args.format, workers=args.workers)
+    print(f"Wrote {pages} page(s) for {len(bin_ids)} bin(s) to {args.out}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
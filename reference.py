@@ -0,0 +1,119 @@
+import os
+import json
+import threading
+from types import MappingProxyType
+
+import streamlit as st
+
+import geocode
+import facilities
+
+# -------------------------
+# Shared Reference Data
+# -------------------------
+# Catalogs every session reads but never changes (shop products, quizzes, the
+# facility index, the gazetteer) are loaded once per process with
+# st.cache_resource and handed out as read-only views. Each loader is keyed on a version built from the
+# source files' modification times plus a manual reload counter, so editing a
+# file (or pressing "Reload" on the Metrics page) swaps in a fresh copy for
+# every session on its next rerun.
+
+REFERENCE_DIR = os.environ.get(
+    "ECOMORPHIS_REFERENCE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "reference"),
+)
+SHOP_PATH = os.path.join(REFERENCE_DIR, "shop.json")
+QUIZZES_PATH = os.path.join(REFERENCE_DIR, "quizzes.json")
+
+_lock = threading.Lock()
+_generation = 0
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except (OSError, TypeError):
+        return None
+
+
+def version(*paths):
+    """Changes whenever one of the source files changes or reload() is called."""
+    return (_generation,) + tuple(_mtime(p) for p in paths)
+
+
+def reload():
+    """Makes every loader rebuild on its next use, in all sessions."""
+    global _generation
+    with _lock:
+        _generation += 1
+
+
+def _freeze(value):
+    """Read-only copy of parsed JSON: dicts become mapping proxies, lists become tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _read_json(path):
+    with open(path, encoding="utf-8") as f:
+        return _freeze(json.load(f))
+
+
+# The version argument is part of the cache key; max_entries=1 drops the old copy
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _shop_catalog(version_key):
+    return _read_json(SHOP_PATH)["products"]
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _quizzes(version_key):
+    return _read_json(QUIZZES_PATH)
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _facility_index(version_key):
+    index = facilities.FacilityIndex(facilities.load_facilities())
+    for array in (index.lats, index.lons, index.order, index.sorted_keys):
+        array.flags.writeable = False
+    return index
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _gazetteer(version_key):
+    gazetteer = geocode.Gazetteer(geocode.load_gazetteer())
+    for array in (gazetteer.lats, gazetteer.lons):
+        array.flags.writeable = False
+    return gazetteer
+
+
+def shop_catalog():
+    """Products on sale, in display order (read-only)."""
+    return _shop_catalog(version(SHOP_PATH))
+
+
+def quizzes():
+    """Quiz definitions keyed by audience ("citizen", "worker"), read-only."""
+    return _quizzes(version(QUIZZES_PATH))
+
+
+def facility_index():
+    """The facility inventory and its spatial index, shared by every session."""
+    return _facility_index(version(facilities.FACILITIES_PATH))
+
+
+def gazetteer():
+    """Wards and landmarks with their autocomplete index, shared by every session."""
+    return _gazetteer(version(geocode.GAZETTEER_PATH))
+
+
+def current_versions():
+    """{catalog: version} for display on the Metrics page."""
+    return {
+        "shop": version(SHOP_PATH),
+        "quizzes": version(QUIZZES_PATH),
+        "facilities": version(facilities.FACILITIES_PATH),
+        "gazetteer": version(geocode.GAZETTEER_PATH),
+    }
@@ -0,0 +1,131 @@
+import os
+import time
+
+import numpy as np
+
+import facilities
+
+# -------------------------
+# Collection Route Planner
+# -------------------------
+# Orders a set of stops (e.g. the overflowing bins) into a round trip from a
+# depot. The distance matrix is one broadcast haversine call; the tour is
+# built nearest-neighbour first, then improved with 2-opt (reverse a stretch
+# of the route) and Or-opt (move a run of 1-3 stops elsewhere, either way
+# round) until neither finds a shorter route or the time budget runs out.
+# Every improvement step scores all candidate positions for one stop as a
+# single NumPy expression, so 1,000 stops solve in seconds.
+
+# "lat,lon" of the yard the trucks leave from and return to
+DEPOT = tuple(float(v) for v in os.environ.get("ECOMORPHIS_DEPOT", "23.2599,77.4126").split(","))
+TIME_BUDGET_SECONDS = 10.0
+OR_OPT_LENGTHS = (1, 2, 3)
+_EPS = 1e-9
+
+
+def distance_matrix(lats, lons):
+    """Great-circle km between every pair of points."""
+    lats, lons = np.asarray(lats, dtype=np.float64), np.asarray(lons, dtype=np.float64)
+    return facilities.haversine_km(lats[:, None], lons[:, None], lats[None, :], lons[None, :])
+
+
+def tour_length(dist, tour):
+    """Length of the closed tour (back to tour[0] at the end)."""
+    return float(dist[tour, np.roll(tour, -1)].sum())
+
+
+def nearest_neighbour(dist, start=0):
+    """Greedy tour: always drive to the closest stop not visited yet."""
+    n = len(dist)
+    tour = np.empty(n, dtype=np.int64)
+    visited = np.zeros(n, dtype=bool)
+    tour[0], visited[start] = start, True
+    current = start
+    for k in range(1, n):
+        row = np.where(visited, np.inf, dist[current])
+        current = int(np.argmin(row))
+        tour[k], visited[current] = current, True
+    return tour
+
+
+def two_opt(dist, tour, deadline=None):
+    """Reverses stretches of the tour while that shortens it; tour[0] (the depot) stays first."""
+    tour = tour.copy()
+    n = len(tour)
+    if n < 4:
+        return tour
+    improved = True
+    while improved:
+        improved = False
+        for i in range(n - 2):
+            # Edge (a, b) = (tour[i], tour[i+1]) against every later edge (c, d) = (tour[j], tour[j+1])
+            a, b = tour[i], tour[i + 1]
+            c = tour[i + 2:]
+            d = np.append(tour[i + 3:], tour[0])
+            delta = dist[a, c] + dist[b, d] - dist[a, b] - dist[c, d]
+            k = int(np.argmin(delta))
+            if delta[k] < -_EPS:
+                j = i + 2 + k
+                tour[i + 1:j + 1] = tour[i + 1:j + 1][::-1]
+                improved = True
+            if deadline is not None and time.monotonic() > deadline:
+                return tour
+    return tour
+
+
+def or_opt(dist, tour, deadline=None):
+    """Moves runs of 1-3 consecutive stops to a cheaper place in the tour (reversed if that is cheaper)."""
+    tour = tour.copy()
+    n = len(tour)
+    improved = True
+    while improved:
+        improved = False
+        for length in OR_OPT_LENGTHS:
+            if n < length + 3:
+                continue
+            i = 1
+            while i + length <= n:
+                seg = tour[i:i + length]
+                prev, nxt = tour[i - 1], tour[(i + length) % n]
+                removed = dist[prev, seg[0]] + dist[seg[-1], nxt] - dist[prev, nxt]
+                rest = np.concatenate((tour[:i], tour[i + length:]))
+                c, d = rest, np.roll(rest, -1)
+                forward = dist[c, seg[0]] + dist[seg[-1], d] - dist[c, d]
+                backward = dist[c, seg[-1]] + dist[seg[0], d] - dist[c, d]
+                best = np.minimum(forward, backward)
+                k = int(np.argmin(best))
+                if best[k] - removed < -_EPS:
+                    run = seg if forward[k] <= backward[k] else seg[::-1]
+                    tour = np.concatenate((rest[:k + 1], run, rest[k + 1:]))
+                    improved = True
+                else:
+                    i += 1
+                if deadline is not None and time.monotonic() > deadline:
+                    return tour
+    return tour
+
+
+def plan_route(lats, lons, depot=DEPOT, time_budget=TIME_BUDGET_SECONDS):
+    """Visiting order for the stops, starting and ending at depot.
+
+    Returns (order, legs_km, stats): order indexes into lats / lons, legs_km[k]
+    is the drive to the k-th stop with one extra last entry for the drive back
+    to the depot, and stats has the nearest-neighbour and optimized lengths in km.
+    """
+    n = len(lats)
+    if n == 0:
+        return np.empty(0, dtype=np.int64), np.zeros(1), {"stops": 0, "greedy_km": 0.0, "optimized_km": 0.0}
+    # Point 0 is the depot, stop k is point k + 1
+    dist = distance_matrix(np.r_[depot[0], lats], np.r_[depot[1], lons])
+    deadline = time.monotonic() + time_budget
+    tour = nearest_neighbour(dist)
+    greedy = tour_length(dist, tour)
+    best = greedy
+    while time.monotonic() < deadline:
+        tour = or_opt(dist, two_opt(dist, tour, deadline), deadline)
+        length = tour_length(dist, tour)
+        if length > best - _EPS:
+            break
+        best = length
+    stats = {"stops": n, "greedy_km": round(greedy, 2), "optimized_km": round(tour_length(dist, tour), 2)}
+    return tour[1:] - 1, dist[tour, np.roll(tour, -1)], stats
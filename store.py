@@ -0,0 +1,1239 @@
+import os
+import time
+import sqlite3
+import threading
+import queue
+import struct
+import datetime
+from contextlib import contextmanager
+
+# -------------------------
+# Shared SQLite Data Store
+# -------------------------
+# One database for the whole process (and any other process pointing at the same
+# file). Every page goes through the functions below instead of keeping its own
+# copy of users / complaints / bins in st.session_state.
+
+DATA_DIR = os.environ.get(
+    "ECOMORPHIS_DATA",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data"),
+)
+DB_PATH = os.environ.get("ECOMORPHIS_DB", os.path.join(DATA_DIR, "ecomorphis.db"))
+POOL_SIZE = int(os.environ.get("ECOMORPHIS_DB_POOL", "32"))
+BULK_CACHE_MB = int(os.environ.get("ECOMORPHIS_BULK_CACHE_MB", "256"))  # page cache while bulk loading
+SERIES_MAX_EVENTS = 512  # per bin in bin_series; older changes stay in bin_events only
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    username        TEXT PRIMARY KEY,
+    password        TEXT NOT NULL,
+    role            TEXT NOT NULL,
+    points          INTEGER NOT NULL DEFAULT 0,
+    last_green_snap TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_users_role_points ON users(role, points DESC);
+
+-- Append-only record of every Eco-Points change; users.points is its materialized running total.
+-- key makes one-off awards idempotent (e.g. 'citizen-m1:alice' can only ever be credited once).
+CREATE TABLE IF NOT EXISTS points_ledger (
+    id       INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT NOT NULL,
+    delta    INTEGER NOT NULL,
+    reason   TEXT NOT NULL,
+    key      TEXT UNIQUE,
+    at       TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_points_ledger_user ON points_ledger(username, id);
+
+CREATE TABLE IF NOT EXISTS complaints (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    user        TEXT NOT NULL,
+    location    TEXT NOT NULL,
+    waste_type  TEXT NOT NULL,
+    photo_ref   TEXT,
+    timestamp   TEXT NOT NULL,
+    status      TEXT NOT NULL DEFAULT 'Pending',
+    verified_by TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_complaints_status ON complaints(status, id);
+CREATE INDEX IF NOT EXISTS idx_complaints_user ON complaints(user, id);
+CREATE INDEX IF NOT EXISTS idx_complaints_verifier ON complaints(verified_by, id) WHERE verified_by IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_complaints_day ON complaints(substr(timestamp, 1, 10), id);
+
+-- Running counters kept exact by the triggers below, so every count is a single row lookup.
+-- kind is one of 'all', 'status', 'user', 'verifier', 'day'.
+CREATE TABLE IF NOT EXISTS complaint_counts (
+    kind TEXT NOT NULL,
+    key  TEXT NOT NULL,
+    n    INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (kind, key)
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS trg_complaints_count_insert AFTER INSERT ON complaints BEGIN
+    INSERT INTO complaint_counts (kind, key, n) VALUES
+        ('all', '*', 1), ('status', NEW.status, 1), ('user', NEW.user, 1), ('day', substr(NEW.timestamp, 1, 10), 1)
+        ON CONFLICT (kind, key) DO UPDATE SET n = n + 1;
+    INSERT INTO complaint_counts (kind, key, n) SELECT 'verifier', NEW.verified_by, 1 WHERE NEW.verified_by IS NOT NULL
+        ON CONFLICT (kind, key) DO UPDATE SET n = n + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_complaints_count_status AFTER UPDATE OF status ON complaints
+WHEN OLD.status IS NOT NEW.status BEGIN
+    UPDATE complaint_counts SET n = n - 1 WHERE kind = 'status' AND key = OLD.status;
+    INSERT INTO complaint_counts (kind, key, n) VALUES ('status', NEW.status, 1)
+        ON CONFLICT (kind, key) DO UPDATE SET n = n + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_complaints_count_verifier AFTER UPDATE OF verified_by ON complaints
+WHEN OLD.verified_by IS NOT NEW.verified_by BEGIN
+    UPDATE complaint_counts SET n = n - 1 WHERE kind = 'verifier' AND key = OLD.verified_by;
+    INSERT INTO complaint_counts (kind, key, n) SELECT 'verifier', NEW.verified_by, 1 WHERE NEW.verified_by IS NOT NULL
+        ON CONFLICT (kind, key) DO UPDATE SET n = n + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_complaints_count_delete AFTER DELETE ON complaints BEGIN
+    UPDATE complaint_counts SET n = n - 1 WHERE (kind = 'all' AND key = '*')
+        OR (kind = 'status' AND key = OLD.status) OR (kind = 'user' AND key = OLD.user)
+        OR (kind = 'day' AND key = substr(OLD.timestamp, 1, 10)) OR (kind = 'verifier' AND key = OLD.verified_by);
+END;
+
+CREATE TABLE IF NOT EXISTS bins (
+    bin_id       TEXT PRIMARY KEY,
+    location     TEXT NOT NULL,
+    status       TEXT NOT NULL DEFAULT 'Clean',
+    last_updated TEXT,
+    reported_by  TEXT,
+    zone         TEXT,
+    latitude     REAL,
+    longitude    REAL
+);
+
+-- Every status change, newest last; bins.status / last_updated / reported_by are just the latest snapshot
+CREATE TABLE IF NOT EXISTS bin_events (
+    id     INTEGER PRIMARY KEY AUTOINCREMENT,
+    bin_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    actor  TEXT,
+    at     TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_bin_events_bin ON bin_events(bin_id, id);
+
+-- Compact copy of each bin's bin_events for the forecast job, one row per bin. events packs the
+-- most recent SERIES_MAX_EVENTS changes as little-endian int64s: local-time epoch seconds * 2,
+-- plus 1 for an overflow.
+CREATE TABLE IF NOT EXISTS bin_series (
+    bin_id TEXT PRIMARY KEY,
+    events BLOB NOT NULL
+);
+
+-- Latest batch forecast from forecast.py: when each clean bin is next expected to overflow.
+-- next_overflow is NULL when the bin has no usable history; the whole table is replaced per run.
+CREATE TABLE IF NOT EXISTS bin_forecasts (
+    bin_id        TEXT PRIMARY KEY,
+    next_overflow TEXT,
+    cycles        INTEGER NOT NULL,
+    computed_at   TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_bin_forecasts_next ON bin_forecasts(next_overflow) WHERE next_overflow IS NOT NULL;
+
+-- When each periodic batch job last started, e.g. 'forecast'. Kept apart from the job's
+-- output so a run that produces no rows still counts as fresh.
+CREATE TABLE IF NOT EXISTS job_runs (
+    job     TEXT PRIMARY KEY,
+    last_at TEXT NOT NULL
+) WITHOUT ROWID;
+
+-- Pre-aggregated event counts behind the dashboard trends, kept by the ROLLUP_TRIGGERS below.
+-- grain 'hour' buckets look like '2025-09-19 09', 'day' buckets like '2025-09-19'.
+-- Hourly rows cover the low-cardinality dimensions ('all', 'waste_type'); 'location',
+-- 'champion' and 'zone' are rolled up per day only.
+CREATE TABLE IF NOT EXISTS rollups (
+    event     TEXT NOT NULL,
+    dimension TEXT NOT NULL,
+    grain     TEXT NOT NULL,
+    bucket    TEXT NOT NULL,
+    value     TEXT NOT NULL,
+    n         INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (event, dimension, grain, bucket, value)
+) WITHOUT ROWID;
+
+-- Domain events waiting for (or done with) delivery by the notification worker in events.py.
+-- Rows are written in the same transaction as the change they describe; status is
+-- 'pending', 'delivered' or 'dead' (gave up after too many failed attempts).
+-- Delivered rows are pruned after a retention period.
+CREATE TABLE IF NOT EXISTS outbox (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    type         TEXT NOT NULL,
+    payload      TEXT NOT NULL,
+    created_at   TEXT NOT NULL,
+    status       TEXT NOT NULL DEFAULT 'pending',
+    attempts     INTEGER NOT NULL DEFAULT 0,
+    next_attempt TEXT NOT NULL,
+    delivered_at TEXT,
+    last_error   TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_status ON outbox(status, next_attempt, id);
+
+-- Perceptual hashes of accepted uploads (see photohash.py), stored as signed 64-bit integers.
+-- source is 'complaint' (subject_id = the complaint) or 'green_snap' (no subject).
+CREATE TABLE IF NOT EXISTS photo_hashes (
+    id         INTEGER PRIMARY KEY AUTOINCREMENT,
+    photo_ref  TEXT,
+    phash      INTEGER NOT NULL,
+    dhash      INTEGER NOT NULL,
+    source     TEXT NOT NULL,
+    owner      TEXT NOT NULL,
+    subject_id INTEGER,
+    at         TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_photo_hashes_source ON photo_hashes(source, id);
+"""
+
+# Columns added after a table first shipped; _init_db adds any that an older database lacks
+MIGRATIONS = {
+    "bins": {"zone": "TEXT", "latitude": "REAL", "longitude": "REAL"},
+    "complaints": {
+        "resolved_by": "TEXT", "duplicate_of": "INTEGER",
+        # Where geocode.py placed the report; NULL when the location matched nothing in the gazetteer
+        "latitude": "REAL", "longitude": "REAL", "ward": "TEXT", "geohash": "TEXT",
+    },
+}
+
+# Indexes over migrated columns, created once the columns are guaranteed to exist
+INDEXES = """
+DROP INDEX IF EXISTS idx_bins_status;
+CREATE INDEX IF NOT EXISTS idx_bins_status_zone ON bins(status, zone, bin_id);
+CREATE INDEX IF NOT EXISTS idx_bins_zone ON bins(zone, bin_id);
+CREATE INDEX IF NOT EXISTS idx_complaints_duplicate_of ON complaints(duplicate_of, id) WHERE duplicate_of IS NOT NULL;
+"""
+
+# Rollup counters, one upsert per (dimension, grain) row an event lands in.
+# Complaint events: 'reported' at the complaint's timestamp, then 'verified' / 'resolved' /
+# 'invalid' when its status moves; bin events: 'bin_overflowing' / 'bin_clean' per change.
+# Geocoded reports also count per 'ward' and per 'geohash' cell each day.
+# The complaint insert trigger has changed since it first shipped, so _init_db compares it with
+# the stored definition and replaces an older one; the others are only ever created.
+COMPLAINT_ROLLUP_TRIGGER = """CREATE TRIGGER trg_rollups_complaint_insert AFTER INSERT ON complaints BEGIN
+    INSERT INTO rollups (event, dimension, grain, bucket, value, n)
+    SELECT 'reported', d.dimension, d.grain, substr(NEW.timestamp, 1, d.len), d.value, 1
+    FROM (SELECT 'all' AS dimension, 'hour' AS grain, 13 AS len, '*' AS value
+          UNION ALL SELECT 'waste_type', 'hour', 13, NEW.waste_type
+          UNION ALL SELECT 'all', 'day', 10, '*'
+          UNION ALL SELECT 'waste_type', 'day', 10, NEW.waste_type
+          UNION ALL SELECT 'location', 'day', 10, NEW.location
+          UNION ALL SELECT 'ward', 'day', 10, NEW.ward
+          UNION ALL SELECT 'geohash', 'day', 10, NEW.geohash) d
+    WHERE d.value IS NOT NULL
+    ON CONFLICT (event, dimension, grain, bucket, value) DO UPDATE SET n = n + 1;
+END"""
+
+ROLLUP_TRIGGERS = """
+CREATE TRIGGER IF NOT EXISTS trg_rollups_complaint_status AFTER UPDATE OF status ON complaints
+WHEN OLD.status IS NOT NEW.status AND NEW.status IN ('Verified', 'Resolved', 'Invalid') BEGIN
+    INSERT INTO rollups (event, dimension, grain, bucket, value, n)
+    SELECT lower(NEW.status), d.dimension, d.grain, substr(strftime('%Y-%m-%d %H', 'now', 'localtime'), 1, d.len), d.value, 1
+    FROM (SELECT 'all' AS dimension, 'hour' AS grain, 13 AS len, '*' AS value
+          UNION ALL SELECT 'waste_type', 'hour', 13, NEW.waste_type
+          UNION ALL SELECT 'all', 'day', 10, '*'
+          UNION ALL SELECT 'waste_type', 'day', 10, NEW.waste_type
+          UNION ALL SELECT 'location', 'day', 10, NEW.location
+          UNION ALL SELECT 'champion', 'day', 10,
+              CASE NEW.status WHEN 'Verified' THEN NEW.verified_by WHEN 'Resolved' THEN NEW.resolved_by END) d
+    WHERE d.value IS NOT NULL
+    ON CONFLICT (event, dimension, grain, bucket, value) DO UPDATE SET n = n + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_rollups_bin_event AFTER INSERT ON bin_events BEGIN
+    INSERT INTO rollups (event, dimension, grain, bucket, value, n)
+    SELECT 'bin_' || lower(NEW.status), d.dimension, d.grain, substr(NEW.at, 1, d.len), d.value, 1
+    FROM (SELECT 'all' AS dimension, 'hour' AS grain, 13 AS len, '*' AS value
+          UNION ALL SELECT 'all', 'day', 10, '*'
+          UNION ALL SELECT 'zone', 'day', 10,
+              COALESCE((SELECT zone FROM bins WHERE bin_id = NEW.bin_id), 'Unzoned')) d
+    WHERE true
+    ON CONFLICT (event, dimension, grain, bucket, value) DO UPDATE SET n = n + 1;
+END;
+"""
+
+# Demo accounts and bins so a fresh database is usable straight away
+SEED_USERS = [
+    ("citizen", "123", "Citizen", 125),
+    ("champion", "123", "Green Champion", 250),
+]
+SEED_BINS = [
+    ("BIN-BH-001", "Kolar Road, Near SBI", "Clean", None, None, "Kolar Road", 23.1765, 77.4126),
+    ("BIN-BH-002", "Arera Colony, Market Area", "Clean", None, None, "Arera Colony", 23.2105, 77.4294),
+    ("BIN-BH-003", "MP Nagar, Zone 1", "Overflowing", "2025-09-19 09:30:00", "citizen", "MP Nagar", 23.2337, 77.4345),
+]
+
+_pool = queue.LifoQueue(maxsize=POOL_SIZE)
+_local = threading.local()
+_init_lock = threading.Lock()
+_initialized = False
+_points_listeners = []
+_ledger_listeners = []
+
+BALANCE_CACHE_SIZE = 100000
+# How long a cached balance is trusted; bounds how stale another process's changes can look
+BALANCE_TTL_SECONDS = float(os.environ.get("ECOMORPHIS_BALANCE_TTL", "5"))
+_balance_cache = {}  # username -> (points, monotonic expiry)
+_balance_lock = threading.Lock()
+_balance_gen = 0
+
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+
+
+def now(offset_seconds=0):
+    at = datetime.datetime.now() + datetime.timedelta(seconds=offset_seconds)
+    return at.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _open():
+    conn = sqlite3.connect(DB_PATH, timeout=30, isolation_level=None, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=30000")
+    conn.execute("PRAGMA foreign_keys=ON")
+    return conn
+
+
+def _rebuild_complaint_counts(conn):
+    conn.execute("DELETE FROM complaint_counts")
+    conn.execute("""
+        INSERT INTO complaint_counts (kind, key, n)
+        SELECT 'all', '*', COUNT(*) FROM complaints
+        UNION ALL SELECT 'status', status, COUNT(*) FROM complaints GROUP BY status
+        UNION ALL SELECT 'user', user, COUNT(*) FROM complaints GROUP BY user
+        UNION ALL SELECT 'day', substr(timestamp, 1, 10), COUNT(*) FROM complaints GROUP BY 2
+        UNION ALL SELECT 'verifier', verified_by, COUNT(*) FROM complaints WHERE verified_by IS NOT NULL GROUP BY verified_by
+    """)
+
+
+def _rebuild_rollups(conn):
+    """Backfills the rollups from the raw rows.
+
+    Complaints only carry their report time, so status changes made before the
+    rollups existed can't be placed in a bucket and are left out.
+    """
+    conn.execute("DELETE FROM rollups")
+    conn.execute("""
+        INSERT INTO rollups (event, dimension, grain, bucket, value, n)
+        SELECT 'reported', 'all', 'hour', substr(timestamp, 1, 13), '*', COUNT(*) FROM complaints GROUP BY 4
+        UNION ALL SELECT 'reported', 'waste_type', 'hour', substr(timestamp, 1, 13), waste_type, COUNT(*) FROM complaints GROUP BY 4, 5
+        UNION ALL SELECT 'reported', 'all', 'day', substr(timestamp, 1, 10), '*', COUNT(*) FROM complaints GROUP BY 4
+        UNION ALL SELECT 'reported', 'waste_type', 'day', substr(timestamp, 1, 10), waste_type, COUNT(*) FROM complaints GROUP BY 4, 5
+        UNION ALL SELECT 'reported', 'location', 'day', substr(timestamp, 1, 10), location, COUNT(*) FROM complaints GROUP BY 4, 5
+        UNION ALL SELECT 'reported', 'ward', 'day', substr(timestamp, 1, 10), ward, COUNT(*) FROM complaints WHERE ward IS NOT NULL GROUP BY 4, 5
+        UNION ALL SELECT 'reported', 'geohash', 'day', substr(timestamp, 1, 10), geohash, COUNT(*) FROM complaints WHERE geohash IS NOT NULL GROUP BY 4, 5
+        UNION ALL SELECT 'bin_' || lower(status), 'all', 'hour', substr(at, 1, 13), '*', COUNT(*) FROM bin_events GROUP BY 1, 4
+        UNION ALL SELECT 'bin_' || lower(status), 'all', 'day', substr(at, 1, 10), '*', COUNT(*) FROM bin_events GROUP BY 1, 4
+        UNION ALL SELECT 'bin_' || lower(e.status), 'zone', 'day', substr(e.at, 1, 10), COALESCE(b.zone, 'Unzoned'), COUNT(*)
+            FROM bin_events e LEFT JOIN bins b ON b.bin_id = e.bin_id GROUP BY 1, 4, 5
+    """)
+
+
+def _series_entry(status, at):
+    seconds = (datetime.datetime.strptime(at, "%Y-%m-%d %H:%M:%S") - _EPOCH) // datetime.timedelta(seconds=1)
+    return struct.pack("<q", seconds * 2 + (status == 'Overflowing'))
+
+
+def _rebuild_bin_series(conn):
+    conn.execute("DELETE FROM bin_series")
+    series = {}
+    for bin_id, status, at in conn.execute("SELECT bin_id, status, at FROM bin_events ORDER BY id"):
+        series.setdefault(bin_id, []).append(_series_entry(status, at))
+    conn.executemany(
+        "INSERT INTO bin_series (bin_id, events) VALUES (?, ?)",
+        ((bin_id, b"".join(entries[-SERIES_MAX_EVENTS:])) for bin_id, entries in series.items()),
+    )
+
+
+def _init_db():
+    global _initialized
+    with _init_lock:
+        if _initialized:
+            return
+        os.makedirs(os.path.dirname(DB_PATH) or ".", exist_ok=True)
+        conn = _open()
+        try:
+            conn.executescript(SCHEMA)
+            for table, columns in MIGRATIONS.items():
+                existing = {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}
+                for column, decl in columns.items():
+                    if column not in existing:
+                        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+            conn.executescript(INDEXES)
+            conn.executescript(ROLLUP_TRIGGERS)
+            # Everything above is a no-op on an up-to-date database and takes no lock; the write
+            # transaction is only opened when there is something to change, so a process starting
+            # while a bulk import holds the write lock doesn't wait on it
+            if _setup_needed(conn):
+                conn.execute("BEGIN IMMEDIATE")
+                _setup(conn)
+                conn.execute("COMMIT")
+        finally:
+            conn.close()
+        _initialized = True
+
+
+def _stale_trigger(conn):
+    installed = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = 'trg_rollups_complaint_insert'"
+    ).fetchone()
+    return installed is None or installed[0] != COMPLAINT_ROLLUP_TRIGGER
+
+
+def _setup_needed(conn):
+    """Whether _setup has anything to do, checked with reads only."""
+    users = [row[0] for row in SEED_USERS]
+    bins = [row[0] for row in SEED_BINS]
+    return _stale_trigger(conn) or bool(conn.execute(f"""
+        SELECT (SELECT COUNT(*) FROM users WHERE username IN ({','.join('?' * len(users))})) < {len(users)}
+            OR (SELECT COUNT(*) FROM bins WHERE bin_id IN ({','.join('?' * len(bins))})) < {len(bins)}
+            OR (NOT EXISTS (SELECT 1 FROM points_ledger) AND EXISTS (SELECT 1 FROM users WHERE points != 0))
+            OR NOT EXISTS (SELECT 1 FROM complaint_counts)
+            OR (NOT EXISTS (SELECT 1 FROM rollups)
+                AND (EXISTS (SELECT 1 FROM complaints) OR EXISTS (SELECT 1 FROM bin_events)))
+            OR (NOT EXISTS (SELECT 1 FROM bin_series) AND EXISTS (SELECT 1 FROM bin_events))
+    """, users + bins).fetchone()[0])
+
+
+def _setup(conn):
+    """Seeds, backfills and trigger upgrades, inside the caller's write transaction."""
+    if _stale_trigger(conn):
+        # Replaced within the transaction, so no complaint insert can land while it is missing
+        conn.execute("DROP TRIGGER IF EXISTS trg_rollups_complaint_insert")
+        conn.execute(COMPLAINT_ROLLUP_TRIGGER)
+    conn.executemany(
+        "INSERT OR IGNORE INTO users (username, password, role, points) VALUES (?, ?, ?, ?)", SEED_USERS
+    )
+    conn.executemany(
+        "INSERT OR IGNORE INTO bins (bin_id, location, status, last_updated, reported_by, zone, latitude, longitude) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        SEED_BINS,
+    )
+    # Balances that predate the ledger become one opening entry each
+    if conn.execute("SELECT NOT EXISTS (SELECT 1 FROM points_ledger)").fetchone()[0]:
+        conn.execute(
+            "INSERT INTO points_ledger (username, delta, reason, at) "
+            "SELECT username, points, 'Opening balance', ? FROM users WHERE points != 0",
+            (now(),),
+        )
+    # Databases created before the counters existed get them backfilled once
+    if conn.execute("SELECT NOT EXISTS (SELECT 1 FROM complaint_counts)").fetchone()[0]:
+        _rebuild_complaint_counts(conn)
+    if conn.execute(
+        "SELECT NOT EXISTS (SELECT 1 FROM rollups) "
+        "AND (EXISTS (SELECT 1 FROM complaints) OR EXISTS (SELECT 1 FROM bin_events))"
+    ).fetchone()[0]:
+        _rebuild_rollups(conn)
+    if conn.execute(
+        "SELECT NOT EXISTS (SELECT 1 FROM bin_series) AND EXISTS (SELECT 1 FROM bin_events)"
+    ).fetchone()[0]:
+        _rebuild_bin_series(conn)
+
+
+@contextmanager
+def connection():
+    """Checks a pooled connection out for the current thread; nested calls share it."""
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        _local.depth += 1
+        try:
+            yield conn
+        finally:
+            _local.depth -= 1
+        return
+
+    if not _initialized:
+        _init_db()
+    try:
+        conn = _pool.get_nowait()
+    except queue.Empty:
+        conn = _open()
+    _local.conn, _local.depth = conn, 1
+    try:
+        yield conn
+    finally:
+        _local.conn, _local.depth = None, 0
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        try:
+            _pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+
+@contextmanager
+def transaction():
+    """Runs the block in one write transaction (BEGIN IMMEDIATE), nested blocks join the outer one."""
+    with connection() as conn:
+        if conn.in_transaction:
+            yield conn
+            return
+        _local.after_commit = []
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            _local.after_commit = []
+            raise
+        conn.execute("COMMIT")
+        callbacks, _local.after_commit = _local.after_commit, []
+    for callback in callbacks:
+        callback()
+
+
+@contextmanager
+def bulk_transaction():
+    """transaction() with a BULK_CACHE_MB page cache, so index pages stay in memory across a large load.
+
+    The connection goes back to the pool with its usual small cache.
+    """
+    with transaction() as conn:
+        default = conn.execute("PRAGMA cache_size").fetchone()[0]
+        conn.execute(f"PRAGMA cache_size = -{BULK_CACHE_MB * 1024}")
+        try:
+            yield conn
+        finally:
+            conn.execute(f"PRAGMA cache_size = {default}")
+
+
+def after_commit(callback):
+    """Calls callback() once the current transaction commits (never if it rolls back)."""
+    _local.after_commit.append(callback)
+
+
+def on_points_change(listener):
+    """Registers listener(username, role, points), called after every committed balance change."""
+    _points_listeners.append(listener)
+
+
+def on_ledger_entry(listener):
+    """Registers listener(username, delta, reason, key), called inside the transaction that applies an entry."""
+    _ledger_listeners.append(listener)
+
+
+def _points_changed(conn, username):
+    """Queues listener calls with the user's new balance for when the transaction commits."""
+    if not _points_listeners:
+        return
+    row = conn.execute("SELECT role, points FROM users WHERE username = ?", (username,)).fetchone()
+    if row is None:
+        return
+    for listener in _points_listeners:
+        _local.after_commit.append(lambda l=listener: l(username, row["role"], row["points"]))
+
+
+def _one(sql, params=()):
+    with connection() as conn:
+        row = conn.execute(sql, params).fetchone()
+    return dict(row) if row else None
+
+
+def _all(sql, params=()):
+    with connection() as conn:
+        return [dict(row) for row in conn.execute(sql, params)]
+
+
+def _scalar(sql, params=()):
+    with connection() as conn:
+        return conn.execute(sql, params).fetchone()[0]
+
+
+# --- Users ---
+def get_user(username):
+    return _one("SELECT * FROM users WHERE username = ?", (username,))
+
+
+def create_user(username, password, role):
+    """Returns False if the username is already taken."""
+    with transaction() as conn:
+        cur = conn.execute(
+            "INSERT OR IGNORE INTO users (username, password, role, points) VALUES (?, ?, ?, 0)",
+            (username, password, role),
+        )
+        if cur.rowcount == 1:
+            _points_changed(conn, username)
+        return cur.rowcount == 1
+
+
+def authenticate(username, password):
+    user = get_user(username)
+    if user and user["password"] == password:
+        return user
+    return None
+
+
+def user_exists(username):
+    return _one("SELECT 1 FROM users WHERE username = ?", (username,)) is not None
+
+
+def existing_usernames(usernames):
+    """The subset of usernames that are registered."""
+    usernames = list(dict.fromkeys(usernames))
+    found = set()
+    with connection() as conn:
+        for i in range(0, len(usernames), 500):
+            chunk = usernames[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            found.update(row[0] for row in conn.execute(f"SELECT username FROM users WHERE username IN ({marks})", chunk))
+    return found
+
+
+def set_last_green_snap(username, day):
+    with transaction() as conn:
+        conn.execute("UPDATE users SET last_green_snap = ? WHERE username = ?", (day, username))
+
+
+def import_users(rows):
+    """Bulk insert of new (username, password, role, points) accounts in one transaction.
+
+    Existing accounts are never touched: their rows are skipped, so an import
+    can't reset anyone's password or role. Points seed each new account as one
+    'Opening balance' ledger entry.
+    """
+    at = now()
+    with transaction() as conn:
+        usernames = [row[0] for row in rows]
+        existing = set()
+        for start in range(0, len(usernames), 500):
+            batch = usernames[start:start + 500]
+            existing.update(r[0] for r in conn.execute(
+                f"SELECT username FROM users WHERE username IN ({','.join('?' * len(batch))})", batch))
+        new = {}
+        for row in rows:
+            if row[0] not in existing:
+                new.setdefault(row[0], row)  # a name listed twice keeps its first row
+        conn.executemany("INSERT INTO users (username, password, role, points) VALUES (?, ?, ?, 0)",
+                         ((username, password, role) for username, password, role, _ in new.values()))
+        opening = [(username, points) for username, _, _, points in new.values() if points]
+        conn.executemany(
+            "INSERT INTO points_ledger (username, delta, reason, at) VALUES (?, ?, 'Opening balance', ?)",
+            ((username, points, at) for username, points in opening),
+        )
+        conn.executemany("UPDATE users SET points = ? WHERE username = ?", ((points, username) for username, points in opening))
+        for username in new:
+            _points_changed(conn, username)
+
+
+def iter_user_points():
+    """Streams (username, role, points) for every user without building a list."""
+    with connection() as conn:
+        yield from conn.execute("SELECT username, role, points FROM users")
+
+
+def count_users():
+    return _scalar("SELECT COUNT(*) FROM users")
+
+
+# --- Eco-Points Ledger ---
+# Every balance change appends a points_ledger row and moves users.points in the
+# same transaction, so concurrent sessions can't lose updates and each point
+# has an audit trail.
+def _drop_balance(username, role, points):
+    # Dropped rather than overwritten: after-commit callbacks of two transactions can run in
+    # either order, so the value they carry may already be stale. The next read goes to users.
+    global _balance_gen
+    with _balance_lock:
+        _balance_gen += 1
+        _balance_cache.pop(username, None)
+
+
+_points_listeners.append(_drop_balance)
+
+
+def get_points(username):
+    """Current balance, cached per process for up to BALANCE_TTL_SECONDS.
+
+    Changes committed by this process drop the entry at once; another
+    process's changes show within the TTL. Debits never rely on the cache
+    (spend_points re-checks inside the transaction).
+    """
+    with _balance_lock:
+        cached = _balance_cache.get(username)
+        gen = _balance_gen
+    if cached is not None and cached[1] > time.monotonic():
+        return cached[0]
+    points = _scalar("SELECT COALESCE(MAX(points), 0) FROM users WHERE username = ?", (username,))
+    with _balance_lock:
+        # Skip caching if a change committed while we were reading; it may be newer than our value
+        if gen == _balance_gen:
+            if len(_balance_cache) >= BALANCE_CACHE_SIZE:
+                _balance_cache.clear()
+            _balance_cache[username] = (points, time.monotonic() + BALANCE_TTL_SECONDS)
+    return points
+
+
+def _apply_points(conn, username, delta, reason, key=None, allow_negative=True):
+    entry = conn.execute(
+        "INSERT OR IGNORE INTO points_ledger (username, delta, reason, key, at) VALUES (?, ?, ?, ?, ?)",
+        (username, delta, reason, key, now()),
+    )
+    if entry.rowcount == 0:
+        return False  # key already applied
+    sql = "UPDATE users SET points = points + ? WHERE username = ?"
+    params = [delta, username]
+    if not allow_negative:
+        sql += " AND points + ? >= 0"
+        params.append(delta)
+    if conn.execute(sql, params).rowcount == 0:
+        conn.execute("DELETE FROM points_ledger WHERE id = ?", (entry.lastrowid,))
+        return False
+    for listener in _ledger_listeners:
+        listener(username, delta, reason, key)
+    _points_changed(conn, username)
+    return True
+
+
+def add_points(username, delta, reason, key=None):
+    """Credits points; returns False if the user doesn't exist or key was already applied."""
+    with transaction() as conn:
+        return _apply_points(conn, username, delta, reason, key)
+
+
+def add_points_many(events):
+    """Applies many (username, delta, reason, key) events in one transaction; returns how many were applied."""
+    applied = 0
+    with transaction() as conn:
+        for username, delta, reason, key in events:
+            applied += _apply_points(conn, username, delta, reason, key)
+    return applied
+
+
+def spend_points(username, amount, reason, key=None):
+    """Debits points only if the balance covers them, checked inside the transaction; returns success."""
+    with transaction() as conn:
+        return _apply_points(conn, username, -amount, reason, key, allow_negative=False)
+
+
+def fine_points(username, amount, reason):
+    """Takes up to amount points without going below zero; returns the points actually taken."""
+    with transaction() as conn:
+        balance = conn.execute("SELECT points FROM users WHERE username = ?", (username,)).fetchone()
+        taken = min(amount, max(balance[0], 0)) if balance else 0
+        if taken:
+            _apply_points(conn, username, -taken, reason)
+        return taken
+
+
+def applied_keys(keys):
+    """The subset of ledger idempotency keys that have already been applied."""
+    keys = list(dict.fromkeys(keys))
+    found = set()
+    with connection() as conn:
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            found.update(row[0] for row in conn.execute(f"SELECT key FROM points_ledger WHERE key IN ({marks})", chunk))
+    return found
+
+
+def points_history(username, limit=20):
+    """Most recent ledger entries for a user, newest first."""
+    return _all(
+        "SELECT at, delta, reason FROM points_ledger WHERE username = ? ORDER BY id DESC LIMIT ?", (username, limit)
+    )
+
+
+# --- Complaints ---
+def add_complaint(user, location, waste_type, photo_ref, duplicate_of=None, place=None):
+    """photo_ref is a blobstore key, never the image bytes themselves.
+
+    A report of something already reported is filed as a 'Duplicate' of that
+    complaint and never enters the review queues. place is the geocoded
+    {latitude, longitude, ward, geohash} of the location, if it resolved.
+    """
+    place = place or {}
+    with transaction() as conn:
+        cur = conn.execute(
+            "INSERT INTO complaints (user, location, waste_type, photo_ref, timestamp, status, duplicate_of, "
+            "latitude, longitude, ward, geohash) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (user, location, waste_type, photo_ref, now(), 'Pending' if duplicate_of is None else 'Duplicate', duplicate_of,
+             place.get("latitude"), place.get("longitude"), place.get("ward"), place.get("geohash")),
+        )
+        return cur.lastrowid
+
+
+# Per-row triggers cost more than the insert itself on a bulk load; import_complaints
+# sets them aside for new rows and applies the same counts once per batch with GROUP BY
+_COMPLAINT_INSERT_TRIGGERS = ("trg_complaints_count_insert", "trg_rollups_complaint_insert")
+
+
+def import_complaints(rows):
+    """Bulk insert of (id, user, location, waste_type, timestamp, status, verified_by, resolved_by,
+    latitude, longitude, ward, geohash) rows in one transaction.
+
+    Rows without an id are new complaints. A row with an id inserts that
+    complaint if it is new; if it exists (re-importing an export) only its
+    coordinates, ward and geohash are updated, where the row has them, and
+    only when user, timestamp and status match the stored complaint. Status
+    changes go through set_complaints_status, which keeps points and counters
+    in step. Keyed rows go through the triggers row by row.
+    """
+    fresh = [row[1:] for row in rows if row[0] is None]
+    keyed = [row for row in rows if row[0] is not None]
+    with transaction() as conn:
+        if fresh:
+            last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM complaints").fetchone()[0]
+            # DDL is transactional in SQLite: a failed batch rolls back with the triggers in place
+            triggers = [conn.execute("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = ?", (name,)).fetchone()[0]
+                        for name in _COMPLAINT_INSERT_TRIGGERS]
+            for name in _COMPLAINT_INSERT_TRIGGERS:
+                conn.execute(f"DROP TRIGGER {name}")
+            conn.executemany(
+                "INSERT INTO complaints (user, location, waste_type, timestamp, status, verified_by, resolved_by, "
+                "latitude, longitude, ward, geohash) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                fresh,
+            )
+            for sql in triggers:
+                conn.execute(sql)
+            # Materialized so each count reads the new rows once by id range instead of
+            # walking a whole (user, id) / (day, id) index for its GROUP BY
+            new_rows = (
+                "WITH new AS MATERIALIZED (SELECT user, location, waste_type, timestamp, status, verified_by, ward, geohash "
+                "FROM complaints WHERE id > :last) "
+            )
+            conn.execute(new_rows + """
+                INSERT INTO complaint_counts (kind, key, n)
+                SELECT 'all', '*', COUNT(*) FROM new
+                UNION ALL SELECT 'status', status, COUNT(*) FROM new GROUP BY status
+                UNION ALL SELECT 'user', user, COUNT(*) FROM new GROUP BY user
+                UNION ALL SELECT 'day', substr(timestamp, 1, 10), COUNT(*) FROM new GROUP BY 2
+                UNION ALL SELECT 'verifier', verified_by, COUNT(*) FROM new WHERE verified_by IS NOT NULL GROUP BY verified_by
+                ON CONFLICT (kind, key) DO UPDATE SET n = n + excluded.n
+            """, {"last": last_id})
+            conn.execute(new_rows + """
+                INSERT INTO rollups (event, dimension, grain, bucket, value, n)
+                SELECT 'reported', 'all', 'hour', substr(timestamp, 1, 13), '*', COUNT(*) FROM new WHERE true GROUP BY 4
+                UNION ALL SELECT 'reported', 'waste_type', 'hour', substr(timestamp, 1, 13), waste_type, COUNT(*) FROM new GROUP BY 4, 5
+                UNION ALL SELECT 'reported', 'all', 'day', substr(timestamp, 1, 10), '*', COUNT(*) FROM new GROUP BY 4
+                UNION ALL SELECT 'reported', 'waste_type', 'day', substr(timestamp, 1, 10), waste_type, COUNT(*) FROM new GROUP BY 4, 5
+                UNION ALL SELECT 'reported', 'location', 'day', substr(timestamp, 1, 10), location, COUNT(*) FROM new GROUP BY 4, 5
+                UNION ALL SELECT 'reported', 'ward', 'day', substr(timestamp, 1, 10), ward, COUNT(*) FROM new
+                    WHERE ward IS NOT NULL GROUP BY 4, 5
+                UNION ALL SELECT 'reported', 'geohash', 'day', substr(timestamp, 1, 10), geohash, COUNT(*) FROM new
+                    WHERE geohash IS NOT NULL GROUP BY 4, 5
+                ON CONFLICT (event, dimension, grain, bucket, value) DO UPDATE SET n = n + excluded.n
+            """, {"last": last_id})
+        conn.executemany(
+            "INSERT INTO complaints (id, user, location, waste_type, timestamp, status, verified_by, resolved_by, "
+            "latitude, longitude, ward, geohash) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (id) DO UPDATE SET latitude = COALESCE(excluded.latitude, complaints.latitude), "
+            "longitude = COALESCE(excluded.longitude, complaints.longitude), ward = COALESCE(excluded.ward, complaints.ward), "
+            "geohash = COALESCE(excluded.geohash, complaints.geohash) "
+            "WHERE complaints.user = excluded.user AND complaints.timestamp = excluded.timestamp "
+            "AND complaints.status = excluded.status",
+            keyed,
+        )
+
+
+def get_complaint(complaint_id):
+    return _one("SELECT * FROM complaints WHERE id = ?", (complaint_id,))
+
+
+def complaints_by_ids(complaint_ids):
+    """{id: (user, timestamp, status)} for the given ids that exist."""
+    complaint_ids = list(dict.fromkeys(complaint_ids))
+    found = {}
+    with connection() as conn:
+        for i in range(0, len(complaint_ids), 500):
+            chunk = complaint_ids[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            found.update((row[0], tuple(row[1:])) for row in conn.execute(
+                f"SELECT id, user, timestamp, status FROM complaints WHERE id IN ({marks})", chunk))
+    return found
+
+
+# Each lookup below walks one index in id order; limit / before_id page through it
+# without ever touching rows outside the page.
+def _complaints_where(where, params, limit, before_id, newest_first):
+    sql = f"SELECT * FROM complaints WHERE {where}"
+    params = list(params)
+    if before_id is not None:
+        sql += " AND id < ?" if newest_first else " AND id > ?"
+        params.append(before_id)
+    sql += " ORDER BY id DESC" if newest_first else " ORDER BY id"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit)
+    return _all(sql, params)
+
+
+def complaints_by_status(status, limit=None, before_id=None, newest_first=False):
+    return _complaints_where("status = ?", (status,), limit, before_id, newest_first)
+
+
+def complaints_by_user(user, limit=None, before_id=None, newest_first=False):
+    return _complaints_where("user = ?", (user,), limit, before_id, newest_first)
+
+
+def complaints_by_verifier(verifier, limit=None, before_id=None, newest_first=False):
+    return _complaints_where("verified_by = ?", (verifier,), limit, before_id, newest_first)
+
+
+def complaints_on_day(day, limit=None, before_id=None, newest_first=False):
+    """day is an ISO date string, e.g. '2025-09-19'."""
+    return _complaints_where("substr(timestamp, 1, 10) = ?", (day,), limit, before_id, newest_first)
+
+
+def count_complaints(status=None, user=None, verifier=None, day=None):
+    """O(1) counts from the trigger-maintained counters; pass at most one filter."""
+    if user is not None:
+        kind, key = "user", user
+    elif verifier is not None:
+        kind, key = "verifier", verifier
+    elif day is not None:
+        kind, key = "day", day
+    elif status is not None:
+        kind, key = "status", status
+    else:
+        kind, key = "all", "*"
+    return _scalar("SELECT COALESCE(MAX(n), 0) FROM complaint_counts WHERE kind = ? AND key = ?", (kind, key))
+
+
+def count_duplicates(complaint_ids):
+    """{complaint_id: number of duplicate reports filed against it} for the given complaints."""
+    if not complaint_ids:
+        return {}
+    marks = ",".join("?" * len(complaint_ids))
+    with connection() as conn:
+        return dict(conn.execute(
+            f"SELECT duplicate_of, COUNT(*) FROM complaints WHERE duplicate_of IN ({marks}) GROUP BY duplicate_of",
+            list(complaint_ids),
+        ).fetchall())
+
+
+def complaint_status_counts():
+    """All status counters in one query, e.g. {'Pending': 3, 'Verified': 1}."""
+    with connection() as conn:
+        return dict(conn.execute("SELECT key, n FROM complaint_counts WHERE kind = 'status'").fetchall())
+
+
+def set_complaints_status(complaint_ids, status, from_status=None, verified_by=None, resolved_by=None):
+    """Moves many complaints to a new status in one transaction; returns the IDs that actually moved.
+
+    With from_status, complaints another session already moved on are skipped.
+    """
+    sql = (
+        "UPDATE complaints SET status = ?, verified_by = COALESCE(?, verified_by), "
+        "resolved_by = COALESCE(?, resolved_by) WHERE id = ?"
+    )
+    if from_status is not None:
+        sql += " AND status = ?"
+    changed = []
+    with transaction() as conn:
+        for complaint_id in complaint_ids:
+            params = [status, verified_by, resolved_by, complaint_id]
+            if from_status is not None:
+                params.append(from_status)
+            if conn.execute(sql, params).rowcount == 1:
+                changed.append(complaint_id)
+    return changed
+
+
+def set_complaint_status(complaint_id, status, from_status=None, verified_by=None, resolved_by=None):
+    """Moves a complaint to a new status; returns False if another session got there first."""
+    return bool(set_complaints_status([complaint_id], status, from_status, verified_by, resolved_by))
+
+
+# --- Analytics ---
+def rollup_rows(event, dimension="all", grain="day", since=None, values=None):
+    """(bucket, value, n) rows for one event from the rollups, oldest bucket first.
+
+    since is a bucket string of the same grain, e.g. '2025-09-01' or '2025-09-19 09';
+    values restricts the rows to those dimension values.
+    """
+    sql = "SELECT bucket, value, n FROM rollups WHERE event = ? AND dimension = ? AND grain = ?"
+    params = [event, dimension, grain]
+    if since is not None:
+        sql += " AND bucket >= ?"
+        params.append(since)
+    if values is not None:
+        sql += f" AND value IN ({','.join('?' * len(values))})"
+        params.extend(values)
+    with connection() as conn:
+        return conn.execute(sql + " ORDER BY bucket", params).fetchall()
+
+
+def rollup_totals(events, dimension, since, limit=10):
+    """[(value, n)] with the most events of the given kinds since a day bucket, largest first."""
+    marks = ",".join("?" * len(events))
+    with connection() as conn:
+        return conn.execute(
+            f"SELECT value, SUM(n) AS n FROM rollups WHERE event IN ({marks}) AND dimension = ? AND grain = 'day' "
+            "AND bucket >= ? GROUP BY value ORDER BY n DESC, value LIMIT ?",
+            [*events, dimension, since, limit],
+        ).fetchall()
+
+
+# --- Exports ---
+def rows_after(table, columns, after_id=0, limit=10000):
+    """One keyset page of a table in id order, as plain tuples.
+
+    table and columns come from the fixed export list in bulk.py, never from user input.
+    """
+    with connection() as conn:
+        cur = conn.cursor()
+        cur.row_factory = None
+        return cur.execute(
+            f"SELECT {', '.join(columns)} FROM {table} WHERE id > ? ORDER BY id LIMIT ?", (after_id, limit)
+        ).fetchall()
+
+
+def max_id(table):
+    """Highest id in a table (0 when empty): an upper bound on its row count, read straight off the rowid b-tree."""
+    return _scalar(f"SELECT COALESCE(MAX(id), 0) FROM {table}")
+
+
+# --- Outbox ---
+def add_outbox_event(event_type, payload):
+    """Queues one event (payload is a JSON string) as part of the current transaction."""
+    with transaction() as conn:
+        at = now()
+        conn.execute(
+            "INSERT INTO outbox (type, payload, created_at, next_attempt) VALUES (?, ?, ?, ?)",
+            (event_type, payload, at, at),
+        )
+
+
+def claim_outbox(limit, lease_seconds):
+    """Takes up to limit due events, oldest first, hiding them from other workers for lease_seconds.
+
+    A worker that dies mid-delivery loses its lease and the events come due again.
+    """
+    with transaction() as conn:
+        rows = [dict(row) for row in conn.execute(
+            "SELECT id, type, payload, created_at, attempts FROM outbox "
+            "WHERE status = 'pending' AND next_attempt <= ? ORDER BY next_attempt, id LIMIT ?",
+            (now(), limit),
+        )]
+        conn.executemany(
+            "UPDATE outbox SET attempts = attempts + 1, next_attempt = ? WHERE id = ?",
+            [(now(lease_seconds), row["id"]) for row in rows],
+        )
+    return rows
+
+
+def mark_outbox_delivered(event_ids):
+    with transaction() as conn:
+        conn.executemany(
+            "UPDATE outbox SET status = 'delivered', delivered_at = ?, last_error = NULL WHERE id = ?",
+            [(now(), event_id) for event_id in event_ids],
+        )
+
+
+def retry_outbox(event_ids, error, delay_seconds, max_attempts):
+    """Schedules failed events for another attempt, or marks them dead once they reach max_attempts."""
+    with transaction() as conn:
+        conn.executemany(
+            "UPDATE outbox SET status = CASE WHEN attempts >= ? THEN 'dead' ELSE 'pending' END, "
+            "next_attempt = ?, last_error = ? WHERE id = ?",
+            [(max_attempts, now(delay_seconds), error, event_id) for event_id in event_ids],
+        )
+
+
+def prune_outbox(before):
+    """Deletes delivered events created before the given timestamp; returns how many went."""
+    with transaction() as conn:
+        return conn.execute("DELETE FROM outbox WHERE status = 'delivered' AND created_at < ?", (before,)).rowcount
+
+
+def outbox_status_counts():
+    """e.g. {'pending': 2, 'delivered': 140, 'dead': 1}"""
+    with connection() as conn:
+        return dict(conn.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall())
+
+
+def outbox_failures(limit=20):
+    """Most recent events whose last delivery attempt failed, newest first."""
+    return _all(
+        "SELECT id, type, status, attempts, next_attempt, last_error FROM outbox "
+        "WHERE last_error IS NOT NULL ORDER BY id DESC LIMIT ?",
+        (limit,),
+    )
+
+
+# --- Photo hashes ---
+def add_photo_hash(photo_ref, phash, dhash, source, owner, subject_id=None):
+    with transaction() as conn:
+        conn.execute(
+            "INSERT INTO photo_hashes (photo_ref, phash, dhash, source, owner, subject_id, at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (photo_ref, phash, dhash, source, owner, subject_id, now()),
+        )
+
+
+def photo_hashes_after(source, after_id=0):
+    """(id, phash, dhash, subject_id) rows from one source stored after after_id, in id order (-1 for no subject)."""
+    with connection() as conn:
+        return conn.execute(
+            "SELECT id, phash, dhash, COALESCE(subject_id, -1) FROM photo_hashes WHERE source = ? AND id > ? ORDER BY id",
+            (source, after_id),
+        ).fetchall()
+
+
+# --- Bins ---
+def get_bin(bin_id):
+    return _one("SELECT * FROM bins WHERE bin_id = ?", (bin_id,))
+
+
+def list_bin_ids(limit=-1, offset=0):
+    with connection() as conn:
+        rows = conn.execute("SELECT bin_id FROM bins ORDER BY bin_id LIMIT ? OFFSET ?", (limit, offset))
+        return [row[0] for row in rows]
+
+
+def count_bins():
+    return _scalar("SELECT COUNT(*) FROM bins")
+
+
+def bins_by_status(status, zone=None, limit=-1, offset=0):
+    """Bins in one status (optionally one zone), straight off the (status, zone, bin_id) index."""
+    if zone is None:
+        return _all(
+            "SELECT * FROM bins WHERE status = ? ORDER BY zone, bin_id LIMIT ? OFFSET ?", (status, limit, offset)
+        )
+    return _all(
+        "SELECT * FROM bins WHERE status = ? AND zone = ? ORDER BY bin_id LIMIT ? OFFSET ?",
+        (status, zone, limit, offset),
+    )
+
+
+def count_bins_by_status(status, zone=None):
+    if zone is None:
+        return _scalar("SELECT COUNT(*) FROM bins WHERE status = ?", (status,))
+    return _scalar("SELECT COUNT(*) FROM bins WHERE status = ? AND zone = ?", (status, zone))
+
+
+def zones_with_status(status):
+    with connection() as conn:
+        rows = conn.execute("SELECT DISTINCT zone FROM bins WHERE status = ? AND zone IS NOT NULL ORDER BY zone", (status,))
+        return [row[0] for row in rows]
+
+
+def existing_bin_ids(bin_ids):
+    """The subset of bin_ids that are registered, in the order given."""
+    bin_ids = list(dict.fromkeys(bin_ids))
+    found = set()
+    with connection() as conn:
+        for i in range(0, len(bin_ids), 500):
+            chunk = bin_ids[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            found.update(row[0] for row in conn.execute(f"SELECT bin_id FROM bins WHERE bin_id IN ({marks})", chunk))
+    return [b for b in bin_ids if b in found]
+
+
+def set_bins_status(bin_ids, status, actor=None):
+    """Updates many bins in one transaction, logging each change; returns the IDs whose status actually changed.
+
+    An overflow report also becomes the bin's reported_by / last_updated snapshot.
+    """
+    changed = []
+    at = now()
+    with transaction() as conn:
+        for bin_id in bin_ids:
+            if status == 'Overflowing':
+                cur = conn.execute(
+                    "UPDATE bins SET status = ?, reported_by = ?, last_updated = ? WHERE bin_id = ? AND status != ?",
+                    (status, actor, at, bin_id, status),
+                )
+            else:
+                cur = conn.execute(
+                    "UPDATE bins SET status = ? WHERE bin_id = ? AND status != ?", (status, bin_id, status)
+                )
+            if cur.rowcount:
+                changed.append(bin_id)
+        conn.executemany(
+            "INSERT INTO bin_events (bin_id, status, actor, at) VALUES (?, ?, ?, ?)",
+            [(bin_id, status, actor, at) for bin_id in changed],
+        )
+        entry = _series_entry(status, at)
+        for bin_id in changed:
+            row = conn.execute("SELECT events FROM bin_series WHERE bin_id = ?", (bin_id,)).fetchone()
+            events = (row[0] if row else b"") + entry
+            conn.execute(
+                "INSERT INTO bin_series (bin_id, events) VALUES (?, ?) ON CONFLICT (bin_id) DO UPDATE SET events = excluded.events",
+                (bin_id, events[-SERIES_MAX_EVENTS * len(entry):]),
+            )
+    return changed
+
+
+def set_bin_status(bin_id, status, actor=None):
+    return bool(set_bins_status([bin_id], status, actor=actor))
+
+
+def bin_history(bin_id, limit=20):
+    """Most recent status changes for a bin, newest first."""
+    return _all("SELECT status, actor, at FROM bin_events WHERE bin_id = ? ORDER BY id DESC LIMIT ?", (bin_id, limit))
+
+
+def bin_series():
+    """(bin_id, packed events) for every bin with any status history; see the bin_series table."""
+    with connection() as conn:
+        cur = conn.cursor()
+        cur.row_factory = None
+        return cur.execute("SELECT bin_id, events FROM bin_series").fetchall()
+
+
+def replace_bin_forecasts(rows, computed_at):
+    """Swaps in a new forecast batch of (bin_id, next_overflow or None, cycles) rows."""
+    with transaction() as conn:
+        conn.execute("DELETE FROM bin_forecasts")
+        conn.executemany(
+            "INSERT INTO bin_forecasts (bin_id, next_overflow, cycles, computed_at) VALUES (?, ?, ?, ?)",
+            ((bin_id, at, cycles, computed_at) for bin_id, at, cycles in rows),
+        )
+        conn.execute(
+            "INSERT INTO job_runs (job, last_at) VALUES ('forecast', ?) "
+            "ON CONFLICT (job) DO UPDATE SET last_at = MAX(last_at, excluded.last_at)",
+            (computed_at,),
+        )
+
+
+def forecast_computed_at():
+    """When the latest forecast batch was made (even one with no rows), or None before the first run."""
+    row = _one("SELECT last_at FROM job_runs WHERE job = 'forecast'")
+    return row["last_at"] if row else None
+
+
+def claim_job(job, max_age):
+    """Records a run of job as starting now unless one started within max_age seconds; True if claimed.
+
+    Atomic across processes, so only one of them starts each run.
+    """
+    at = now()
+    with transaction() as conn:
+        cur = conn.execute(
+            "INSERT INTO job_runs (job, last_at) VALUES (?, ?) "
+            "ON CONFLICT (job) DO UPDATE SET last_at = excluded.last_at WHERE last_at < ?",
+            (job, at, now(-max_age)),
+        )
+        return cur.rowcount == 1
+
+
+def bins_due(until, zone=None, limit=50):
+    """Clean bins forecast to overflow by `until` (including any already overdue), soonest first."""
+    sql = ("SELECT b.*, f.next_overflow, f.cycles FROM bin_forecasts f JOIN bins b ON b.bin_id = f.bin_id "
+           "WHERE f.next_overflow IS NOT NULL AND f.next_overflow <= ? AND b.status = 'Clean'")
+    params = [until]
+    if zone is not None:
+        sql += " AND b.zone = ?"
+        params.append(zone)
+    return _all(sql + " ORDER BY f.next_overflow LIMIT ?", params + [limit])
+
+
+def upsert_bins(rows):
+    """Bulk insert-or-update of (bin_id, location, zone, latitude, longitude, status) rows in one transaction.
+
+    Existing bins keep their current status; status only seeds new bins.
+    """
+    with transaction() as conn:
+        conn.executemany(
+            "INSERT INTO bins (bin_id, location, zone, latitude, longitude, status) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (bin_id) DO UPDATE SET location = excluded.location, zone = excluded.zone, "
+            "latitude = excluded.latitude, longitude = excluded.longitude",
+            rows,
+        )
@@ -0,0 +1,134 @@
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image, ImageOps, features
+
+import store
+import blobstore
+
+# -------------------------
+# Thumbnail / Size-Variant Cache
+# -------------------------
+# Small re-encoded copies of report photos for list views. Each variant is
+# generated once per blob on a thread pool (Pillow releases the GIL while
+# decoding / resizing) and kept in a disk cache that evicts least recently
+# used files once it grows past CACHE_MAX_BYTES.
+
+THUMB_DIR = os.environ.get("ECOMORPHIS_THUMBS", os.path.join(store.DATA_DIR, "thumbs"))
+CACHE_MAX_BYTES = int(os.environ.get("ECOMORPHIS_THUMB_CACHE_MB", "256")) * 1024 * 1024
+WORKERS = int(os.environ.get("ECOMORPHIS_THUMB_WORKERS", str(min(8, (os.cpu_count() or 2)))))
+
+# Longest edge in pixels for each variant
+VARIANTS = {"thumb": 320, "medium": 1024}
+
+if features.check("webp"):
+    FORMAT, EXT, SAVE_ARGS = "WEBP", "webp", {"quality": 80, "method": 4}
+else:
+    FORMAT, EXT, SAVE_ARGS = "JPEG", "jpg", {"quality": 82, "optimize": True}
+
+_executor = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="thumbs")
+_lock = threading.Lock()
+_lru = None  # OrderedDict of path -> size, oldest first
+_lru_bytes = 0
+_inflight = {}
+
+
+def _load_lru():
+    global _lru, _lru_bytes
+    entries = []
+    if os.path.isdir(THUMB_DIR):
+        for entry in os.scandir(THUMB_DIR):
+            if entry.is_file() and not entry.name.startswith(".tmp-"):
+                st_ = entry.stat()
+                entries.append((st_.st_mtime, entry.path, st_.st_size))
+    entries.sort()
+    _lru = OrderedDict((p, size) for _, p, size in entries)
+    _lru_bytes = sum(_lru.values())
+
+
+def _touch(path, size=None):
+    """Marks a cache file as most recently used (and adds it if new). Caller holds _lock."""
+    global _lru_bytes
+    if _lru is None:
+        _load_lru()
+    if path in _lru:
+        _lru.move_to_end(path)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+    elif size is not None:
+        _lru[path] = size
+        _lru_bytes += size
+    while _lru_bytes > CACHE_MAX_BYTES and len(_lru) > 1:
+        old_path, old_size = _lru.popitem(last=False)
+        _lru_bytes -= old_size
+        try:
+            os.remove(old_path)
+        except OSError:
+            pass
+
+
+def variant_path(ref, variant="thumb"):
+    return os.path.join(THUMB_DIR, f"{ref}_{variant}.{EXT}")
+
+
+def _render(ref, variant):
+    target = variant_path(ref, variant)
+    with Image.open(blobstore.path(ref)) as img:
+        img.draft("RGB", (VARIANTS[variant], VARIANTS[variant]))  # cheap JPEG downscale on decode
+        img = ImageOps.exif_transpose(img)
+        img.thumbnail((VARIANTS[variant], VARIANTS[variant]))
+        if img.mode not in ("RGB", "RGBA") or (FORMAT == "JPEG" and img.mode != "RGB"):
+            img = img.convert("RGB")
+        os.makedirs(THUMB_DIR, exist_ok=True)
+        tmp = os.path.join(THUMB_DIR, f".tmp-{threading.get_ident()}-{ref}_{variant}.{EXT}")
+        img.save(tmp, FORMAT, **SAVE_ARGS)
+    os.replace(tmp, target)
+    with _lock:
+        _touch(target, os.path.getsize(target))
+    return target
+
+
+def _submit(ref, variant):
+    """Returns a future for the variant file, sharing work with any request already in flight."""
+    key = (ref, variant)
+    with _lock:
+        future = _inflight.get(key)
+        if future is None:
+            future = _executor.submit(_render, ref, variant)
+            _inflight[key] = future
+            future.add_done_callback(lambda _f: _inflight.pop(key, None))
+    return future
+
+
+def get(ref, variant="thumb"):
+    """Path of a cached size variant, generating it first if needed. None if the photo is missing."""
+    if not blobstore.exists(ref):
+        return None
+    target = variant_path(ref, variant)
+    if os.path.exists(target):
+        with _lock:
+            _touch(target)
+        return target
+    try:
+        return _submit(ref, variant).result()
+    except (OSError, ValueError):
+        # Not a readable image; fall back to the original upload
+        return blobstore.path(ref)
+
+
+def prefetch(refs, variant="thumb"):
+    """Generates variants for a whole page of photos in parallel before rendering it."""
+    futures = [
+        _submit(ref, variant)
+        for ref in set(refs)
+        if blobstore.exists(ref) and not os.path.exists(variant_path(ref, variant))
+    ]
+    for future in futures:
+        try:
+            future.result()
+        except (OSError, ValueError):
+            pass
@@ -0,0 +1,156 @@
+import io
+import os
+from collections import namedtuple
+
+from PIL import ExifTags, Image, ImageOps, UnidentifiedImageError, features
+
+# -------------------------
+# Upload Ingestion
+# -------------------------
+# Every photo a user uploads (report photos, green snaps, bin QR codes) passes
+# through here before anything else reads it. The image is opened straight
+# from the upload's own buffer (Streamlit's UploadedFile is a BytesIO), so the
+# bytes are never copied. Only the header is parsed until the size checks pass.
+# JPEGs are decoded at a reduced scale (1/2, 1/4 or 1/8, done by the JPEG
+# decoder itself), so a 50-MP phone photo never exists at full size in
+# memory. Other formats must fit the pixel budget at full size or are
+# rejected. The result is re-encoded as a WebP of bounded size with the EXIF
+# block dropped; only the GPS position survives, as plain numbers.
+
+MAX_UPLOAD_MB = int(os.environ.get("ECOMORPHIS_MAX_UPLOAD_MB", "25"))
+MAX_DECODE_PIXELS = 24_000_000  # ~72 MB as RGB
+MAX_SIDE = 2048  # longest edge of the stored photo
+MAX_OUTPUT_BYTES = 768 * 1024
+QUALITIES = (80, 65, 50)  # tried in order until the photo fits MAX_OUTPUT_BYTES
+REDUCTIONS = (1, 2, 4, 8)  # scales the JPEG decoder can skip to
+
+if features.check("webp"):
+    FORMAT, SAVE_ARGS = "WEBP", {"method": 4}
+else:
+    FORMAT, SAVE_ARGS = "JPEG", {"optimize": True}
+
+# data: the re-encoded photo (None when not asked for); image: the decoded,
+# upright, size-capped PIL image; gps: (latitude, longitude) from EXIF, or None
+Upload = namedtuple("Upload", "data image gps")
+
+
+class UploadRejected(ValueError):
+    """An upload over the size limits; the message is meant for the user."""
+
+
+def _check_bytes(fileobj):
+    fileobj.seek(0, os.SEEK_END)
+    size = fileobj.tell()
+    fileobj.seek(0)
+    if size > MAX_UPLOAD_MB * 1024 * 1024:
+        raise UploadRejected(f"That file is {size / 2**20:.0f} MB; please upload a photo under {MAX_UPLOAD_MB} MB.")
+
+
+def _too_large(image):
+    width, height = image.size
+    return UploadRejected(
+        f"That photo is too large to process ({width} × {height}). "
+        f"Please upload one under {MAX_DECODE_PIXELS // 1_000_000} megapixels."
+    )
+
+
+def _unreadable():
+    return UploadRejected("That photo couldn't be read; the file may be damaged or incomplete. Please try another one.")
+
+
+def reduction(fileobj, max_pixels=MAX_DECODE_PIXELS):
+    """Smallest decode scale-down (1, 2, 4 or 8) that keeps the image within max_pixels.
+
+    Reads only the header. Raises UploadRejected if no scale is small enough,
+    including any non-JPEG over the limit, and PIL.UnidentifiedImageError for
+    anything that isn't an image.
+    """
+    _check_bytes(fileobj)
+    try:
+        image = Image.open(fileobj)
+    except Image.DecompressionBombError:
+        raise _unreadable() from None
+    with image:
+        width, height = image.size
+        for factor in REDUCTIONS if image.format == "JPEG" else REDUCTIONS[:1]:
+            if -(-width // factor) * -(-height // factor) <= max_pixels:
+                return factor
+        raise _too_large(image)
+
+
+def _rational(value):
+    return float(value[0]) / float(value[1]) if isinstance(value, tuple) else float(value)
+
+
+def gps(exif):
+    """(latitude, longitude) in decimal degrees from a PIL Exif, or None if absent or malformed."""
+    try:
+        info = exif.get_ifd(ExifTags.IFD.GPSInfo)
+        lat = sum(_rational(v) / 60 ** i for i, v in enumerate(info[ExifTags.GPS.GPSLatitude]))
+        lon = sum(_rational(v) / 60 ** i for i, v in enumerate(info[ExifTags.GPS.GPSLongitude]))
+    except (KeyError, TypeError, ValueError, ZeroDivisionError):
+        return None
+    if info.get(ExifTags.GPS.GPSLatitudeRef) == "S":
+        lat = -lat
+    if info.get(ExifTags.GPS.GPSLongitudeRef) == "W":
+        lon = -lon
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180) or (lat == 0 and lon == 0):
+        return None
+    return round(lat, 6), round(lon, 6)
+
+
+def encode(image, max_bytes=MAX_OUTPUT_BYTES):
+    """FORMAT bytes of the image, stepping quality and then size down until they fit max_bytes."""
+    if FORMAT == "JPEG" and image.mode != "RGB":
+        image = image.convert("RGB")
+    icc = image.info.get("icc_profile")
+    qualities = QUALITIES
+    while True:
+        for quality in qualities:
+            out = io.BytesIO()
+            # No exif= argument, so nothing from the original EXIF block is written
+            image.save(out, FORMAT, quality=quality, icc_profile=icc, **SAVE_ARGS)
+            if out.tell() <= max_bytes or max(image.size) <= 256:
+                return out.getvalue()
+            if out.tell() > 2 * max_bytes:
+                break  # lower quality alone won't halve it
+        # Size grows about with pixel count: shrink by the overshoot and retry at the lowest quality
+        scale = min(0.9, 0.95 * (max_bytes / out.tell()) ** 0.5)
+        image = image.resize((max(1, int(image.width * scale)), max(1, int(image.height * scale))), Image.Resampling.LANCZOS)
+        qualities = QUALITIES[-1:]
+
+
+def ingest(fileobj, max_side=MAX_SIDE, encode_photo=True):
+    """Decodes an uploaded photo within the memory limits and returns an Upload.
+
+    Raises UploadRejected when it is over the limits or can't be decoded
+    (truncated or corrupt), and PIL.UnidentifiedImageError when it isn't an
+    image. Pass encode_photo=False when the photo won't be stored (only
+    hashed), to skip the WebP encode.
+    """
+    try:
+        return _ingest(fileobj, max_side, encode_photo)
+    except (UploadRejected, UnidentifiedImageError):
+        raise
+    except (Image.DecompressionBombError, OSError):
+        # Pillow reports truncated and corrupt image data as OSError
+        raise _unreadable() from None
+
+
+def _ingest(fileobj, max_side, encode_photo):
+    _check_bytes(fileobj)
+    # Not closed here: the buffer belongs to the caller, and load() drops the decoder's hold on it
+    image = Image.open(fileobj)
+    position = gps(image.getexif())
+    # JPEG only: the decoder skips to the smallest scale keeping the long edge at 3/4 of max_side or more
+    long_edge = max_side * 3 // 4
+    image.draft("RGB", (long_edge, 1) if image.width >= image.height else (1, long_edge))
+    if image.width * image.height > MAX_DECODE_PIXELS:
+        raise _too_large(image)
+    ImageOps.exif_transpose(image, in_place=True)
+    image.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+    if image.mode not in ("RGB", "RGBA"):
+        has_alpha = image.mode in ("LA", "PA") or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+    image.info = {k: v for k, v in image.info.items() if k == "icc_profile"}
+    return Upload(encode(image) if encode_photo else None, image, position)
@@ -0,0 +1,35 @@
+import importlib
+
+# -------------------------
+# Page Registry
+# -------------------------
+# Each in-app page lives in its own module here and is imported the first time
+# it is opened, so a session only pays for the libraries of the pages it
+# visits (OpenCV, for instance, loads with Scan Bin and nowhere else).
+
+PAGES = {
+    "About Us": ("info", "about_us_page"),
+    "Impact": ("info", "impact_page"),
+    "Contact Us": ("info", "contact_us_page"),
+    "User Details": ("profile", "profile_page"),
+    "Achievements": ("profile", "achievements_page"),
+    "Eco Garden": ("eco_garden", "eco_garden_page"),
+    "Citizen Learning": ("learning", "learning_page"),
+    "Waste Worker Training": ("learning", "waste_worker_training_page"),
+    "Report Waste": ("reports", "complaint_page"),
+    "Verify Reports": ("reports", "verify_reports_page"),
+    "Dashboard": ("dashboard", "dashboard_page"),
+    "Shop": ("shop", "shop_page"),
+    "Facilities": ("facility_search", "facilities_page"),
+    "Penalization": ("shop", "penalization_page"),
+    "Scan Bin": ("bins", "scan_bin_page"),
+    "Metrics": ("admin_metrics", "metrics_page"),
+}
+DEFAULT_PAGE = "User Details"
+
+
+def render(name):
+    """Draws a page by name, importing its module on first use; unknown names get the default page."""
+    module_name, function_name = PAGES.get(name, PAGES[DEFAULT_PAGE])
+    module = importlib.import_module(f"views.{module_name}")
+    getattr(module, function_name)()
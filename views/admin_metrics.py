@@ -0,0 +1,120 @@
+import time
+
+import pandas as pd
+import streamlit as st
+
+import store
+import events
+import metrics
+import reference
+
+# -------------------------
+# Metrics Page (admins only)
+# -------------------------
+# Aggregates the rotating metrics log into latency percentiles per page and per
+# instrumented helper, plus session_state sizes and rerun counts per session.
+# Admins can also hot-reload the shared reference data and check on the
+# notification outbox from here.
+
+WINDOWS = {"Last hour": 3600, "Last 24 hours": 86400, "Last 7 days": 7 * 86400, "Everything logged": None}
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def load_metrics():
+    frames = [pd.read_json(path, lines=True, convert_dates=False) for path in metrics.log_files()]
+    frames = [f for f in frames if not f.empty]
+    if not frames:
+        return pd.DataFrame(columns=["ts", "kind", "name"])
+    return pd.concat(frames, ignore_index=True)
+
+
+def latency_table(df):
+    if df.empty:
+        return df
+    grouped = df.groupby("name")["ms"]
+    table = grouped.quantile([0.5, 0.95, 0.99]).unstack()
+    table.columns = ["p50 ms", "p95 ms", "p99 ms"]
+    table.insert(0, "calls", grouped.size())
+    table["max ms"] = grouped.max()
+    return table.sort_values("p95 ms", ascending=False).round(1)
+
+
+def metrics_page():
+    st.title("📈 Render Metrics")
+    if not metrics.is_admin(st.session_state.current_user["username"]):
+        st.error("This page is only available to administrators.")
+        return
+
+    reference_section()
+    outbox_section()
+
+    window = st.selectbox("Window", list(WINDOWS), index=1)
+    seconds = WINDOWS[window]
+    df = load_metrics()
+    if seconds is not None:
+        df = df[df["ts"] >= time.time() - seconds]
+    st.caption(f"Read from {metrics.METRICS_PATH} (and rotated backups). Refreshes every 30 seconds.")
+    if df.empty:
+        st.info("No metrics recorded in this window yet.")
+        return
+
+    pages = df[df["kind"] == "page"]
+    st.subheader("Page render time")
+    st.dataframe(latency_table(pages).rename(columns={"calls": "renders"}), use_container_width=True)
+
+    if not pages.empty:
+        page = st.selectbox("Trend for page", sorted(pages["name"].unique()))
+        trend = pages[pages["name"] == page].assign(hour=lambda d: pd.to_datetime(d["ts"], unit="s").dt.floor("h"))
+        by_hour = trend.groupby("hour")["ms"].quantile([0.5, 0.95]).unstack()
+        by_hour.columns = ["p50 ms", "p95 ms"]
+        st.line_chart(by_hour)
+
+    st.subheader("Instrumented helpers")
+    st.dataframe(latency_table(df[df["kind"] == "span"]), use_container_width=True)
+
+    sessions = df[(df["kind"] == "session") & (df["name"] == "session_state")]
+    st.subheader("Sessions")
+    if sessions.empty:
+        st.write("No session samples yet.")
+        return
+    # Latest sample per session
+    latest = sessions.sort_values("ts").groupby("session").last()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Sessions", len(latest))
+    col2.metric("Median reruns / session", int(latest["reruns"].median()))
+    col3.metric("p95 session_state", f"{latest['bytes'].quantile(0.95) / 1024:.1f} KB")
+    col4.metric("Largest session_state", f"{latest['bytes'].max() / 1024:.1f} KB")
+    st.write("Largest sessions")
+    largest = latest.nlargest(10, "bytes")[["reruns", "bytes"]].astype(int)
+    largest["last seen"] = pd.to_datetime(latest.loc[largest.index, "ts"], unit="s")
+    st.dataframe(largest, use_container_width=True)
+
+    over_budget = df[(df["kind"] == "session") & (df["name"] == "over_budget")]
+    st.write(f"Sessions over the {metrics.SESSION_BUDGET_BYTES // 1024} KB budget: **{over_budget['session'].nunique()}**")
+    if not over_budget.empty:
+        trimmed = over_budget[["ts", "session", "bytes", "dropped"]].sort_values("ts", ascending=False).head(20)
+        trimmed["ts"] = pd.to_datetime(trimmed["ts"], unit="s")
+        st.dataframe(trimmed, hide_index=True, use_container_width=True)
+
+
+def reference_section():
+    with st.expander("🗂️ Shared reference data"):
+        st.write("Loaded once per process and shared by every session; files are re-read when they change.")
+        st.json({name: list(v) for name, v in reference.current_versions().items()}, expanded=False)
+        if st.button("Reload reference data"):
+            reference.reload()
+            st.success("Every session will pick up a fresh copy on its next rerun.")
+
+
+def outbox_section():
+    with st.expander("📬 Notification outbox"):
+        st.write(f"Delivered in the background to: {', '.join(events.SINK_NAMES) or 'no sinks'}.")
+        counts = store.outbox_status_counts()
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Waiting", counts.get("pending", 0))
+        col2.metric("Delivered", counts.get("delivered", 0))
+        col3.metric("Gave up", counts.get("dead", 0))
+        failures = store.outbox_failures()
+        if failures:
+            st.write("Recent delivery failures")
+            st.dataframe(pd.DataFrame(failures), hide_index=True, use_container_width=True)
@@ -0,0 +1,171 @@
+import pandas as pd
+import streamlit as st
+from PIL import UnidentifiedImageError
+
+import store
+import events
+import metrics
+import qr_assets
+import qr_scan
+import uploads
+
+# -------------------------
+# Bin QR Scanning Page
+# -------------------------
+# The only page that needs OpenCV (via qr_scan) and qrcode (via qr_assets).
+# Uploads are size-checked by uploads.reduction before they are decoded.
+
+
+def decode_qr_from_image(image_file):
+    """Reads an uploaded image file and decodes the first QR code found using OpenCV."""
+    codes = decode_qr_from_images([image_file])
+    return codes[0] if codes else None
+
+def decode_qr_from_images(image_files):
+    """Decodes every QR code in a batch of uploaded images on the scan worker pool."""
+    buffers, reductions = [], []
+    for f in image_files:
+        try:
+            reductions.append(uploads.reduction(f))
+        except UnidentifiedImageError:
+            st.warning(f"{f.name} doesn't look like a photo, so it was skipped.")
+            continue
+        except uploads.UploadRejected as e:
+            st.warning(f"{f.name}: {e}")
+            continue
+        # getbuffer() hands the upload's memory straight to NumPy without copying it
+        buffers.append(f.getbuffer())
+    try:
+        with metrics.timed("qr.decode", images=len(buffers)):
+            results = qr_scan.decode_batch(buffers, reductions)
+        return list(dict.fromkeys(code for codes in results for code in codes))
+    except Exception as e:
+        st.error(f"Error processing image: {e}")
+        return []
+
+QR_GRID_COLS = 6
+
+def sheet_pdf(bin_ids):
+    """The printable label sheet for one page of bins, rendered only when its download is requested."""
+    with metrics.timed("qr.sheet_pdf", bins=len(bin_ids)):
+        return qr_assets.sheet_pdf(bin_ids)
+
+def batch_bin_actions(bin_ids):
+    """Shows every bin found in a batch scan with one action that updates them all."""
+    st.success(f"Successfully scanned **{len(bin_ids)}** bins.")
+    bins = [store.get_bin(b) for b in bin_ids]
+    st.dataframe(pd.DataFrame(bins)[["bin_id", "location", "status", "last_updated"]], hide_index=True, use_container_width=True)
+    username = st.session_state.current_user['username']
+    user_role = st.session_state.current_user['role']
+
+    if user_role == "Citizen":
+        to_report = [b["bin_id"] for b in bins if b["status"] != 'Overflowing']
+        if st.button(f"Report {len(to_report)} bin(s) as Overflowing", disabled=not to_report):
+            with store.transaction():
+                changed = store.set_bins_status(to_report, 'Overflowing', actor=username)
+                if changed:
+                    store.add_points(username, 5 * len(changed), f"Reported {len(changed)} overflowing bins")
+                    events.publish(*[events.BinOverflowing(b["bin_id"], b["location"], b["zone"], username)
+                                     for b in bins if b["bin_id"] in changed])
+            st.success(f"{len(changed)} bins reported as overflowing. Our team has been notified.")
+            st.rerun()
+    elif user_role == "Green Champion":
+        to_clean = [b["bin_id"] for b in bins if b["status"] != 'Clean']
+        if st.button(f"Mark {len(to_clean)} bin(s) as Cleaned", disabled=not to_clean):
+            changed = store.set_bins_status(to_clean, 'Clean', actor=username)
+            st.success(f"Thank you! {len(changed)} bins marked as cleaned.")
+            st.rerun()
+    else:
+        st.warning("This feature is available for Citizens and Green Champions.")
+
+def scan_bin_page():
+    st.title("♻️ Scan Bin QR Code")
+    st.write("Upload QR code images to report overflowing bins or mark them as cleaned. One photo can cover a whole row of bins.")
+    st.markdown("---")
+
+    # Section to generate and display sample QR codes for testing
+    qr_exp = st.expander("Show Sample QR Codes for Testing", key="qr_samples", on_change="rerun")
+    with qr_exp:
+        if qr_exp.open:
+            st.write("Right-click and save these images to your device to test the upload feature.")
+            per_page = QR_GRID_COLS * 2
+            total_pages = max(1, -(-store.count_bins() // per_page))
+            page = st.number_input("Page", min_value=1, max_value=total_pages, value=1, key="qr_page")
+            bin_ids = store.list_bin_ids(limit=per_page, offset=(page - 1) * per_page)
+            qr_cols = st.columns(QR_GRID_COLS)
+            for i, bin_id in enumerate(bin_ids):
+                with qr_cols[i % QR_GRID_COLS]:
+                    st.image(qr_assets.qr_png(bin_id), caption=bin_id, width=150)
+            st.caption(f"Page {page} of {total_pages}. Print a whole ward with `python qr_assets.py labels.pdf --prefix BIN-BH-`.")
+            # Rendered when the button is clicked, not on every rerun while the expander is open
+            st.download_button("🖨️ Download printable sheet (PDF)", data=lambda: sheet_pdf(bin_ids),
+                               file_name=f"bin-qr-page-{page}.pdf", mime="application/pdf", disabled=not bin_ids,
+                               on_click="ignore")
+
+    st.markdown("---")
+
+    # File uploader for the QR code(s)
+    qr_images = st.file_uploader("Upload QR Code Image(s)", type=['png', 'jpg', 'jpeg'], key="qr_uploader", accept_multiple_files=True)
+
+    # This session state variable will hold the scanned bin ID
+    if 'scanned_bin_id' not in st.session_state:
+        st.session_state.scanned_bin_id = None
+
+    # If images are uploaded, decode them all in one batch
+    if qr_images:
+        scanned_ids = store.existing_bin_ids(decode_qr_from_images(qr_images))
+        if len(scanned_ids) > 1:
+            st.session_state.scanned_bin_id = None
+            batch_bin_actions(scanned_ids)
+            return
+        elif scanned_ids:
+            st.session_state.scanned_bin_id = scanned_ids[0]
+            st.success(f"Successfully scanned Bin ID: **{scanned_ids[0]}**")
+        else:
+            st.session_state.scanned_bin_id = None
+            st.error("Could not find a valid Bin QR code in the uploaded image. Please try again.")
+
+    # Display bin details and actions only if a valid bin has been scanned
+    selected_bin_id = st.session_state.scanned_bin_id
+    if selected_bin_id:
+        st.markdown("---")
+        bin_details = store.get_bin(selected_bin_id)
+        st.subheader(f"Bin Details: {selected_bin_id}")
+        st.write(f"**Location:** {bin_details['location']}")
+        
+        status_color = "red" if bin_details['status'] == 'Overflowing' else "green"
+        st.markdown(f"**Current Status:** <span style='color:{status_color}; font-weight:bold;'>{bin_details['status']}</span>", unsafe_allow_html=True)
+
+        if bin_details['status'] == 'Overflowing':
+            st.write(f"**Reported by:** {bin_details['reported_by']} at {bin_details['last_updated']}")
+
+        history = store.bin_history(selected_bin_id, limit=10)
+        if history:
+            with st.expander("🕓 Status History"):
+                st.dataframe(pd.DataFrame(history), hide_index=True, use_container_width=True)
+
+        user_role = st.session_state.current_user['role']
+
+        if user_role == "Citizen":
+            if st.button("Report as Overflowing", disabled=(bin_details['status'] == 'Overflowing')):
+                reporter = st.session_state.current_user['username']
+                with store.transaction():
+                    if store.set_bin_status(selected_bin_id, 'Overflowing', actor=reporter):
+                        store.add_points(reporter, 5, f"Reported overflowing bin {selected_bin_id}")
+                        events.publish(events.BinOverflowing(selected_bin_id, bin_details['location'], bin_details['zone'], reporter))
+                st.success(f"Bin {selected_bin_id} has been reported as overflowing. Our team has been notified.")
+                # Reset after action
+                st.session_state.scanned_bin_id = None
+                st.rerun()
+        
+        elif user_role == "Green Champion":
+            if st.button("Mark as Cleaned", disabled=(bin_details['status'] == 'Clean')):
+                store.set_bin_status(selected_bin_id, 'Clean', actor=st.session_state.current_user['username'])
+                st.success(f"Thank you! Bin {selected_bin_id} has been marked as cleaned.")
+                # Reset after action
+                st.session_state.scanned_bin_id = None
+                st.rerun()
+        else:
+            st.warning("This feature is available for Citizens and Green Champions.")
+    else:
+        st.info("Upload an image containing a Bin QR code to see details and perform actions.")
@@ -0,0 +1,318 @@
+import pandas as pd
+import pydeck as pdk
+import streamlit as st
+
+import store
+import events
+import geocode
+import metrics
+import routing
+import forecast
+import analytics
+import reference
+import bulk
+from views.reports import review_queue
+
+# -------------------------
+# Green Champion Dashboard
+# -------------------------
+# Complaint metrics come from the store's running counters; bins are paged per zone.
+# Trend charts read the hourly / daily rollups, never the raw complaints.
+# Hotspots sum the per-cell daily rollups of geocoded reports into coarser geohash cells.
+# Overflowing bins can be ordered into a collection route from the depot (routing.py);
+# forecast.py flags clean bins likely to overflow soon. Bulk import / export goes through bulk.py.
+
+
+BIN_PAGE_SIZE = 10
+TREND_WINDOWS = {"Last 48 hours (hourly)": ("hour", 48), "Last 30 days (daily)": ("day", 30)}
+TREND_TOP = 10
+HOTSPOT_PRECISION = 6  # ~1.2 x 0.6 km cells
+HOTSPOT_CELLS = 5000  # busiest fine cells read per refresh
+EXPORT_MAX_ROWS = 200_000  # largest table the in-app download offers; it is held in memory while served
+
+
+# Top-N over 30 days sums every landmark's daily rows, so it is shared for a minute
+@st.cache_data(ttl=60, show_spinner=False)
+def top_over_month(events, dimension, limit=TREND_TOP):
+    return analytics.leaders(events, dimension, limit=limit)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def zone_overflows(limit=TREND_TOP):
+    return analytics.breakdown("bin_overflowing", "zone", "day", 30, top=limit)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def hotspots_over_month(precision=HOTSPOT_PRECISION):
+    since = analytics.window("day", 30)[0].strftime("%Y-%m-%d")
+    cells = [tuple(row) for row in store.rollup_totals(["reported"], "geohash", since, limit=HOTSPOT_CELLS)]
+    return geocode.hotspots(cells, precision)
+
+
+# Keyed on the stops themselves, so cleaning or reporting a bin plans a fresh route
+@st.cache_data(ttl=600, show_spinner="Planning route...")
+def collection_route(stops):
+    bin_ids, lats, lons = zip(*stops)
+    order, legs, stats = routing.plan_route(lats, lons)
+    return [bin_ids[i] for i in order], legs, stats
+
+
+def resolve_reports(reports):
+    champion = st.session_state.current_user["username"]
+    with store.transaction():
+        changed = set(store.set_complaints_status([r["id"] for r in reports], "Resolved", from_status="Verified", resolved_by=champion))
+        # Reward the original reporters and the resolver
+        store.add_points_many(
+            [(r["user"], 10, f"Report #{r['id']} resolved", f"resolve-reporter:{r['id']}") for r in reports if r["id"] in changed]
+            + [(champion, 5, f"Resolved report #{i}", f"resolve-champion:{i}") for i in changed]
+        )
+        events.publish(*[events.ComplaintResolved(r["id"], r["user"], r["location"], champion) for r in reports if r["id"] in changed])
+    return f"{len(changed)} reports resolved! 10 points to each reporter, {5 * len(changed)} points to you."
+
+
+def dashboard_page():
+    st.title("📊 Dashboard - Operations Overview")
+    if st.session_state.current_user["role"] != "Green Champion":
+        st.warning("⚠️ Only Green Champions can view the dashboard.")
+        return
+    
+    # Complaints Section
+    st.subheader("📋 Community Reports Status")
+    counts = store.complaint_status_counts()
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Pending Verification", counts.get('Pending', 0))
+    col2.metric("Pending Resolution", counts.get('Verified', 0))
+    col3.metric("Total Resolved", counts.get('Resolved', 0))
+
+    with metrics.timed("dashboard.trends"):
+        trends_section()
+    
+    st.write("---")
+    st.subheader("Verified Reports Pending Resolution")
+    review_queue('Verified', "resolve", {"✅ Mark selected as Resolved": resolve_reports},
+                 "No verified reports are awaiting resolution.")
+
+    st.markdown("---") 
+
+    # Overflowing Bins Section
+    st.subheader("🗑️ Overflowing Bins Report")
+    total_overflowing = store.count_bins_by_status('Overflowing')
+    
+    if not total_overflowing:
+        st.info("✅ All bins are currently clean.")
+    else:
+        st.warning(f"Action needed! There are {total_overflowing} overflowing bins reported.")
+        f_col1, f_col2 = st.columns([2, 1])
+        with f_col1:
+            zone = st.selectbox("Zone", ["All zones"] + store.zones_with_status('Overflowing'), key="overflow_zone")
+        zone = None if zone == "All zones" else zone
+        zone_total = store.count_bins_by_status('Overflowing', zone=zone)
+        total_pages = max(1, -(-zone_total // BIN_PAGE_SIZE))
+        with f_col2:
+            page = st.number_input(f"Page (of {total_pages})", min_value=1, max_value=total_pages, value=1, key="overflow_page")
+        if st.toggle("🚛 Plan collection route" + (f" for {zone}" if zone else ""), key="route_plan"):
+            route_section(zone)
+        overflowing_bins = store.bins_by_status('Overflowing', zone=zone, limit=BIN_PAGE_SIZE, offset=(page - 1) * BIN_PAGE_SIZE)
+        for details in overflowing_bins:
+            bin_id = details['bin_id']
+            with st.container(border=True): 
+                st.markdown(f"**Bin ID:** `{bin_id}`")
+                st.markdown(f"**Location:** {details['location']}" + (f" ({details['zone']})" if details['zone'] else ""))
+                st.markdown(f"**Reported by:** {details['reported_by']} on {details['last_updated']}")
+                if st.button("Mark as Cleaned", key=f"clean_{bin_id}"):
+                    store.set_bin_status(bin_id, 'Clean', actor=st.session_state.current_user["username"])
+                    st.success(f"Bin {bin_id} marked as cleaned.")
+                    st.rerun()
+
+    forecast_section()
+
+    # Anyone can sign up as a Green Champion, so importing and exporting are kept to admins
+    # (or `python bulk.py import / export`)
+    if metrics.is_admin(st.session_state.current_user["username"]):
+        import_section()
+        export_section()
+
+
+def export_section():
+    """Downloads a table as CSV / Parquet, up to EXPORT_MAX_ROWS; bigger tables go through `python bulk.py export`."""
+    with st.expander("📤 Export"):
+        e_col1, e_col2 = st.columns(2)
+        with e_col1:
+            kind = st.selectbox("Table", sorted(bulk.EXPORTS), key="export_kind")
+        with e_col2:
+            fmt = st.selectbox("Format", ["csv", "parquet"], key="export_format")
+        # Streamlit serves a download from memory, so only tables that fit comfortably are offered here
+        if store.max_id(bulk.EXPORTS[kind][0]) > EXPORT_MAX_ROWS:
+            st.info(f"{kind} has more than {EXPORT_MAX_ROWS:,} rows, too many to download here. "
+                    f"Export it on the server with `python bulk.py export {kind} {kind}.{fmt}`.")
+            return
+        # Exported when the button is clicked
+        st.download_button(
+            f"Download {kind}.{fmt}", data=lambda: export_bytes(kind, fmt),
+            file_name=f"{kind}.{fmt}", mime="text/csv" if fmt == "csv" else "application/octet-stream",
+            on_click="ignore",
+        )
+
+
+def import_section():
+    """Imports a CSV / Parquet file of users, bins, complaints or facilities through bulk.py."""
+    with st.expander("📥 Bulk Import"):
+        kind = st.selectbox("Records", sorted(bulk.IMPORTERS), key="import_kind")
+        importer = bulk.IMPORTERS[kind]
+        st.caption("Columns: " + ", ".join(importer.required)
+                   + (" and optionally " + ", ".join(importer.optional) if importer.optional else "") + ". "
+                   + {"facilities": "The file replaces the facility inventory.",
+                      "users": "Usernames that already exist are rejected, never overwritten."}.get(kind, "Existing records are updated in place."))
+        upload = st.file_uploader("CSV or Parquet file", type=["csv", "parquet"], key="import_file")
+        if upload and st.button("Import"):
+            try:
+                with st.spinner("Importing..."):
+                    imported, errors = bulk.import_file(kind, upload)
+            except ValueError as e:
+                st.error(str(e))
+            else:
+                st.success(f"Imported {imported} {kind}.")
+                if errors:
+                    st.warning(f"{len(errors)} rows were rejected.")
+                    st.dataframe(pd.DataFrame(errors[:1000], columns=["line", importer.key, "reason"]), hide_index=True)
+
+
+def export_bytes(kind, fmt):
+    """Streamlit serves downloads from memory, so the finished export (at most EXPORT_MAX_ROWS rows) is read back whole."""
+    with open(bulk.export_file(kind, fmt), "rb") as f:
+        return f.read()
+
+
+def trend_chart(frame, mark="line"):
+    """Buckets x series frame as a Vega-Lite chart (a plain spec skips st.line_chart's slow Altair path)."""
+    data = frame.rename_axis("bucket").reset_index().melt("bucket", var_name="series", value_name="count")
+    st.vega_lite_chart(data, {
+        "mark": {"type": mark, "tooltip": True},
+        "encoding": {
+            "x": {"field": "bucket", "type": "temporal", "title": None},
+            "y": {"field": "count", "type": "quantitative", "title": None},
+            "color": {"field": "series", "type": "nominal", "title": None},
+        },
+    }, use_container_width=True)
+
+
+def ranking_chart(frame):
+    """Horizontal bars for a name x series frame, busiest name first."""
+    if isinstance(frame, pd.Series):
+        frame = frame.to_frame()
+    data = frame.rename_axis("name").reset_index().melt("name", var_name="series", value_name="count")
+    st.vega_lite_chart(data, {
+        "mark": {"type": "bar", "tooltip": True},
+        "encoding": {
+            "y": {"field": "name", "type": "nominal", "sort": "-x", "title": None},
+            "x": {"field": "count", "type": "quantitative", "title": None},
+            "color": {"field": "series", "type": "nominal", "title": None},
+        },
+    }, use_container_width=True)
+
+
+def trends_section():
+    st.subheader("📈 Trends")
+    window = st.radio("Window", list(TREND_WINDOWS), horizontal=True, key="trend_window")
+    grain, periods = TREND_WINDOWS[window]
+
+    st.write("Reports reported, verified and resolved")
+    trend_chart(analytics.timeline(["reported", "verified", "resolved"], grain, periods))
+
+    tab_waste, tab_places, tab_hotspots, tab_champions, tab_bins = st.tabs(
+        ["By waste type", "By landmark", "Hotspots", "By champion", "Bins"])
+    with tab_waste:
+        trend_chart(analytics.breakdown("reported", "waste_type", grain, periods), mark="bar")
+    # Landmarks, champions and zones are rolled up per day only
+    with tab_places:
+        st.caption(f"Top {TREND_TOP} landmarks by reports, last 30 days")
+        ranking_chart(top_over_month(("reported",), "location"))
+    with tab_hotspots:
+        hotspots_section()
+    with tab_champions:
+        st.caption("Reports verified and resolved per champion, last 30 days")
+        verified = top_over_month(("verified",), "champion")
+        resolved = top_over_month(("resolved",), "champion")
+        ranking_chart(pd.DataFrame({"verified": verified, "resolved": resolved}).fillna(0).astype(int))
+    with tab_bins:
+        st.write("Overflow reports and cleanups")
+        trend_chart(analytics.timeline(["bin_overflowing", "bin_clean"], grain, periods))
+        st.caption("Overflow reports per zone, last 30 days")
+        trend_chart(zone_overflows(), mark="bar")
+
+
+def hotspots_section():
+    spots = hotspots_over_month()
+    if spots.empty:
+        st.info("No geocoded reports in the last 30 days.")
+        return
+    st.caption("Geocoded reports per area, last 30 days")
+    # Dot size grows with the square root of the count so one busy cell doesn't swamp the map
+    spots = spots.assign(size=40 + 60 * spots["reports"] ** 0.5)
+    st.map(spots, latitude="latitude", longitude="longitude", size="size")
+    gazetteer = reference.gazetteer()
+    top = spots.head(TREND_TOP)
+    near = [gazetteer.nearest(lat, lon) for lat, lon in zip(top["latitude"], top["longitude"])]
+    st.dataframe(pd.DataFrame({
+        "Near": [p["name"] if p else "" for p in near],
+        "Ward": [p["ward"] if p else "" for p in near],
+        "Reports": top["reports"],
+    }), hide_index=True)
+
+
+def route_section(zone):
+    bins = {b["bin_id"]: b for b in store.bins_by_status('Overflowing', zone=zone)}
+    stops = tuple((b["bin_id"], b["latitude"], b["longitude"]) for b in bins.values() if b["latitude"] is not None)
+    if len(stops) < len(bins):
+        st.caption(f"{len(bins) - len(stops)} bins have no coordinates and are left off the route.")
+    if not stops:
+        return
+    order, legs, stats = collection_route(stops)
+    col1, col2 = st.columns(2)
+    col1.metric("Route length", f"{stats['optimized_km']:.1f} km",
+                delta=f"{stats['optimized_km'] - stats['greedy_km']:.1f} km vs. nearest-first", delta_color="inverse")
+    col2.metric("Stops", stats["stops"])
+
+    depot = {"bin_id": "Depot", "location": "Depot", "latitude": routing.DEPOT[0], "longitude": routing.DEPOT[1]}
+    path = [depot] + [bins[b] for b in order] + [depot]
+    st.pydeck_chart(pdk.Deck(
+        map_style=None,
+        initial_view_state=pdk.ViewState(
+            latitude=sum(p["latitude"] for p in path) / len(path),
+            longitude=sum(p["longitude"] for p in path) / len(path), zoom=11),
+        layers=[
+            pdk.Layer("PathLayer", [{"path": [[p["longitude"], p["latitude"]] for p in path]}],
+                      get_path="path", get_color=[46, 125, 50], width_min_pixels=3),
+            pdk.Layer("ScatterplotLayer",
+                      [{"name": p["bin_id"], "lon": p["longitude"], "lat": p["latitude"]} for p in path[:-1]],
+                      get_position=["lon", "lat"], get_fill_color=[211, 47, 47], radius_min_pixels=4, pickable=True),
+        ],
+        tooltip={"text": "{name}"},
+    ))
+    st.dataframe(pd.DataFrame({
+        "Stop": range(1, len(order) + 2),
+        "Bin ID": list(order) + ["Depot"],
+        "Location": [bins[b]["location"] for b in order] + ["Back to depot"],
+        "Leg km": legs.round(2),
+    }), hide_index=True)
+
+
+def forecast_section():
+    st.subheader(f"🔮 Likely to Overflow in the Next {forecast.DUE_HOURS} Hours")
+    # Recomputed hourly on a background thread (or by `python forecast.py` from cron), never during the render
+    forecast.start()
+    if store.forecast_computed_at() is None:
+        st.info("The first forecast is still being computed.")
+        return
+    due = forecast.due()
+    if not due:
+        st.info("No clean bins are expected to overflow soon.")
+        return
+    st.caption("Forecast from each bin's past fill cycles and the fleet's busy hours. Overdue bins are listed first.")
+    st.dataframe(pd.DataFrame({
+        "Bin ID": [b["bin_id"] for b in due],
+        "Location": [b["location"] for b in due],
+        "Zone": [b["zone"] or "" for b in due],
+        "Expected by": [b["next_overflow"][:16] for b in due],
+        "Cycles seen": [b["cycles"] for b in due],
+    }), hide_index=True)
@@ -0,0 +1,94 @@
+import datetime
+
+import streamlit as st
+from PIL import UnidentifiedImageError
+
+import store
+import metrics
+import garden
+import uploads
+import photohash
+
+# -------------------------
+# Eco Garden Page
+# -------------------------
+# The forest itself is composited and cached by garden.py. Green snaps are
+# checked against earlier ones so a photo can only earn a point once.
+
+
+def eco_garden_page():
+    st.title("🌳 Your Eco Garden")
+    st.markdown("---")
+    st.info("Earn points by performing daily green acts and watch your garden grow!")
+
+    username = st.session_state.current_user["username"]
+    user_data = store.get_user(username)
+
+    # --- Daily Green Snap Section ---
+    st.subheader("📸 Daily Green Snap")
+    
+    today = datetime.date.today().isoformat()
+    last_snap = user_data.get("last_green_snap")
+
+    if last_snap == today:
+        st.success("You've already earned your point for today! Come back tomorrow.")
+    else:
+        st.write("Upload a photo of your eco-friendly action for today (e.g., using a compost bin, correct waste segregation) to earn **1 Eco-Point**.")
+        uploaded_photo = st.file_uploader("Upload your green snap!", type=['jpg', 'png', 'jpeg'])
+        if uploaded_photo is not None:
+            try:
+                # Snaps are only hashed, never stored, so there's nothing to re-encode
+                with metrics.timed("uploads.ingest", source="green_snap"):
+                    upload = uploads.ingest(uploaded_photo, encode_photo=False)
+                ph, dh = photohash.image_hashes(upload.image)
+            except UnidentifiedImageError:
+                st.error("That file doesn't look like a photo. Please upload a JPG or PNG image.")
+            except uploads.UploadRejected as e:
+                st.error(str(e))
+            else:
+                # The shared index is caught up outside the write lock; under it, only snaps
+                # stored since are re-checked, so of two uploads of the same snap at once,
+                # the second sees the first's hash
+                with metrics.timed("photohash.check", source="green_snap"):
+                    reused, seen = photohash.lookup(ph, dh, "green_snap")
+                with store.transaction():
+                    if not reused:
+                        reused = photohash.find_duplicates(ph, dh, "green_snap", after_id=seen)
+                    if not reused:
+                        store.add_points(username, 1, "Daily green snap", key=f"green-snap:{username}:{today}")
+                        store.set_last_green_snap(username, today)
+                        photohash.register(None, ph, dh, "green_snap", username)
+                if reused:
+                    # Each snap earns once, whoever sent it first
+                    st.error("This photo (or one very like it) has already earned a green snap point. Snap today's green act to earn yours!")
+                else:
+                    st.success("Great job! You've earned 1 Eco-Point. Your garden is growing!")
+                    st.balloons()
+                    st.rerun()
+            
+    st.markdown("---")
+
+    # --- Garden Visualization Section ---
+    st.subheader("Your Digital Forest")
+    
+    total_points = user_data["points"]
+    grown_trees = total_points // 10
+    current_plant_points = total_points % 10
+
+    # The whole forest is composited server-side into one cached image
+    if grown_trees == 0 and current_plant_points == 0:
+        st.markdown("<div class='garden-container'><p style='color: white; text-align: center; padding-top: 100px;'>Your garden is bare. Earn your first point to plant a seed!</p></div>", unsafe_allow_html=True)
+    else:
+        with metrics.timed("garden.render"):
+            image = garden.render(username, total_points)
+        st.image(image, use_container_width=True)
+        per_sprite = garden.trees_per_sprite(total_points)
+        if per_sprite > 1:
+            st.caption(f"Your forest is too big to draw tree by tree: each tree shown stands for up to {per_sprite} of yours.")
+
+    # Progress towards the next tree
+    st.subheader("Next Tree Progress")
+    if grown_trees < 100: # Some arbitrary limit
+        st.progress(current_plant_points / 10)
+        st.write(f"You have **{grown_trees}** mature trees in your garden.")
+        st.write(f"Your current plant needs **{10 - current_plant_points}** more points to become a full tree!")
@@ -0,0 +1,45 @@
+import streamlit as st
+
+import reference
+
+# -------------------------
+# Facility Finder Page
+# -------------------------
+# The facility index is shared reference data (see reference.py).
+
+
+def facilities_page():
+    st.title("🏭 ULB Waste Facility Map")
+    st.write("Explore nearby waste management facilities in your city.")
+    index = reference.facility_index()
+    df = index.df
+    facility_types = df['Type'].unique().tolist()
+    waste_types = df['Waste_Type'].unique().tolist()
+
+    st.subheader("📍 Nearest Facilities")
+    n_col1, n_col2, n_col3, n_col4 = st.columns([1, 1, 1.5, 1])
+    with n_col1:
+        lat = st.number_input("Your Latitude", min_value=-90.0, max_value=90.0, value=float(df['Latitude'].median()), format="%.5f")
+    with n_col2:
+        lon = st.number_input("Your Longitude", min_value=-180.0, max_value=180.0, value=float(df['Longitude'].median()), format="%.5f")
+    with n_col3:
+        waste = st.selectbox("Accepts Waste Type", ["Any"] + waste_types)
+    with n_col4:
+        count = st.number_input("How many", min_value=1, max_value=50, value=5)
+    nearest = index.nearest(lat, lon, n=count, waste_type=None if waste == "Any" else waste)
+    if nearest.empty:
+        st.info("No facility accepts that waste type yet.")
+    else:
+        st.dataframe(nearest[["Name", "Type", "Waste_Type", "Distance_km"]], hide_index=True, use_container_width=True)
+
+    st.write("---")
+    st.subheader("🗺️ All Facilities")
+    selected_type = st.multiselect("Select Facility Type:", facility_types, default=facility_types)
+    selected_waste = st.multiselect("Select Waste Type:", waste_types, default=waste_types)
+    filtered_df = df[df['Type'].isin(selected_type) & df['Waste_Type'].isin(selected_waste)]
+    if filtered_df.empty:
+        st.warning("No facilities match your selection.")
+        return
+    st.map(filtered_df.rename(columns={"Latitude": "lat", "Longitude": "lon"}), latitude="lat", longitude="lon")
+    st.subheader("Facility Details")
+    st.dataframe(filtered_df[["Name", "Type", "Waste_Type"]], hide_index=True, use_container_width=True)
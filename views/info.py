@@ -0,0 +1,117 @@
+import streamlit as st
+
+import assets
+
+# -------------------------
+# About, Impact & Contact Pages
+# -------------------------
+# Static content pages; no heavy imports so they render straight after login.
+
+
+def about_us_page():
+    st.title("About Ecomorphis 🌱")
+    st.markdown("---")
+    st.markdown("### *Our mission is to revolutionize waste management in India by fostering a culture of responsibility, enabled by technology and driven by community action.*")
+    st.markdown("---")
+
+    st.subheader("The Challenge We Face")
+    st.markdown("""
+    India faces a monumental waste management crisis. With over **1.7 lakh tonnes** of municipal solid waste generated daily, **less than 54%** is properly treated. 
+    The rest ends up in overflowing landfills or pollutes our environment, posing severe risks to public health and our ecosystems. 
+    At Ecomorphis, we believe this is not just a civic problem, but a collective responsibility that requires a modern, systemic solution.
+    """)
+
+    st.subheader("Our Approach: A Four-Pillar Strategy")
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("""
+        #### 🎓 Education & Empowerment
+        We start at the source. Our platform provides **mandatory, accessible training modules** for every citizen, teaching effective waste segregation, home composting, and sustainable practices. An educated citizen is our first line of defense against waste mismanagement.
+        """)
+        st.markdown("""
+        #### 🤝 Community & Accountability
+        Change is a collective effort. We empower local **"Green Champions"** to monitor their areas and enable citizens to become the eyes and ears of the city. Our **"See Waste, Send Photo"** feature allows for geo-tagged reporting of illegal dumping, fostering a culture of accountability.
+        """)
+    
+    with col2:
+        st.markdown("""
+        #### 💡 Technology & Transparency
+        Ecomorphis is a **fully digital, transparent ecosystem**. From tracking waste collection vehicles to locating the nearest recycling facility or scrap shop, our app brings the entire waste management chain to your fingertips, eliminating leakages and inefficiencies.
+        """)
+        st.markdown("""
+        #### 🏆 Incentivization & Gamification
+        We believe in positive reinforcement. Our **Eco-Points system** rewards citizens for responsible behavior like timely reporting and proper segregation. This gamified approach, combined with a fair **penalization system**, encourages consistent participation and lasting behavioral change.
+        """)
+
+    st.subheader("Our Vision for Tomorrow")
+    st.success("""
+    We envision a future where every street is clean, every landfill is shrinking, and every citizen is an active participant in building a sustainable India. Ecomorphis is more than an app; it's a movement towards a cleaner, healthier, and more responsible tomorrow.
+    """)
+    
+    st.markdown("---")
+    st.markdown("#### Join us in transforming our nation, one piece of segregated waste at a time.")
+    
+def contact_us_page():
+    st.title("Contact Us 📧")
+    st.write("Have questions or feedback? Reach out to us!")
+    st.write("Email: contact@ecomorphis.org")
+
+def impact_page():
+    st.title("🌍 Our Projected Impact")
+    st.markdown("---")
+    st.markdown("#### Transforming India's waste landscape through data-driven action and community engagement. Here's a look at the future we're building.")
+
+    st.subheader("Key Performance Indicators (Projected - Year 1 in Bhopal)")
+    col1, col2, col3 = st.columns(3)
+    col1.metric(label="Citizen Engagement", value="50,000+ Active Users", delta="Rapid Adoption")
+    col2.metric(label="Complaints Resolved", value="15,000+", delta="95% Resolution Rate")
+    col3.metric(label="Waste Segregation Rate", value="75%", delta="21% Improvement from baseline")
+
+    st.markdown("---")
+
+    st.subheader("♻️ Environmental Impact")
+    p1, p2 = st.columns(2)
+    with p1:
+        st.markdown("##### Landfill Diversion (Projected)")
+        st.write("Our primary goal is to drastically reduce the burden on our city's landfills by improving segregation and processing.")
+        st.info("Projected **60,000+ tonnes** of waste diverted from landfills annually.")
+        
+        st.markdown("##### Waste Treatment Efficiency")
+        st.write("From a national average of 54% to a projected 75% in the first year of implementation.")
+        st.progress(75)
+
+    with p2:
+        st.markdown("##### Reduction in CO2 Emissions")
+        st.write("Recycling and composting significantly reduce greenhouse gas emissions compared to landfilling.")
+        st.info("Equivalent to **~60,000 tonnes** of CO2 emissions saved annually.")
+        
+        st.markdown("##### Cleaner Public Spaces")
+        st.write("Reduced illegal dumping through active community reporting and quick ULB response.")
+        st.info("Targeting an **80% reduction** in open waste piles in monitored areas.")
+
+    st.markdown("---")
+    
+    st.subheader("👥 Social & Community Impact")
+    s1, s2 = st.columns(2)
+    with s1:
+        st.markdown("##### Mandatory Citizen Training")
+        st.info("Over **100,000+** training modules completed, creating a more informed and responsible citizenry.")
+    with s2:
+        st.markdown("##### Empowered Green Champions")
+        st.info("**500+** trained Green Champions actively monitoring and improving their local communities.")
+
+    st.markdown("---")
+
+    st.subheader("🌟 Featured Heroes & Testimonials")
+    h1, h2 = st.columns(2)
+    with h1:
+        st.image(assets.url("testimonial-rohan", width=960), caption="Rohan S. - Citizen, Kolar Road", use_container_width=True)
+        st.info(
+            '"Using the Ecomorphis app has completely changed how my family handles waste. The learning modules were so easy. Reporting a garbage pile and seeing it get cleaned within a day was amazing! I feel like I\'m actually making a difference."'
+        )
+    with h2:
+        st.image(assets.url("testimonial-anjali", width=960), caption="Anjali P. - Green Champion, Arera Colony", use_container_width=True)
+        st.info(
+            '"As a Green Champion, the dashboard is my most powerful tool. I can see real-time data on complaints in my area and coordinate with ULB workers. The penalization system has already improved segregation compliance on my street. It\'s about accountability."'
+        )
@@ -0,0 +1,173 @@
+import streamlit as st
+
+import store
+import assets
+import reference
+
+# -------------------------
+# Learning Pages
+# -------------------------
+# Each module and quiz awards its points under a per-user ledger key, and
+# progress is read back from those keys, so it survives a re-login.
+
+STEPS = ("m1", "m2", "quiz")
+
+
+def _progress(track, username):
+    """{step: completed} for one learning track ("citizen" or "worker"), from the user's ledger keys."""
+    keys = {step: f"{track}-{step}:{username}" for step in STEPS}
+    done = store.applied_keys(keys.values())
+    return {step: key in done for step, key in keys.items()}
+
+
+def waste_worker_training_page():
+    st.title("🛠️ Waste Worker Training")
+    st.info("Essential training for our on-ground heroes. Complete modules to earn points and badges!")
+
+    username = st.session_state.current_user["username"]
+    progress = _progress("worker", username)
+
+    m1_completed = progress["m1"]
+    m2_completed = progress["m2"]
+    quiz_completed = progress["quiz"]
+
+    tab1, tab2, tab3 = st.tabs(["Module 1: Safety First (PPE)", "Module 2: Handling Hazardous Waste", "Safety Quiz"])
+
+    with tab1:
+        st.subheader("Module 1: Personal Protective Equipment (PPE)")
+        st.write("Your safety is our priority. Always use the correct PPE on the job.")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.image(assets.url("training-gloves", width=480), caption="Heavy-Duty Gloves", use_container_width=True)
+        with col2:
+            st.image(assets.url("training-n95", width=480), caption="N95 Masks", use_container_width=True)
+        with col3:
+            st.image(assets.url("training-boots", width=480), caption="Steel-Toed Boots", use_container_width=True)
+        
+        if m1_completed:
+            st.success("Module 1 Completed! You earned 15 points.")
+        else:
+            if st.button("Mark Module 1 as Complete"):
+                if store.add_points(username, 15, "Worker training: Module 1", key=f"worker-m1:{username}"):
+                    st.success("Great job! 15 points awarded.")
+                    st.balloons()
+                    st.rerun()
+                else:
+                    st.info("You have already completed this module, so no points were added.")
+
+    with tab2:
+        st.subheader("Module 2: Identifying & Handling Hazardous Waste")
+        st.warning("Never handle these items with bare hands. Follow special disposal protocols.")
+        st.markdown("""
+        - **Batteries & E-Waste:** Contain heavy metals.
+        - **Medical Waste:** Syringes, bandages can be infectious.
+        - **Chemicals & Paint Cans:** Can be corrosive or flammable.
+        """)
+        if m2_completed:
+            st.success("Module 2 Completed! You earned 15 points.")
+        else:
+            if st.button("Mark Module 2 as Complete"):
+                if store.add_points(username, 15, "Worker training: Module 2", key=f"worker-m2:{username}"):
+                    st.success("Excellent work! 15 points awarded.")
+                    st.balloons()
+                    st.rerun()
+                else:
+                    st.info("You have already completed this module, so no points were added.")
+
+    with tab3:
+        st.subheader("Final Safety Quiz")
+        if not (m1_completed and m2_completed):
+            st.warning("Please complete Module 1 and Module 2 to unlock the quiz.")
+        elif quiz_completed:
+            st.success("You have already completed the quiz! Well done.")
+        else:
+            st.write("Test your knowledge to earn bonus points!")
+            quiz = reference.quizzes()["worker"]
+            with st.form("worker_quiz"):
+                answers = [st.radio(q["question"], q["options"]) for q in quiz["questions"]]
+                
+                submitted = st.form_submit_button("Submit Quiz")
+                if submitted:
+                    score = sum(a == q["answer"] for a, q in zip(answers, quiz["questions"]))
+                    points_earned = score * quiz["points_per_answer"]
+                    if store.add_points(username, points_earned, "Worker safety quiz", key=f"worker-quiz:{username}"):
+                        st.success(f"Quiz submitted! You scored {score}/{len(answers)} and earned {points_earned} points!")
+                        st.balloons()
+                        st.rerun()
+                    else:
+                        st.info("You have already taken this quiz, so no points were added.")
+
+def learning_page():
+    st.title("📚 Citizen Learning Hub")
+    st.info("Become a Waste Wise Citizen! Complete modules to earn points and make a difference.")
+
+    username = st.session_state.current_user["username"]
+    progress = _progress("citizen", username)
+
+    m1_completed = progress["m1"]
+    m2_completed = progress["m2"]
+    quiz_completed = progress["quiz"]
+
+    tab1, tab2, tab3 = st.tabs(["Module 1: The Three Bins ♻️", "Module 2: Home Composting 🌱", "Final Quiz 🧠"])
+
+    with tab1:
+        st.subheader("Mastering Waste Segregation")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.success("#### 🟢 Green Bin\nFor Wet/Organic Waste like vegetable peels, leftover food, and garden waste.")
+        with col2:
+            st.info("#### 🔵 Blue Bin\nFor Dry/Recyclable Waste like paper, plastic bottles, and metal cans.")
+        with col3:
+            st.error("#### 🔴 Red Bin\nFor Domestic Hazardous Waste like batteries, e-waste, and expired medicines.")
+
+        if m1_completed:
+            st.success("Module 1 Completed! You earned 10 points.")
+        else:
+            if st.button("I understand the Three Bins!"):
+                if store.add_points(username, 10, "Citizen learning: Module 1", key=f"citizen-m1:{username}"):
+                    st.success("Awesome! 10 points have been added to your account.")
+                    st.balloons()
+                    st.rerun()
+                else:
+                    st.info("You have already completed this module, so no points were added.")
+
+    with tab2:
+        st.subheader("Turn Your Waste into Wealth!")
+        st.write("Home composting is an easy way to reduce landfill waste and create nutrient-rich soil for your plants.")
+        _, img_col, _ = st.columns([1, 2, 1])
+        with img_col:
+            st.image(assets.url("training-compost", width=480), caption="A simple mix of 'Greens' (kitchen scraps) and 'Browns' (dry leaves, cardboard)", use_container_width=True)
+        
+        if m2_completed:
+            st.success("Module 2 Completed! You earned 10 points.")
+        else:
+            if st.button("I'm ready to compost!"):
+                if store.add_points(username, 10, "Citizen learning: Module 2", key=f"citizen-m2:{username}"):
+                    st.success("Fantastic! 10 points awarded.")
+                    st.balloons()
+                    st.rerun()
+                else:
+                    st.info("You have already completed this module, so no points were added.")
+
+    with tab3:
+        st.subheader("Test Your Green Knowledge!")
+        if not (m1_completed and m2_completed):
+            st.warning("Please complete Module 1 and Module 2 to unlock the quiz.")
+        elif quiz_completed:
+            st.success("You have already aced the quiz! Great job.")
+        else:
+            st.write("Answer correctly to earn bonus points!")
+            quiz = reference.quizzes()["citizen"]
+            with st.form("citizen_quiz"):
+                answers = [st.radio(q["question"], q["options"]) for q in quiz["questions"]]
+                
+                submitted = st.form_submit_button("Submit Quiz")
+                if submitted:
+                    score = sum(a == q["answer"] for a, q in zip(answers, quiz["questions"]))
+                    points_earned = score * quiz["points_per_answer"]
+                    if store.add_points(username, points_earned, "Citizen learning quiz", key=f"citizen-quiz:{username}"):
+                        st.success(f"Quiz submitted! You scored {score}/{len(answers)} and earned {points_earned} points!")
+                        st.balloons()
+                        st.rerun()
+                    else:
+                        st.info("You have already taken this quiz, so no points were added.")
@@ -0,0 +1,94 @@
+import re
+
+import pandas as pd
+import streamlit as st
+
+import store
+import metrics
+import assets
+import leaderboard
+
+# -------------------------
+# Profile & Achievements Pages
+# -------------------------
+# Leaderboards read the incremental per-role boards in leaderboard.py.
+
+_MARKDOWN_SPECIAL = re.compile(r"([!-/:-@\[-`{-~])")  # all ASCII punctuation, which CommonMark lets a backslash escape
+
+
+def _escape_markdown(text):
+    """text as literal markdown: usernames are user-chosen and must not turn into links or formatting."""
+    return _MARKDOWN_SPECIAL.sub(r"\\\1", text)
+
+
+def profile_page():
+    user = st.session_state.current_user
+    # Refresh points from master user list
+    st.session_state.current_user['points'] = store.get_points(user['username'])
+    st.title(f"👤 User Details: {user['username']}")
+
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        st.image(assets.url("avatar"), width=150)
+        st.subheader(f"Role: {user['role']}")
+        st.write("---")
+
+    with col2:
+        total_points = user['points']
+        user_complaints_count = store.count_complaints(user=user['username'])
+        metric1, metric2 = st.columns(2)
+        metric1.metric(label="♻️ Eco-Points", value=total_points)
+        metric2.metric(label="📢 Complaints Submitted", value=user_complaints_count)
+        
+        st.write("---")
+        st.subheader("Your Progress")
+        ranks = {"Eco-Novice": (0, 50), "Green Starter": (51, 150), "Community Contributor": (151, 300), "Sustainability Steward": (301, 500), "Eco-Champion": (501, float('inf'))}
+        current_rank, next_rank_points = "Eco-Novice", 50
+        for rank, (min_pts, max_pts) in ranks.items():
+            if min_pts <= total_points <= max_pts:
+                current_rank, next_rank_points = rank, max_pts + 1
+                break
+        progress = total_points / next_rank_points if next_rank_points != float('inf') + 1 else 1.0
+        st.write(f"**Current Rank:** {current_rank}")
+        st.progress(progress)
+        if progress < 1.0:
+            st.write(f"{next_rank_points - total_points} points to the next rank!")
+        else:
+            st.success("You've reached the highest rank!")
+
+        history = store.points_history(user['username'], limit=10)
+        if history:
+            st.write("---")
+            st.subheader("Recent Eco-Points Activity")
+            st.dataframe(pd.DataFrame(history).rename(columns={"at": "When", "delta": "Points", "reason": "For"}), hide_index=True, use_container_width=True)
+
+
+LEADERBOARD_PAGE_SIZE = 25
+
+def leaderboard_section(role, title, icon):
+    st.subheader(title)
+    total = leaderboard.size(role)
+    if not total:
+        st.write(f"No {role}s yet.")
+        return
+    total_pages = -(-total // LEADERBOARD_PAGE_SIZE)
+    page = 1
+    if total_pages > 1:
+        page = st.number_input(f"Page (of {total_pages})", min_value=1, max_value=total_pages, value=1, key=f"board_page_{role}")
+    with metrics.timed("leaderboard.top", role=role):
+        rows = leaderboard.top(role, limit=LEADERBOARD_PAGE_SIZE, offset=(page - 1) * LEADERBOARD_PAGE_SIZE)
+    # One markdown block per page rather than one element per user
+    st.markdown("\n".join(f"{icon} {r}. **{_escape_markdown(u)}** - {p} points  " for r, u, p in rows))
+
+def achievements_page():
+    st.title("🏆 Achievements & Leaderboard")
+    if not store.count_users():
+        st.info("No users yet.")
+        return
+    with metrics.timed("leaderboard.rank"):
+        me = leaderboard.rank(st.session_state.current_user["username"])
+    if me:
+        role, my_rank, my_points = me
+        st.info(f"Your rank: **#{my_rank}** of {leaderboard.size(role)} {role}s with {my_points} points.")
+    leaderboard_section("Citizen", "👥 Top Citizens", "🏅")
+    leaderboard_section("Green Champion", "💚 Top Green Champions", "🌟")
@@ -0,0 +1,229 @@
+import streamlit as st
+from PIL import UnidentifiedImageError
+
+import store
+import events
+import geocode
+import metrics
+import blobstore
+import uploads
+import reference
+import photohash
+import thumbnails
+
+# -------------------------
+# Waste Reporting & Verification Pages
+# -------------------------
+# Report photos are size-capped and re-encoded by uploads.ingest, stored as
+# blobs and shown through the thumbnail cache. Photos matching an open report
+# are merged into it before they reach a review queue. Locations autocomplete
+# from the gazetteer and are geocoded on submit, falling back to the photo's
+# GPS position. Champions work through the queues a page at a time, acting on
+# a whole selection at once.
+
+
+HISTORY_PAGE_SIZE = 20
+REVIEW_PAGE_SIZE = 20
+SUGGESTIONS = 6
+
+def complaint_page():
+    st.title("📢 Report Community Waste Issue")
+    if st.session_state.current_user["role"] != "Citizen":
+        st.warning("⚠️ This feature is available for Citizens only.")
+        return
+    tab1, tab2 = st.tabs([" 📝 Submit a New Report ", " 📜 Your Report History "])
+    with tab1:
+        st.subheader("📍 Submit a New Report")
+        # Outside the form so typing reruns the page and refreshes the suggestions
+        if st.session_state.pop("clear_report_location", False):
+            st.session_state.report_location = ""
+        location = st.text_input("Enter Location or Landmark", key="report_location")
+        gazetteer = reference.gazetteer()
+        suggestions = [p["name"] for p in gazetteer.suggest(location, limit=SUGGESTIONS)]
+        if suggestions and suggestions[0] != location:
+            st.pills("Did you mean", suggestions, key="report_location_pick", on_change=_pick_location)
+        place = gazetteer.resolve(location) if location else None
+        if place:
+            st.caption(f"📌 {place['name']}" + (f", {place['ward']} ward" if place["ward"] and place["ward"] != place["name"] else ""))
+        with st.form(key="complaint_form", clear_on_submit=True):
+            waste_type = st.selectbox("Type of Waste", ["Mixed Garbage", "Dry Waste", "Wet Waste", "Hazardous Waste"])
+            photo = st.file_uploader("Upload Photo", type=["jpg", "png", "jpeg"])
+            if st.form_submit_button(label="Submit Report"):
+                if not all([location, waste_type, photo]):
+                    st.error("Please fill all fields and upload a photo.")
+                else:
+                    try:
+                        original = file_report(st.session_state.current_user["username"], location, waste_type, photo,
+                                               place=geocode.place(place))
+                    except UnidentifiedImageError:
+                        st.error("That file doesn't look like a photo. Please upload a JPG or PNG image.")
+                    except uploads.UploadRejected as e:
+                        st.error(str(e))
+                    else:
+                        if original:
+                            st.info(f"📎 This looks like report #{original['id']} at {original['location']}, which is already being handled. "
+                                    "We've added your report to it, so it won't be reviewed twice.")
+                        else:
+                            st.success("✅ Report submitted successfully! A Green Champion will verify it shortly.")
+                        # The location box is outside the form, so it is emptied on the next rerun instead
+                        st.session_state.clear_report_location = True
+    with tab2:
+        st.subheader("📌 Your Submitted Reports")
+        username = st.session_state.current_user["username"]
+        history_limit = st.session_state.setdefault("history_limit", HISTORY_PAGE_SIZE)
+        user_complaints = store.complaints_by_user(username, limit=history_limit, newest_first=True)
+        if not user_complaints: st.info("You have not submitted any reports yet.")
+        else:
+            for c in user_complaints:
+                # on_change="rerun" keeps the expander lazy: the photo is only read from disk once it is opened
+                exp = st.expander(f"📍 {c['location']}  |  🗓️ {c['timestamp'].split(' ')[0]}", key=f"history_{c['id']}", on_change="rerun")
+                with exp:
+                    if exp.open:
+                        show_photo(c["photo_ref"], key=f"history_{c['id']}")
+                    st.write(f"**Status:** {c['status']}")
+            total = store.count_complaints(user=username)
+            if total > len(user_complaints):
+                st.caption(f"Showing your {len(user_complaints)} most recent of {total} reports.")
+                if st.button("Show older reports"):
+                    st.session_state.history_limit += HISTORY_PAGE_SIZE
+                    st.rerun()
+
+def _pick_location():
+    st.session_state.report_location = st.session_state.pop("report_location_pick") or st.session_state.report_location
+
+def file_report(username, location, waste_type, photo, place=None):
+    """Stores a new report; returns the open complaint it was merged into, or None if it is new.
+
+    place is the geocoded location from geocode.place(), if it resolved; otherwise
+    the photo's GPS position is used when it has one. Raises uploads.UploadRejected
+    for photos over the size limits.
+    """
+    with metrics.timed("uploads.ingest", source="complaint"):
+        upload = uploads.ingest(photo)
+    if place is None and upload.gps:
+        place = geocode.place({"latitude": upload.gps[0], "longitude": upload.gps[1], "ward": None})
+    with metrics.timed("photohash.check", source="complaint"):
+        ph, dh = photohash.image_hashes(upload.image)
+        duplicates, seen = photohash.lookup(ph, dh, "complaint")
+    # Checked and registered under one write transaction, re-checking only the photos
+    # stored since the lookup, so of two reports of the same photo at once the second
+    # is merged into the first
+    with store.transaction():
+        original = photohash.first_open(duplicates) or photohash.open_original(ph, dh, after_id=seen)
+        # The re-encoded copy is what gets stored: bounded size, no EXIF
+        photo_ref = blobstore.put(upload.data)
+        complaint_id = store.add_complaint(username, location, waste_type, photo_ref,
+                                           duplicate_of=original["id"] if original else None, place=place)
+        photohash.register(photo_ref, ph, dh, "complaint", username, complaint_id)
+        if original is None:
+            events.publish(events.ComplaintSubmitted(complaint_id, username, location, waste_type))
+    return original
+
+def show_photo(photo_ref, key):
+    """Renders a report photo as a thumbnail, with the full-size image behind a toggle."""
+    if not blobstore.exists(photo_ref):
+        st.caption("Photo not available.")
+        return
+    if st.toggle("🔍 View full size", key=f"full_{key}"):
+        with metrics.timed("thumbnails.get", variant="medium"):
+            image = thumbnails.get(photo_ref, "medium")
+        st.image(image, use_container_width=True)
+    else:
+        with metrics.timed("thumbnails.get", variant="thumb"):
+            image = thumbnails.get(photo_ref)
+        st.image(image)
+
+def _set_selection(keys, value):
+    for k in keys:
+        st.session_state[k] = value
+
+
+@st.fragment
+def review_queue(status, key, actions, empty_message):
+    """One cursor page of the complaints in a status, with checkboxes and bulk actions.
+
+    actions maps a button label to fn(reports) -> message; each runs once for the
+    whole selection. Ticking boxes and paging only rerun this fragment; an action
+    reruns the page once so the counts above it catch up.
+    """
+    flash = st.session_state.pop(f"{key}_flash", None)
+    if flash:
+        st.success(flash)
+    cursors = st.session_state.setdefault(f"{key}_cursors", [None])
+    reports = store.complaints_by_status(status, limit=REVIEW_PAGE_SIZE + 1, before_id=cursors[-1])
+    if not reports and len(cursors) > 1:
+        # Everything past this cursor was handled elsewhere; start over from the first page
+        del cursors[1:]
+        reports = store.complaints_by_status(status, limit=REVIEW_PAGE_SIZE + 1)
+    if not reports:
+        st.success(empty_message)
+        return
+    has_next = len(reports) > REVIEW_PAGE_SIZE
+    reports = reports[:REVIEW_PAGE_SIZE]
+    select_keys = [f"{key}_select_{r['id']}" for r in reports]
+    duplicates = store.count_duplicates([r["id"] for r in reports])
+
+    total = store.count_complaints(status=status)
+    top1, top2, top3 = st.columns([3, 1, 1])
+    top1.caption(f"Page {len(cursors)} · {len(reports)} shown of {total} {status.lower()} reports, oldest first")
+    top2.button("Select page", key=f"{key}_select_all", on_click=_set_selection, args=(select_keys, True))
+    top3.button("Clear", key=f"{key}_clear", on_click=_set_selection, args=(select_keys, False))
+
+    # Build any missing thumbnails for this page in parallel
+    thumbnails.prefetch([r["photo_ref"] for r in reports])
+
+    selected = []
+    for report, select_key in zip(reports, select_keys):
+        i = report["id"]
+        with st.container(border=True):
+            info_col, img_col = st.columns([3, 2])
+            with info_col:
+                if st.checkbox(f"**#{i}** · {report['location']}", key=select_key):
+                    selected.append(report)
+                st.caption(f"{report['waste_type']} · reported by {report['user']} on {report['timestamp']}")
+                if report["verified_by"]:
+                    st.caption(f"Verified by {report['verified_by']}")
+                if duplicates.get(i):
+                    st.caption(f"👥 Also reported by {duplicates[i]} more citizen(s)")
+            with img_col:
+                show_photo(report["photo_ref"], key=f"{key}_{i}")
+
+    nav1, nav2, _ = st.columns([1, 1, 3])
+    nav1.button("⬅️ Previous", key=f"{key}_prev", disabled=len(cursors) == 1, on_click=cursors.pop)
+    nav2.button("Next ➡️", key=f"{key}_next", disabled=not has_next, on_click=cursors.append, args=(reports[-1]["id"],))
+
+    action_cols = st.columns(len(actions) + 1)
+    for col, (label, action) in zip(action_cols, actions.items()):
+        if col.button(f"{label} ({len(selected)})", key=f"{key}_{label}", disabled=not selected, type="primary"):
+            st.session_state[f"{key}_flash"] = action(selected)
+            for select_key in select_keys:
+                st.session_state.pop(select_key, None)
+            st.rerun()
+
+
+def verify_reports(reports):
+    champion = st.session_state.current_user['username']
+    with store.transaction():
+        changed = store.set_complaints_status([r["id"] for r in reports], 'Verified', from_status='Pending', verified_by=champion)
+        store.add_points_many([(champion, 5, f"Verified report #{i}", f"verify:{i}") for i in changed])
+        events.publish(*[events.ComplaintVerified(r["id"], r["user"], r["location"], champion) for r in reports if r["id"] in changed])
+    return f"{len(changed)} reports verified! You earned {5 * len(changed)} points."
+
+
+def invalidate_reports(reports):
+    changed = store.set_complaints_status([r["id"] for r in reports], 'Invalid', from_status='Pending')
+    return f"{len(changed)} reports marked as invalid."
+
+
+def verify_reports_page():
+    st.title("🛡️ Verify Citizen Reports")
+    if st.session_state.current_user["role"] != "Green Champion":
+        st.warning("⚠️ Only Green Champions can verify reports.")
+        return
+
+    st.info("Review new reports from citizens. Verify them to escalate for cleanup.")
+    review_queue(
+        'Pending', "verify",
+        {"👍 Verify selected": verify_reports, "👎 Mark selected invalid": invalidate_reports},
+        "✅ No new reports pending verification. Great work!",
+    )
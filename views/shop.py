@@ -0,0 +1,68 @@
+import streamlit as st
+
+import store
+import assets
+import reference
+
+# -------------------------
+# Eco-Points Shop & Penalization Pages
+# -------------------------
+# Every points change here goes through the store's ledger.
+
+
+def shop_page():
+    st.title("🛒 Eco-Rewards Shop")
+    st.info("Redeem your hard-earned Eco-Points for amazing nature-friendly products!")
+    
+    username = st.session_state.current_user["username"]
+    current_points = store.get_points(username)
+
+    st.subheader(f"Your Balance: {current_points} ♻️ Points")
+    st.markdown("---")
+
+    # The product catalog is shared, read-only reference data
+    products = reference.shop_catalog()
+
+    # Display products in columns
+    col1, col2 = st.columns(2)
+    
+    # A simple way to alternate products between columns
+    i = 0
+    for product in products:
+        target_col = col1 if i % 2 == 0 else col2
+        with target_col:
+            st.subheader(product["name"])
+            st.image(assets.url(product["image"], width=960), use_container_width=True)
+            st.write(product["desc"])
+            st.success(f"**Cost: {product['cost']} Points**")
+            
+            # Disable button if user can't afford the item
+            can_afford = current_points >= product['cost']
+            if st.button("Redeem Now", key=product["id"], disabled=not can_afford):
+                # Deduct points (only if the balance still covers it) and show success message
+                if store.spend_points(username, product['cost'], f"Redeemed {product['name']}"):
+                    st.success(f"You have successfully redeemed the {product['name']}!")
+                    st.balloons()
+                    st.rerun() # Rerun to update the points balance immediately
+                else:
+                    st.error("Your balance changed and no longer covers this item.")
+            
+            if not can_afford:
+                st.warning(f"You need {product['cost'] - current_points} more points for this item.")
+            
+            st.markdown("---")
+        i += 1
+
+
+def penalization_page():
+    st.title("⚖️ Penalization - Report Littering")
+    if st.session_state.current_user["role"] != "Green Champion":
+        st.warning("⚠️ Only Green Champions can access this page.")
+        return
+    citizen_name = st.text_input("Enter Citizen Username")
+    if st.button("Impose Fine"):
+        if not store.user_exists(citizen_name):
+            st.error("Citizen not found!")
+        else:
+            store.fine_points(citizen_name, 10, f"Littering fine by {st.session_state.current_user['username']}")
+            st.success(f"✅ Fine imposed on {citizen_name}.")